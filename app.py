@@ -1,18 +1,10 @@
+# Only what the first paint needs is imported here. numpy, pandas, folium,
+# streamlit_folium, geopy and the utils modules are imported where they are used,
+# so the header and sidebar render before those load (python -m
+# utils.startup_profile tracks the budget).
 import streamlit as st
-import pandas as pd
-import folium
-from folium import plugins
-import numpy as np
-import math
 import time
-import json
 import os
-from geopy.distance import geodesic
-from geopy.geocoders import Nominatim
-from streamlit_folium import st_folium
-from utils.sound_alerts import play_audio_alert, get_species_sound_type
-import base64
-import io
 import random
 from datetime import datetime, timedelta
 
@@ -64,14 +56,18 @@ if 'emergency_contacts' not in st.session_state:
     ]
 if 'user_phone_number' not in st.session_state:
     st.session_state.user_phone_number = ""
+if 'selected_alternative' not in st.session_state:
+    st.session_state.selected_alternative = None
 
 # Import mobile alerts functions with Twilio
 try:
-    from utils.mobile_alerts import send_mobile_alert, send_emergency_sms, get_mobile_alerts, get_unread_count, sms_system
+    from utils.mobile_alerts import (send_mobile_alert, send_user_sms, send_emergency_sms, get_mobile_alerts, get_unread_count,
+                                     get_sms_system, peek_sms_system, sms_system_error, warm_sms_system,
+                                     validate_phone_number)
 except ImportError as e:
     st.error(f"Mobile alerts module not found: {e}")
     # Fallback functions if mobile_alerts.py is not available
-    def send_mobile_alert(alert_data, alert_type="warning"):
+    def send_mobile_alert(alert_data, alert_type="warning", send_sms=True):
         alert_templates = {
             "warning": {
                 "title": "🚨 WILDLIFE WARNING",
@@ -117,6 +113,10 @@ except ImportError as e:
         
         return mobile_alert
     
+    def send_user_sms(alert_data, alert_type="warning", alert=None) -> bool:
+        """SMS is unavailable without the mobile alerts module"""
+        return False
+    
     def send_emergency_sms(alert_data) -> bool:
         """Send emergency SMS to contacts"""
         emergency_message = f"""
@@ -168,7 +168,21 @@ Priority: CRITICAL - Immediate action required!
         def is_initialized(self):
             return False
     
-    sms_system = DummySmsSystem()
+    _dummy_sms_system = DummySmsSystem()
+    
+    def get_sms_system():
+        return _dummy_sms_system
+    
+    def peek_sms_system():
+        return _dummy_sms_system
+    
+    def sms_system_error():
+        return None
+    
+    def warm_sms_system():
+        pass
+    
+    validate_phone_number = _dummy_sms_system.validate_phone_number
 
 def simulate_push_notification(alert_data):
     """Simulate mobile push notification"""
@@ -181,224 +195,237 @@ def simulate_push_notification(alert_data):
     }
     return notification
 
-# Sound Alert Functions
-def get_alert_sound(alert_type="general"):
-    """Generate base64 encoded alert sounds"""
-    if alert_type == "critical":
-        sound_html = """
-        <audio id="criticalAlert" autoplay>
-            <source src="https://cdn.pixabay.com/audio/2021/08/04/audio_12b0c7443c.mp3" type="audio/mpeg">
-        </audio>
-        <script>
-            var audio = document.getElementById('criticalAlert');
-            audio.volume = 0.7;
-            audio.play().catch(function(e) {
-                console.log('Audio play failed:', e);
-            });
-        </script>
-        """
-    elif alert_type == "animal_detected":
-        sound_html = """
-        <audio id="animalAlert" autoplay>
-            <source src="https://cdn.pixabay.com/audio/2021/08/04/audio_12b0c7443c.mp3" type="audio/mpeg">
-        </audio>
-        <script>
-            var audio = document.getElementById('animalAlert');
-            audio.volume = 0.5;
-            audio.play().catch(function(e) {
-                console.log('Audio play failed:', e);
-            });
-        </script>
-        """
-    else:
-        sound_html = """
-        <audio id="generalAlert" autoplay>
-            <source src="https://cdn.pixabay.com/audio/2021/08/04/audio_12b0c7443c.mp3" type="audio/mpeg">
-        </audio>
-        <script>
-            var audio = document.getElementById('generalAlert');
-            audio.volume = 0.3;
-            audio.play().catch(function(e) {
-                console.log('Audio play failed:', e);
-            });
-        </script>
-        """
-    
-    return sound_html
-
-def play_alert_sound(alert_type="general"):
-    """Play alert sound based on alert type"""
-    if st.session_state.last_alert_type != alert_type:
-        st.session_state.last_alert_type = alert_type
-        sound_html = get_alert_sound(alert_type)
-        st.markdown(sound_html, unsafe_allow_html=True)
-
-def play_audio_alert(alert_type="general"):
-    """Display audio alert simulation"""
-    alert_messages = {
-        "general": "🔊 AUDIO ALERT: Animal crossing zone ahead. Reduce speed immediately!",
-        "critical": "🚨 CRITICAL ALERT: Animal detected nearby! STOP IMMEDIATELY!",
-        "animal_detected": "🚨 ANIMAL DETECTED: Wildlife spotted nearby! Emergency protocols activated!"
-    }
-    
-    play_alert_sound(alert_type)
-    
-    st.markdown(f"""
-    <div style="background: {'#ff4444' if alert_type == 'critical' else '#ff6b6b'}; 
-                padding: 15px; 
-                border-radius: 10px; 
-                margin: 10px 0;
-                color: white;
-                text-align: center;
-                font-weight: bold;">
-        {alert_messages.get(alert_type, alert_messages["general"])}
-        <br><small>🔔 Audio Alert Active - Sound Playing</small>
-    </div>
-    """, unsafe_allow_html=True)
-
 # Data Loading Functions
-@st.cache_data
+@st.cache_resource
 def load_animal_zones():
-    """Load animal crossing zones from CSV"""
+    """Load animal crossing zones from CSV (one read-only copy shared by all sessions)"""
+    from utils.catalogue import load_zones
+    return load_zones()
+
+@st.cache_resource
+def load_incident_data():
+    """Load past incident data for heatmap (one read-only copy shared by all sessions)"""
+    from utils.catalogue import load_incidents
+    return load_incidents()
+
+@st.cache_resource
+def load_zone_table():
+    """Zone catalogue as a compact structured array for the per-step checks"""
+    from utils.records import ZoneTable
+    return ZoneTable.from_dataframe(load_animal_zones())
+
+# Every setting of the "Alert Range (km)" slider, previewed at once in the route risk profile
+ALERT_RANGE_PREVIEW_KM = list(range(1, 11))
+
+@st.cache_resource(max_entries=32)
+def load_route_corridor(route_key):
+    """
+    Zones within the largest Alert Range of a route, selected once (route_key: its
+    float64 (lat, lon) pairs as bytes, cheap to hash). Everything per-route below is
+    built from these: exact for any range up to ALERT_RANGE_PREVIEW_KM[-1], and its
+    zone rows index corridor.zones rather than the full catalogue.
+    """
+    import numpy as np
+    from utils.corridor import RouteCorridor
+    route = np.frombuffer(route_key, dtype=np.float64).reshape(-1, 2)
+    return RouteCorridor.build(route, load_zone_table(), reach_km=ALERT_RANGE_PREVIEW_KM[-1])
+
+@st.cache_resource(max_entries=32)
+def load_journey_plan(route_key, alert_threshold):
+    """Zone-crossing timetable for a route, through its corridor zones"""
+    import numpy as np
+    from utils.journey import JourneyPlan
+    route = np.frombuffer(route_key, dtype=np.float64).reshape(-1, 2)
+    return JourneyPlan.build(route, load_route_corridor(route_key).zones, threshold_km=alert_threshold)
+
+@st.cache_resource(max_entries=32)
+def load_route_metrics(route_key):
+    """Cumulative distance, per-point ETA and zone entries of a route (see load_journey_plan)"""
+    from utils.route_metrics import RouteMetrics
+    return RouteMetrics.from_plan(load_journey_plan(route_key, 0))
+
+@st.cache_resource(max_entries=32)
+def load_approach_margins(route_key):
+    """Closest approach to every corridor zone, sorted so the zones alerting at any range are a binary search"""
+    import numpy as np
+    from utils.route_table import approach_margins
+    route = np.frombuffer(route_key, dtype=np.float64).reshape(-1, 2)
+    return approach_margins(route, load_route_corridor(route_key).zones)
+
+@st.cache_resource(max_entries=32)
+def load_route_table(route_key, alert_threshold):
+    """Per-point risk band and recommended speed for a whole route (nearest zone among the corridor's)"""
+    import numpy as np
+    from utils.route_table import score_points
+    route = np.frombuffer(route_key, dtype=np.float64).reshape(-1, 2)
+    return score_points(route, load_route_corridor(route_key).zones, threshold_km=alert_threshold)
+
+@st.cache_resource(max_entries=32)
+def load_playback(route_key, alert_threshold):
+    """Browser playback payload (route, speed profile, scheduled alerts) for a route, built once"""
+    from utils.playback import build_playback
+    plan = load_journey_plan(route_key, alert_threshold)
+    return build_playback(plan, load_route_corridor(route_key).zones, load_risk_raster(), alert_threshold)
+
+@st.cache_resource
+def load_risk_raster():
+    """Memory-map the precomputed wildlife-risk raster, rebuilding it if the zones changed"""
+    from utils.risk_raster import RiskRaster, catalogue_hash
+    zones_df = load_animal_zones()
+    incidents_df = load_incident_data()
+    path = 'data/risk_raster.npy'
+    try:
+        raster = RiskRaster.load(path)
+        if raster.source_hash == catalogue_hash(zones_df, incidents_df):
+            return raster
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    
+    raster = RiskRaster.build(zones_df, incidents_df)
+    try:
+        raster.save(path)
+        return RiskRaster.load(path)
+    except OSError:
+        return raster
+
+ROUTES_PATH = 'data/routes.csv'
+
+@st.cache_resource
+def load_polygon_zones():
+    """Polygon zones from GeoJSON, checked alongside the circular catalogue (empty without the file)"""
+    from utils.polygons import PolygonZones
     try:
-        df = pd.read_csv('data/animal_zones.csv')
-        return df
+        return PolygonZones.from_geojson('data/animal_zones.geojson')
     except FileNotFoundError:
-        # Create UP-specific sample data
-        zones_data = {
-            'name': [
-                'Dudhwa Tiger Corridor',
-                'Katarniaghat Elephant Zone', 
-                'Kishanpur Deer Crossing',
-                'Pilibhit Tiger Area',
-                'Sohagi Barwa Sanctuary',
-                'Chandrapur Bear Zone',
-                'Ranipur Wildlife',
-                'Nawabganj Bird Sanctuary',
-                'Saman Sanctuary'
-            ],
-            'lat': [28.5000, 28.2833, 28.4333, 28.7000, 27.3000, 28.1000, 25.2500, 26.6167, 26.7500],
-            'lon': [80.7000, 81.0167, 80.2833, 79.9000, 82.2000, 79.8000, 81.1500, 80.6500, 81.2500],
-            'radius_km': [5.0, 3.0, 4.0, 2.5, 3.5, 4.5, 2.0, 3.0, 2.5],
-            'species': ['tiger', 'elephant', 'deer', 'tiger', 'leopard', 'sloth_bear', 'deer', 'birds', 'nilgai'],
-            'notes': [
-                'Highway stretch near Dudhwa forest',
-                'Seasonal elephant migration route',
-                'Dense forest area crossing',
-                'Tiger movement corridor', 
-                'Leopard territory',
-                'Bear habitat near villages',
-                'Wildlife sanctuary crossing',
-                'Bird migration area',
-                'Grassland animal crossing'
-            ]
-        }
-        return pd.DataFrame(zones_data)
+        return PolygonZones.empty()
 
-@st.cache_data  
-def load_incident_data():
-    """Load past incident data for heatmap"""
+@st.cache_resource
+def load_projected_zones():
+    """Zone centres in the local UP projection, projected once (DISTANCE_BACKEND=projected)"""
+    from utils.projection import ProjectedZones
+    return ProjectedZones(load_zone_table())
+
+@st.cache_resource(max_entries=1)
+def build_route_library(path, stamp):
+    """Preset routes and the alert test route as precomputed arrays (stamp: the file's mtime and size)"""
+    from utils.route_library import RouteLibrary
+    return RouteLibrary.load(path, load_zone_table())
+
+def load_route_library():
+    """The route library, rebuilt only when data/routes.csv changes on disk"""
+    from utils.route_library import RouteLibrary
+    return build_route_library(ROUTES_PATH, RouteLibrary.source_stamp(ROUTES_PATH))
+
+@st.cache_resource
+def load_road_graph():
+    """Load the road network with wildlife-risk edge penalties, re-scored if the zones changed"""
+    from utils.risk_raster import catalogue_hash
+    from utils.routing import RoadGraph
+    zones_df = load_animal_zones()
     try:
-        df = pd.read_csv('data/incidents.csv')
-        return df
+        graph = RoadGraph.load('data/road_graph.npz')
+        if graph.source_hash != catalogue_hash(zones_df):
+            graph.apply_zone_risk(zones_df)
+        return graph
     except FileNotFoundError:
-        # Create UP-specific incident data
-        incidents_data = {
-            'lat': [28.5000, 28.2833, 28.4333, 28.7000, 27.3000, 28.1000, 25.2500, 26.6167, 26.7500, 27.5000, 26.8500],
-            'lon': [80.7000, 81.0167, 80.2833, 79.9000, 82.2000, 79.8000, 81.1500, 80.6500, 81.2500, 80.5000, 81.0000],
-            'species': ['tiger', 'elephant', 'deer', 'tiger', 'leopard', 'sloth_bear', 'deer', 'birds', 'nilgai', 'elephant', 'tiger'],
-            'severity': [5, 4, 3, 2, 4, 2, 3, 5, 3, 4, 2],
-            'timestamp': [
-                '2024-01-15 14:30:00', '2024-02-03 09:15:00', '2024-02-20 18:45:00',
-                '2024-03-10 07:20:00', '2024-03-25 16:10:00', '2024-04-05 11:30:00',
-                '2024-04-18 20:15:00', '2024-05-02 06:45:00', '2024-05-20 19:30:00',
-                '2024-06-08 13:20:00', '2024-06-25 15:40:00'
-            ]
-        }
-        return pd.DataFrame(incidents_data)
+        pass
+    try:
+        graph = RoadGraph.from_edges_csv('data/road_edges.csv')
+    except FileNotFoundError:
+        return None
+    graph.apply_zone_risk(zones_df)
+    graph.prepare_landmarks()
+    return graph
+
+@st.cache_data
+def plan_road_route(start_lat, start_lon, end_lat, end_lon, risk_weight=1.0):
+    """Route along the road network, returning (route_points, distance_km) or None"""
+    graph = load_road_graph()
+    if graph is None:
+        return None
+    result = graph.route((start_lat, start_lon), (end_lat, end_lon), risk_weight=risk_weight)
+    if result is None:
+        return None
+    return [tuple(p) for p in result.points.tolist()], result.length_km
+
+@st.cache_data
+def get_route_alternatives(start_lat, start_lon, end_lat, end_lon, k=3):
+    """Generate and score k alternative routes (fastest vs least wildlife exposure)"""
+    from utils.alternatives import compare_alternatives
+    scores = compare_alternatives((start_lat, start_lon), (end_lat, end_lon),
+                                  load_animal_zones(), load_road_graph(), k)
+    return [{
+        'label': score.label,
+        'points': [tuple(p) for p in score.points.tolist()],
+        'length_km': score.length_km,
+        'travel_minutes': score.travel_minutes,
+        'exposure_minutes': score.exposure_minutes,
+        'zone_minutes': score.zone_minutes
+    } for score in scores]
 
 # Popular Locations Database for UP
+@st.cache_resource
+def load_gazetteer():
+    """Load the offline place index (villages, towns, checkposts, forest gates)"""
+    from utils.gazetteer import Gazetteer
+    try:
+        return Gazetteer.from_csv('data/places.csv')
+    except FileNotFoundError:
+        return Gazetteer.from_dict({
+            "Lucknow": (26.8467, 80.9462),
+            "Kanpur": (26.4499, 80.3319),
+            "Varanasi": (25.3176, 82.9739),
+            "Agra": (27.1767, 78.0081),
+            "Prayagraj": (25.4358, 81.8463),
+            "Ghaziabad": (28.6692, 77.4538),
+            "Meerut": (28.9845, 77.7064),
+            "Dudhwa Tiger Reserve": (28.5000, 80.7000),
+            "Katarniaghat Sanctuary": (28.2833, 81.0167),
+            "Kishanpur Sanctuary": (28.4333, 80.2833),
+            "Pilibhit Tiger Reserve": (28.7000, 79.9000),
+            "Sohagi Barwa Sanctuary": (27.3000, 82.2000),
+            "Chandrapur Area": (28.1000, 79.8000),
+            "Ranipur Sanctuary": (25.2500, 81.1500),
+            "Nawabganj Bird Sanctuary": (26.6167, 80.6500),
+            "Saman Sanctuary": (26.7500, 81.2500),
+            "Gorakhpur": (26.7606, 83.3732),
+            "Jhansi": (25.4484, 78.5685),
+            "Ayodhya": (26.7928, 82.1947),
+            "Mathura": (27.4924, 77.6737)
+        })
+
+@st.cache_data
 def get_popular_locations():
     """Get dictionary of popular locations in Uttar Pradesh"""
-    return {
-        "Lucknow": (26.8467, 80.9462),
-        "Kanpur": (26.4499, 80.3319),
-        "Varanasi": (25.3176, 82.9739),
-        "Agra": (27.1767, 78.0081),
-        "Prayagraj": (25.4358, 81.8463),
-        "Ghaziabad": (28.6692, 77.4538),
-        "Meerut": (28.9845, 77.7064),
-        "Dudhwa Tiger Reserve": (28.5000, 80.7000),
-        "Katarniaghat Sanctuary": (28.2833, 81.0167),
-        "Kishanpur Sanctuary": (28.4333, 80.2833),
-        "Pilibhit Tiger Reserve": (28.7000, 79.9000),
-        "Sohagi Barwa Sanctuary": (27.3000, 82.2000),
-        "Chandrapur Area": (28.1000, 79.8000),
-        "Ranipur Sanctuary": (25.2500, 81.1500),
-        "Nawabganj Bird Sanctuary": (26.6167, 80.6500),
-        "Saman Sanctuary": (26.7500, 81.2500),
-        "Gorakhpur": (26.7606, 83.3732),
-        "Jhansi": (25.4484, 78.5685),
-        "Ayodhya": (26.7928, 82.1947),
-        "Mathura": (27.4924, 77.6737)
-    }
+    return load_gazetteer().popular_locations()
 
 # Utility Functions
+@st.cache_resource
+def load_distance_backend():
+    """
+    (distance function, whether it is the local UP projection), selected once
+    per process from DISTANCE_BACKEND (vincenty unless set; see utils.geo)
+    """
+    from utils.geo import DISTANCE_BACKENDS, distance_backend
+    distance_km = distance_backend()
+    # The projected backend is the one not listed in DISTANCE_BACKENDS (utils.projection stays unimported otherwise)
+    return distance_km, distance_km not in DISTANCE_BACKENDS.values()
+
 def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points using geopy"""
-    return geodesic((lat1, lon1), (lat2, lon2)).kilometers
+    """Calculate distance between two points in km with the configured distance backend"""
+    distance_km, _ = load_distance_backend()
+    return float(distance_km(lat1, lon1, lat2, lon2))
 
 def generate_route_points(start_lat, start_lon, end_lat, end_lon, num_points=100):
     """Generate interpolated route points"""
+    import numpy as np
     lats = np.linspace(start_lat, end_lat, num_points)
     lons = np.linspace(start_lon, end_lon, num_points)
     return list(zip(lats, lons))
 
-def generate_alert_route_points():
-    """Generate a route that guarantees multiple animal alerts in UP"""
-    alert_route_points = [
-        # Start point - Lucknow
-        (26.8467, 80.9462),
-        
-        # Approach Dudhwa Tiger Reserve
-        (27.5000, 80.5000),
-        (28.0000, 80.6000),
-        
-        # Pass through Dudhwa Tiger Zone
-        (28.5000, 80.7000),
-        (28.5500, 80.7500),
-        
-        # Approach Katarniaghat
-        (28.3000, 80.9000),
-        (28.2833, 81.0167),
-        
-        # Pass through Katarniaghat Elephant Zone
-        (28.2500, 81.1000),
-        
-        # Approach Kishanpur
-        (28.4000, 80.4000),
-        (28.4333, 80.2833),
-        
-        # End point - Pilibhit
-        (28.7000, 79.9000)
-    ]
-    
-    detailed_route = []
-    for i in range(len(alert_route_points) - 1):
-        start = alert_route_points[i]
-        end = alert_route_points[i + 1]
-        
-        segment_points = list(zip(
-            np.linspace(start[0], end[0], 6),
-            np.linspace(start[1], end[1], 6)
-        ))
-        detailed_route.extend(segment_points[:-1])
-    
-    detailed_route.append(alert_route_points[-1])
-    return detailed_route
-
 def generate_custom_route_points(click_points, points_per_segment=10):
     """Generate route points from custom clicked points"""
+    import numpy as np
     if len(click_points) < 2:
         return []
     
@@ -415,12 +442,60 @@ def generate_custom_route_points(click_points, points_per_segment=10):
     
     return route_points
 
-def check_animal_zones(lat, lon, zones_df, threshold_km=5):
-    """Check for nearby animal crossing zones"""
+def notify_step_alerts(scheduler, enable_sounds, enable_sms_alerts, enable_push_notifications, enable_emergency_sms,
+                       now=None):
+    """
+    Send the highest-risk event collected this step once per enabled channel, subject to
+    rate limits measured at ``now`` (the simulation passes journey time)
+    """
+    from utils.alert_scheduler import RISK_RANK, consolidated_data
+    from utils.sound_alerts import play_audio_alert
+    mobile_types = {'CRITICAL': "critical", 'animal_detected': "animal_detected"}
+    sound_types = {'CRITICAL': "critical", 'animal_detected': "animal_detected"}
+    pushed = {}
+    
+    def push(top, events):
+        pushed['alert'] = send_mobile_alert(consolidated_data(top, events),
+                                            mobile_types.get(top.kind, "warning"), send_sms=False)
+    
+    def sms(top, events):
+        send_user_sms(consolidated_data(top, events), mobile_types.get(top.kind, "warning"), pushed.get('alert'))
+    
+    def emergency(top, events):
+        send_emergency_sms(consolidated_data(top, events))
+    
+    def audio(top, events):
+        play_audio_alert(sound_types.get(top.kind, "general"), species=top.data.species)
+    
+    handlers = {}
+    if enable_sms_alerts or enable_push_notifications:
+        handlers['push'] = push
+    if enable_sms_alerts:
+        handlers['sms'] = sms
+    if enable_emergency_sms:
+        handlers['emergency'] = emergency
+    if enable_sounds:
+        handlers['audio'] = audio
+    
+    return scheduler.flush(handlers, min_rank={'emergency': RISK_RANK['CRITICAL']}, now=now)
+
+def check_animal_zones(lat, lon, zones, threshold_km=5, projected=None):
+    """Check for nearby animal crossing zones (``projected``: ``zones`` projected, default the full catalogue's)"""
+    from utils.records import ZoneAlert
+    from utils.species import get_recommended_speed
     alerts = []
-    for idx, zone in zones_df.iterrows():
-        distance = calculate_distance(lat, lon, zone['lat'], zone['lon'])
-        zone_radius = zone['radius_km']
+    distance_km, use_projection = load_distance_backend()
+    if use_projection:
+        # Zones projected once: one float32 hypot per zone, no prefilter/confirm pass
+        projected = projected if projected is not None else load_projected_zones()
+        rows, distances = projected.within_lat_lon(lat, lon, threshold_km)
+        candidates = zip(rows.tolist(), distances.tolist())
+    else:
+        candidates = ((i, float(distance_km(lat, lon, zones.records[i]['lat'], zones.records[i]['lon'])))
+                      for i in zones.within(lat, lon, threshold_km).tolist())
+    for i, distance in candidates:
+        zone = zones.records[i]
+        zone_radius = float(zone['radius_km'])
         
         if distance <= zone_radius:
             risk_level = "CRITICAL"
@@ -430,61 +505,100 @@ def check_animal_zones(lat, lon, zones_df, threshold_km=5):
             alert_distance = distance
         else:
             continue
-            
-        alerts.append({
-            'zone_name': zone['name'],
-            'species': zone['species'],
-            'distance': round(alert_distance, 2),
-            'risk_level': risk_level,
-            'notes': zone['notes'],
-            'recommended_speed': get_recommended_speed(zone['species'], alert_distance),
-            'zone_radius': zone_radius
-        })
+        
+        species = zones.species(i)
+        alerts.append(ZoneAlert(
+            zone_name=zones.names[i],
+            species=species,
+            distance=round(alert_distance, 2),
+            risk_level=risk_level,
+            notes=zones.notes[i],
+            recommended_speed=get_recommended_speed(species, alert_distance),
+            zone_radius=zone_radius
+        ))
     
-    return sorted(alerts, key=lambda x: x['distance'])
+    alerts.extend(check_polygon_zones(lat, lon, threshold_km))
+    return sorted(alerts, key=lambda x: x.distance)
 
-def get_recommended_speed(species, distance):
-    """Get recommended speed based on animal type and distance"""
-    speed_map = {
-        'tiger': 25, 'elephant': 20, 'leopard': 30, 'deer': 40,
-        'wild_boar': 35, 'sloth_bear': 30, 'sambar': 40, 'bison': 25, 'nilgai': 35, 'birds': 50
-    }
-    base_speed = speed_map.get(species, 30)
-    
-    if distance < 1:
-        return max(base_speed - 15, 15)
-    elif distance < 3:
-        return max(base_speed - 10, 20)
-    elif distance < 5:
-        return max(base_speed - 5, 25)
-    return base_speed
+def check_polygon_zones(lat, lon, threshold_km=5):
+    """Polygon zones report the distance to their nearest edge (0 inside) and no radius"""
+    from utils.records import ZoneAlert
+    from utils.species import get_recommended_speed
+    alerts = []
+    polygon_zones = load_polygon_zones()
+    hits = polygon_zones.query(lat, lon, threshold_km)
+    for i, distance, inside in zip(hits.zone.tolist(), hits.distance_km.tolist(), hits.inside.tolist()):
+        if inside:
+            risk_level = "CRITICAL"
+        else:
+            risk_level = "HIGH" if distance <= 2 else "MEDIUM"
+        species = polygon_zones.species(i)
+        alerts.append(ZoneAlert(
+            zone_name=polygon_zones.names[i],
+            species=species,
+            distance=round(distance, 2),
+            risk_level=risk_level,
+            notes=polygon_zones.notes[i],
+            recommended_speed=get_recommended_speed(species, distance),
+            zone_radius=0.0
+        ))
+    return alerts
 
-def simulate_animal_detection(current_position, zones_df, detection_radius=2.0):
-    """Simulate animal detection near current position"""
-    detected_animals = []
-    
-    for idx, zone in zones_df.iterrows():
-        distance = calculate_distance(current_position[0], current_position[1], zone['lat'], zone['lon'])
-        
-        if distance <= detection_radius:
-            detection_chance = max(0.3, 1.0 - (distance / detection_radius)) 
-            
-            if random.random() < detection_chance:
-                lat_offset = random.uniform(-0.01, 0.01)
-                lon_offset = random.uniform(-0.01, 0.01)
-                
-                animal_position = {
-                    'lat': zone['lat'] + lat_offset,
-                    'lon': zone['lon'] + lon_offset,
-                    'species': zone['species'],
-                    'zone_name': zone['name'],
-                    'detection_time': datetime.now().strftime('%H:%M:%S'),
-                    'distance_from_vehicle': distance,
-                    'confidence': round(random.uniform(0.85, 0.98), 2)
-                }
-                detected_animals.append(animal_position)
-    
-    return detected_animals
+def get_geofence(zones, threshold_km):
+    """
+    The session's geofence tracker; rebuilt when the zone catalogue or the
+    alert range changes, so every zone is measured again from scratch.
+    """
+    geofence = st.session_state.get('geofence')
+    distance_km, _ = load_distance_backend()
+    if (geofence is None or geofence.zones is not zones or geofence.threshold_km != threshold_km
+            or geofence.distance_fn is not distance_km):
+        from utils.geofence import GeofenceTracker
+        geofence = GeofenceTracker(zones, threshold_km, distance_fn=distance_km)
+        st.session_state.geofence = geofence
+    return geofence
+
+def geofence_alerts(geofence, zones):
+    """ZoneAlerts for the zones the tracker holds at MEDIUM or above, nearest first"""
+    from utils.records import ZoneAlert
+    from utils.route_table import RISK_LEVELS
+    from utils.species import get_recommended_speed
+    alerts = []
+    for i in geofence.active().tolist():
+        species = zones.species(i)
+        distance = float(geofence.distance_km[i])
+        alerts.append(ZoneAlert(
+            zone_name=zones.names[i],
+            species=species,
+            distance=round(distance, 2),
+            risk_level=RISK_LEVELS[geofence.level[i]],
+            notes=zones.notes[i],
+            recommended_speed=get_recommended_speed(species, distance),
+            zone_radius=float(zones.records[i]['radius_km'])
+        ))
+    return alerts
+
+def get_detection_simulator(zones):
+    """
+    The session's seeded detection simulator. A new simulation draws a new seed
+    unless SIMULATION_SEED is set, so a run can be replayed exactly.
+    """
+    from utils.detection_sim import DetectionSimulator
+    simulator = st.session_state.get('detection_simulator')
+    if simulator is None or simulator.zones is not zones:
+        seed = st.session_state.get('detection_seed')
+        if seed is None:
+            env_seed = os.environ.get('SIMULATION_SEED')
+            seed = int(env_seed) if env_seed else random.randrange(2**32)
+            st.session_state.detection_seed = seed
+        simulator = DetectionSimulator(zones, seed)
+        st.session_state.detection_simulator = simulator
+    return simulator
+
+def simulate_animal_detection(current_position, zones, detection_radius=2.0):
+    """Simulate animal detection near current position (seeded and vectorized; see utils.detection_sim)"""
+    batch = get_detection_simulator(zones).draw(current_position[0], current_position[1], detection_radius)
+    return batch.to_records(zones, datetime.now().strftime('%H:%M:%S'))
 
 def get_species_emoji(species):
     """Get emoji for species"""
@@ -512,15 +626,127 @@ def get_detection_color(species):
     return color_map.get(species, '#ff0000')
 
 # Map Creation Functions
+def create_live_layer(current_position=None, detected_animals=None, alert_points=None):
+    """
+    Build the per-step map layer: vehicle position, detections and the alert trail.
+    
+    Kept separate from the base map so a simulation tick only sends this layer to
+    st_folium (feature_group_to_add) instead of re-rendering the whole map.
+    """
+    import folium
+    
+    layer = folium.FeatureGroup(name="Live Simulation")
+    
+    # Add detected animal points
+    if detected_animals and len(detected_animals) > 0:
+        for animal in detected_animals:
+            try:
+                folium.Marker(
+                    location=[float(animal.lat), float(animal.lon)],
+                    popup=folium.Popup(f"""
+                        <div style="font-family: Arial; width: 250px; text-align: center;">
+                            <h3 style="color: #ff0000; margin: 0;">🚨 ANIMAL DETECTED!</h3>
+                            <hr style="margin: 8px 0;">
+                            <div style="font-size: 2rem; margin: 10px 0;">{get_species_emoji(animal.species)}</div>
+                            <p><b>Species:</b> {animal.species.title().replace('_', ' ')}</p>
+                            <p><b>Zone:</b> {animal.zone_name}</p>
+                            <p><b>Detection Time:</b> {animal.detection_time}</p>
+                            <p><b>Distance from Vehicle:</b> {animal.distance_from_vehicle:.1f} km</p>
+                            <p><b>AI Confidence:</b> {animal.confidence*100:.0f}%</p>
+                            <div style="background: #ffe6e6; padding: 8px; border-radius: 5px; margin-top: 10px;">
+                                <strong>⚠️ IMMEDIATE ACTION REQUIRED</strong>
+                            </div>
+                        </div>
+                    """, max_width=300),
+                    icon=folium.Icon(color='red', icon='exclamation-triangle'),
+                    tooltip=f"🚨 {animal.species.title()} DETECTED!"
+                ).add_to(layer)
+                
+                folium.Circle(
+                    location=[float(animal.lat), float(animal.lon)],
+                    radius=300,
+                    color=get_detection_color(animal.species),
+                    fillColor=get_detection_color(animal.species),
+                    fillOpacity=0.4,
+                    weight=3,
+                    popup=f"🚨 {animal.species.title()} Detection Zone"
+                ).add_to(layer)
+            except Exception as e:
+                continue
+    
+    # Add alert points trail
+    if alert_points and len(alert_points) > 0:
+        for point in alert_points:
+            try:
+                folium.CircleMarker(
+                    location=[float(point['lat']), float(point['lon'])],
+                    radius=8,
+                    popup=f"Previous Alert: {point['species'].title()}",
+                    color='darkred',
+                    fillColor='red',
+                    fillOpacity=0.7,
+                    weight=2,
+                    tooltip=f"⚠️ {point['species'].title()} alert point"
+                ).add_to(layer)
+            except Exception as e:
+                continue
+    
+    # Add current vehicle position
+    if current_position:
+        try:
+            folium.Marker(
+                location=current_position,
+                popup='🚗 Current Position',
+                icon=folium.Icon(color='blue', icon='car'),
+                tooltip='Vehicle Location'
+            ).add_to(layer)
+            
+            folium.Circle(
+                location=current_position,
+                radius=500,
+                color='blue',
+                fillColor='lightblue',
+                fillOpacity=0.3,
+                weight=1
+            ).add_to(layer)
+        except Exception as e:
+            pass
+    
+    return layer
+
+def create_route_layer(route_points, zoom):
+    """
+    The planned route as a layer for st_folium's feature_group_to_add, simplified
+    for the zoom band the map is at; the full route stays in use for alerts.
+    """
+    from utils.route_simplify import simplify_for_zoom
+    import folium
+    
+    layer = folium.FeatureGroup(name="Planned Route")
+    folium.PolyLine(
+        simplify_for_zoom(route_points, zoom),
+        color='blue',
+        weight=4,
+        opacity=0.8,
+        popup='Planned Route'
+    ).add_to(layer)
+    return layer
+
+# Zoom the map opens at, and the route layer's zoom until the browser reports another
+MAP_ZOOM_START = 7
+
 def create_map(zones_df, incidents_df, route_points=None, current_position=None, 
                show_heatmap=True, show_zones=True, show_route=True, detected_animals=None, 
                alert_points=None, click_points=None, enable_click=True):
-    """Create the main folium map focused on Uttar Pradesh"""
+    """Create the main folium map focused on Uttar Pradesh (the route line is drawn by create_route_layer)"""
+    import folium
+    from folium import plugins
+    
     # Center map on Uttar Pradesh
     center_lat, center_lon = 27.1300, 80.7500
     m = folium.Map(
         location=[center_lat, center_lon], 
-        zoom_start=7,
+        zoom_start=MAP_ZOOM_START,
         tiles='OpenStreetMap'
     )
     
@@ -596,59 +822,28 @@ def create_map(zones_df, incidents_df, route_points=None, current_position=None,
             except Exception as e:
                 continue
     
-    # Add detected animal points
-    if detected_animals and len(detected_animals) > 0:
-        for animal in detected_animals:
-            try:
-                folium.Marker(
-                    location=[float(animal['lat']), float(animal['lon'])],
+    if show_zones:
+        polygon_zones = load_polygon_zones()
+        for i, name in enumerate(polygon_zones.names):
+            species = polygon_zones.species(i)
+            for locations in polygon_zones.folium_locations(i):
+                folium.Polygon(
+                    locations=locations,
                     popup=folium.Popup(f"""
-                        <div style="font-family: Arial; width: 250px; text-align: center;">
-                            <h3 style="color: #ff0000; margin: 0;">🚨 ANIMAL DETECTED!</h3>
-                            <hr style="margin: 8px 0;">
-                            <div style="font-size: 2rem; margin: 10px 0;">{get_species_emoji(animal['species'])}</div>
-                            <p><b>Species:</b> {animal['species'].title().replace('_', ' ')}</p>
-                            <p><b>Zone:</b> {animal['zone_name']}</p>
-                            <p><b>Detection Time:</b> {animal['detection_time']}</p>
-                            <p><b>Distance from Vehicle:</b> {animal['distance_from_vehicle']:.1f} km</p>
-                            <p><b>AI Confidence:</b> {animal['confidence']*100:.0f}%</p>
-                            <div style="background: #ffe6e6; padding: 8px; border-radius: 5px; margin-top: 10px;">
-                                <strong>⚠️ IMMEDIATE ACTION REQUIRED</strong>
-                            </div>
+                        <div style="font-family: Arial; width: 200px;">
+                            <h4 style="color: #d32f2f; margin: 0;">{get_species_emoji(species)} {name}</h4>
+                            <hr style="margin: 5px 0;">
+                            <p><b>Species:</b> {species.title().replace('_', ' ')}</p>
+                            <p><b>Notes:</b> {polygon_zones.notes[i]}</p>
                         </div>
-                    """, max_width=300),
-                    icon=folium.Icon(color='red', icon='exclamation-triangle'),
-                    tooltip=f"🚨 {animal['species'].title()} DETECTED!"
-                ).add_to(m)
-                
-                folium.Circle(
-                    location=[float(animal['lat']), float(animal['lon'])],
-                    radius=300,
-                    color=get_detection_color(animal['species']),
-                    fillColor=get_detection_color(animal['species']),
-                    fillOpacity=0.4,
-                    weight=3,
-                    popup=f"🚨 {animal['species'].title()} Detection Zone"
-                ).add_to(m)
-            except Exception as e:
-                continue
-    
-    # Add alert points trail
-    if alert_points and len(alert_points) > 0:
-        for point in alert_points:
-            try:
-                folium.CircleMarker(
-                    location=[float(point['lat']), float(point['lon'])],
-                    radius=8,
-                    popup=f"Previous Alert: {point['species'].title()}",
-                    color='darkred',
-                    fillColor='red',
-                    fillOpacity=0.7,
-                    weight=2,
-                    tooltip=f"⚠️ {point['species'].title()} alert point"
+                    """, max_width=250),
+                    tooltip=f"⚠️ {species.title()} Zone",
+                    color='red',
+                    fill=True,
+                    fill_color='red',
+                    fill_opacity=0.2,
+                    weight=2
                 ).add_to(m)
-            except Exception as e:
-                continue
     
     # Add incident heatmap
     if show_heatmap and incidents_df is not None and not incidents_df.empty:
@@ -660,17 +855,9 @@ def create_map(zones_df, incidents_df, route_points=None, current_position=None,
         except Exception as e:
             pass
     
-    # Add route
+    # Add route end points
     if show_route and route_points and len(route_points) >= 2:
         try:
-            folium.PolyLine(
-                route_points,
-                color='blue',
-                weight=4,
-                opacity=0.8,
-                popup='Planned Route'
-            ).add_to(m)
-            
             folium.Marker(
                 location=route_points[0],
                 popup='🏁 Start Point',
@@ -687,26 +874,8 @@ def create_map(zones_df, incidents_df, route_points=None, current_position=None,
         except Exception as e:
             pass
     
-    # Add current vehicle position
-    if current_position:
-        try:
-            folium.Marker(
-                location=current_position,
-                popup='🚗 Current Position',
-                icon=folium.Icon(color='blue', icon='car'),
-                tooltip='Vehicle Location'
-            ).add_to(m)
-            
-            folium.Circle(
-                location=current_position,
-                radius=500,
-                color='blue',
-                fillColor='lightblue',
-                fillOpacity=0.3,
-                weight=1
-            ).add_to(m)
-        except Exception as e:
-            pass
+    if current_position or detected_animals or alert_points:
+        create_live_layer(current_position, detected_animals, alert_points).add_to(m)
     
     # Add layer control
     try:
@@ -716,6 +885,85 @@ def create_map(zones_df, incidents_df, route_points=None, current_position=None,
     
     return m
 
+# Component key of the route map, as st_folium's key= (the browser's state is stored under its hash)
+ROUTE_MAP_KEY = "route_map"
+
+@st.cache_resource(max_entries=32)
+def load_base_map(route_key, show_heatmap, show_zones, show_route, click_points, enable_click):
+    """
+    The static route map (zones, heatmap, polygons, route end points) rendered
+    once into st_folium's component arguments. Rendering a folium map is ~100 ms
+    of template work, so a tick reuses these strings and only renders its
+    overlays (see show_route_map). Plain strings and dicts, safe to share.
+    """
+    import numpy as np
+    import branca.colormap
+    import streamlit_folium as sf
+    
+    route_points = np.frombuffer(route_key, dtype=np.float64).reshape(-1, 2).tolist()
+    zones_df = load_animal_zones()
+    if not enable_click:
+        # The corridor's zones, unless a new route is being picked on the map
+        zones_df = zones_df.iloc[load_route_corridor(route_key).rows]
+    m = create_map(zones_df, load_incident_data(), route_points if show_route else None, None,
+                   show_heatmap, show_zones, show_route,
+                   click_points=[tuple(p) for p in click_points], enable_click=enable_click)
+    
+    # The steps st_folium performs on every call, done once
+    m.get_root().render()
+    m.render()
+    html, header = sf._get_html(m), sf._get_header(m)
+    script = sf._get_map_string(m)
+    css_links, js_links = [], []
+    
+    def walk(element):
+        if isinstance(element, branca.colormap.ColorMap):
+            js_links[:0] = ["https://d3js.org/d3.v4.min.js", "https://cdnjs.cloudflare.com/ajax/libs/d3/3.5.5/d3.min.js"]
+        css_links.extend(href for _, href in getattr(element, 'default_css', []))
+        js_links.extend(src for _, src in getattr(element, 'default_js', []))
+        for child in getattr(element, '_children', {}).values():
+            walk(child)
+    
+    walk(m)
+    (south, west), (north, east) = m.get_bounds()
+    return {
+        'script': script, 'header': header, 'html': html, 'id': sf.get_full_id(m),
+        'key': sf.generate_js_hash(script, ROUTE_MAP_KEY, False),
+        'css_links': list(dict.fromkeys(css_links)), 'js_links': list(dict.fromkeys(js_links)),
+        'defaults': {
+            'last_clicked': None,
+            'zoom': MAP_ZOOM_START,
+            'bounds': {'_southWest': {'lat': south, 'lng': west}, '_northEast': {'lat': north, 'lng': east}}
+        }
+    }
+
+def route_map_state(base_map):
+    """What the browser last returned for this base map (zoom, last click), or {} before any interaction"""
+    return st.session_state.get(base_map['key']) or {}
+
+def show_route_map(base_map, overlays, returned_objects, height=500):
+    """
+    st_folium for a base map from load_base_map: sends its cached arguments
+    unchanged, so the browser keeps the map mounted, plus ``overlays`` (feature
+    groups, rendered here) that replace the previous call's.
+    """
+    import folium
+    import streamlit_folium as sf
+    
+    # Overlay scripts name the map "map_div"; any map serves as their parent while rendering
+    anchor = folium.Map(location=[27.1300, 80.7500], zoom_start=MAP_ZOOM_START, tiles=None)
+    feature_groups = "".join(sf._get_feature_group_string(group, map=anchor, idx=i)
+                             for i, group in enumerate(overlays))
+    
+    return sf._component_func(
+        script=base_map['script'], header=base_map['header'], html=base_map['html'], id=base_map['id'],
+        key=base_map['key'], height=height, width=None, returned_objects=returned_objects,
+        default={k: v for k, v in base_map['defaults'].items() if k in returned_objects},
+        zoom=None, center=None, feature_group=feature_groups, return_on_hover=False, layer_control=None,
+        pixelated=False, css_links=base_map['css_links'], js_links=base_map['js_links'],
+        wrap_longitude=False
+    )
+
 def display_mobile_alert_preview():
     """Display mobile alert preview in sidebar"""
     st.sidebar.markdown("### 📱 Mobile Alert Preview")
@@ -792,7 +1040,13 @@ def display_mobile_alerts_tab():
             """, unsafe_allow_html=True)
         
         st.markdown("#### SMS System Status")
-        if sms_system.is_initialized:
+        sms_system = peek_sms_system()
+        if sms_system is None and sms_system_error() is not None:
+            st.error(f"❌ SMS setup failed: {sms_system_error()}")
+            st.info("It will be retried when the next SMS is sent")
+        elif sms_system is None:
+            st.info("⏳ Checking SMS providers...")
+        elif sms_system.is_initialized:
             st.success("✅ Twilio SMS: ACTIVE")
             st.info("Real SMS alerts are enabled with Twilio")
         else:
@@ -814,19 +1068,426 @@ def display_mobile_alerts_tab():
             st.success("Test alert sent! Check alert history.")
             
             # Test SMS if phone number is available
-            if st.session_state.user_phone_number and sms_system.validate_phone_number(st.session_state.user_phone_number):
-                sms_success = sms_system.send_sms_alert(
-                    st.session_state.user_phone_number, 
-                    test_data, 
-                    test_alert_type
-                )
-                if sms_success:
-                    st.success("✅ Test SMS sent successfully!")
+            if st.session_state.user_phone_number and validate_phone_number(st.session_state.user_phone_number):
+                try:
+                    sms_success = get_sms_system().send_sms_alert(
+                        st.session_state.user_phone_number, 
+                        test_data, 
+                        test_alert_type
+                    )
+                except Exception as e:
+                    st.error(f"❌ SMS setup failed: {e}")
                 else:
-                    st.error("❌ Failed to send test SMS")
+                    if sms_success:
+                        st.success("✅ Test SMS sent successfully!")
+                    else:
+                        st.error("❌ Failed to send test SMS")
+
+# Live Simulation View
+AUTO_STEP_SECONDS = 1.0
+
+def process_simulation_step(journey, passed_events, corridor, risk_raster, gazetteer, alert_threshold,
+                            enable_sounds, enable_sms_alerts, enable_push_notifications, enable_emergency_sms):
+    """
+    Run zone checks, detections and notifications for the vehicle's current
+    position; returns the alerts there. Zones crossed since the last step
+    (``passed_events``) are checked inside the stretch each event opens, so a
+    large time step still alerts for them.
+    
+    Circular zones go through the session's geofence tracker: only zones the
+    vehicle could have reached since the last step are measured, and only
+    entering a zone or escalating within it is notified, not every step spent
+    inside it.
+    
+    Only the route's corridor zones are checked (see load_route_corridor), so
+    the cost of a step does not grow with the zone catalogue.
+    """
+    from utils.alert_scheduler import RISK_RANK, get_alert_scheduler
+    from utils.journey import INWARD_KINDS
+    current_position = journey.position
+    zone_table = corridor.zones
+    
+    geofence = get_geofence(zone_table, alert_threshold)
+    zone_events = geofence.update(current_position[0], current_position[1])
+    current_alerts = geofence_alerts(geofence, zone_table)
+    raised = {zone_table.names[event.zone] for event in zone_events if event.kind in ('enter', 'escalate')}
+    
+    # Polygon zones are checked when one's bounding box is near, and notified when their level rises
+    reach = max(alert_threshold, 3.0)
+    polygons_near = load_polygon_zones().near(current_position[0], current_position[1], reach)
+    if polygons_near:
+        polygon_alerts = check_polygon_zones(current_position[0], current_position[1], alert_threshold)
+        current_alerts = sorted(current_alerts + polygon_alerts, key=lambda x: x.distance)
+    else:
+        polygon_alerts = []
+    previous_levels = st.session_state.get('polygon_levels') or {}
+    raised.update(alert.zone_name for alert in polygon_alerts
+                  if RISK_RANK[alert.risk_level] > RISK_RANK.get(previous_levels.get(alert.zone_name), 0))
+    st.session_state.polygon_levels = {alert.zone_name: alert.risk_level for alert in polygon_alerts}
+    
+    # The raster cell is zero when no circular zone is within reach, so skip detections there
+    if polygons_near or risk_raster.may_alert(current_position[0], current_position[1], reach):
+        new_detections = simulate_animal_detection(current_position, zone_table, detection_radius=3.0)
+    else:
+        new_detections = []
+    
+    location_hint = gazetteer.describe(current_position[0], current_position[1])
+    if location_hint:
+        for alert in current_alerts:
+            alert.location_hint = location_hint
+        for detection in new_detections:
+            detection.location_hint = location_hint
+    
+    passed_alerts = []
+    _, use_projection = load_distance_backend()
+    alerted_zones = {alert.zone_name for alert in current_alerts}
+    for event in passed_events:
+        zone_name = journey.plan.zone_names[event.zone] if event.zone >= 0 else None
+        if event.kind not in INWARD_KINDS or zone_name in alerted_zones:
+            continue
+        probe = journey.plan.position_at_distance(event.probe_km)
+        for alert in check_animal_zones(probe[0], probe[1], zone_table, alert_threshold,
+                                        corridor.projected if use_projection else None):
+            if alert.zone_name == zone_name:
+                alert.location_hint = gazetteer.describe(probe[0], probe[1])
+                passed_alerts.append(alert)
+                alerted_zones.add(zone_name)
+    
+    for detection in new_detections:
+        is_new_detection = True
+        for existing in st.session_state.detected_animals:
+            if (existing.species == detection.species and 
+                calculate_distance(existing.lat, existing.lon, 
+                                 detection.lat, detection.lon) < 0.5):
+                is_new_detection = False
+                break
+        
+        if is_new_detection:
+            st.session_state.detected_animals.append(detection)
+            st.session_state.alert_points.append({
+                'lat': detection.lat,
+                'lon': detection.lon, 
+                'species': detection.species,
+                'timestamp': detection.detection_time
+            })
+    
+    scheduler = get_alert_scheduler()
+    for event in zone_events:
+        if event.kind == 'exit':
+            st.session_state.alert_log.append(
+                f"✅ {datetime.now().strftime('%H:%M:%S')} - Left {zone_table.names[event.zone]} "
+                f"({zone_table.species(event.zone).title()} zone)")
+    
+    notify_alerts = passed_alerts + [alert for alert in current_alerts if alert.zone_name in raised]
+    if notify_alerts:
+        for alert in notify_alerts:
+            log_entry = f"⚠️ {datetime.now().strftime('%H:%M:%S')} - {alert.risk_level} ALERT: {alert.species.title()} zone at {alert.distance}km"
+            if log_entry not in st.session_state.alert_log:
+                st.session_state.alert_log.append(log_entry)
+                scheduler.collect(alert.risk_level, alert)
+                
+                if alert.risk_level == 'CRITICAL':
+                    st.session_state.eco_points += 50
+                elif alert.risk_level == 'HIGH':
+                    st.session_state.eco_points += 30
+                else:
+                    st.session_state.eco_points += 10
+    
+    if new_detections:
+        for detection in new_detections:
+            detection_log = f"🚨 {detection.detection_time} - ANIMAL DETECTED: {detection.species.title()} at {detection.distance_from_vehicle:.1f}km (Confidence: {detection.confidence*100:.0f}%)"
+            st.session_state.alert_log.append(detection_log)
+            scheduler.collect('animal_detected', detection)
+            
+            st.session_state.eco_points += 75
+    
+    # One consolidated notification per channel for everything found this step; rate limits
+    # count simulated driving time, not wall time, however far the step jumped
+    notify_step_alerts(scheduler, enable_sounds, enable_sms_alerts,
+                       enable_push_notifications, enable_emergency_sms, now=journey.time_s)
+    
+    if not new_detections:
+        safe_log = f"✅ {datetime.now().strftime('%H:%M:%S')} - Route segment clear"
+        if len(st.session_state.alert_log) == 0 or not st.session_state.alert_log[-1].startswith("✅"):
+            st.session_state.alert_log.append(safe_log)
+    
+    return current_alerts
+
+def render_live_alert_panel(current_alerts, enable_sounds, enable_sms_alerts):
+    """Active alerts / all-clear box, eco points and the latest mobile alerts"""
+    if st.session_state.simulation_running and current_alerts:
+        st.markdown("### ⚠️ ACTIVE ALERTS")
+        
+        for alert in current_alerts:
+            risk_color = {
+                "CRITICAL": "alert-box",
+                "HIGH": "alert-box", 
+                "MEDIUM": "warning-box"
+            }.get(alert.risk_level, "warning-box")
+            
+            st.markdown(f"""
+            <div class="{risk_color}">
+                <h4>{get_species_emoji(alert.species)} {alert.zone_name}</h4>
+                <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
+                    <span><strong>Species:</strong></span>
+                    <span>{alert.species.title().replace('_', ' ')}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
+                    <span><strong>Distance:</strong></span>
+                    <span>{alert.distance} km</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
+                    <span><strong>Risk Level:</strong></span>
+                    <span>{alert.risk_level}</span>
+                </div>
+                <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
+                    <span><strong>Max Speed:</strong></span>
+                    <span>{alert.recommended_speed} km/h</span>
+                </div>
+                <hr style="margin: 0.5rem 0; border: 1px solid rgba(255,255,255,0.3);">
+                <p style="margin: 0; font-size: 0.85rem;"><strong>Action:</strong> {alert.notes}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Show alert status
+        if enable_sounds:
+            st.markdown(f"""
+            <div style="background: #4CAF50; color: white; padding: 10px; border-radius: 5px; text-align: center; margin: 10px 0;">
+                🔊 Alert Sounds: ACTIVE
+            </div>
+            """, unsafe_allow_html=True)
+        
+        if enable_sms_alerts:
+            st.markdown(f"""
+            <div style="background: #2196F3; color: white; padding: 10px; border-radius: 5px; text-align: center; margin: 5px 0;">
+                📱 SMS Alerts: ACTIVE
+            </div>
+            """, unsafe_allow_html=True)
+            
+    elif st.session_state.simulation_running:
+        st.markdown('<div class="safe-box">✅ All Clear<br><small>No wildlife zones detected in range</small></div>', 
+                  unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="info-box">📍 Start Simulation<br><small>Click "Start Route Simulation" to begin</small></div>', 
+                  unsafe_allow_html=True)
+    
+    if st.session_state.eco_points > 0:
+        st.markdown(f"""
+        <div class="eco-points">
+            🏆 Eco Points: {st.session_state.eco_points}
+            <br><small>Earned for wildlife-safe driving!</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Mobile Alerts Preview
+    if st.session_state.mobile_alerts:
+        st.markdown("### 📱 Recent Mobile Alerts")
+        recent_alerts = st.session_state.mobile_alerts[-3:]  # Show last 3 alerts
+        for alert in reversed(recent_alerts):
+            priority_color = {
+                "critical": "#ff4444",
+                "high": "#ff6b6b", 
+                "medium": "#ffa726"
+            }.get(alert.get('priority', 'medium'), "#ffa726")
+            
+            st.markdown(f"""
+            <div style="border-left: 4px solid {priority_color}; padding: 10px; margin: 5px 0; background: #f8f9fa; border-radius: 5px;">
+                <div style="font-weight: bold; color: {priority_color};">{alert['title']}</div>
+                <div style="font-size: 0.8rem; color: #666;">{alert['timestamp']}</div>
+                <div style="margin-top: 5px; font-size: 0.9rem;">{alert['message']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+def render_activity_log():
+    """Last few entries of the simulation log"""
+    st.markdown("### 📜 Activity Log")
+    
+    if st.session_state.alert_log:
+        for log_entry in st.session_state.alert_log[-5:]:
+            log_class = "alert-log" if "ALERT" in log_entry else "safe-log"
+            st.markdown(f'<div class="{log_class}">{log_entry}</div>', unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="info-box"><small>No activity yet - start simulation to see logs</small></div>', 
+                  unsafe_allow_html=True)
+
+def get_journey(route_points, alert_threshold, time_scale):
+    """The session's journey along the current route, kept on the route's current timetable"""
+    import numpy as np
+    from utils.journey import Journey
+    plan = load_journey_plan(np.asarray(route_points, dtype=np.float64).tobytes(), alert_threshold)
+    journey = st.session_state.get('journey')
+    if journey is None or journey.plan is not plan:
+        # A new alert range changes the events but not the drive: keep the distance covered
+        start_s = 0.0
+        if journey is not None and np.array_equal(journey.plan.coords, plan.coords):
+            start_s = plan.time_at(journey.distance_km)
+        journey = Journey(plan, time_s=start_s)
+        st.session_state.journey = journey
+    journey.time_scale = time_scale
+    return journey
+
+def advance_journey(journey, passed_events):
+    """Queue the events passed by a time step for processing and sync the step index"""
+    st.session_state.journey_events = st.session_state.get('journey_events', []) + passed_events
+    st.session_state.simulation_step = journey.plan.vertex_index(journey.distance_km)
+
+def render_simulation_view(journey, route_key, route_metrics, corridor, risk_raster, gazetteer, settings, slots):
+    """
+    Simulation controls, progress, map and live alert panels.
+    
+    Runs as an st.fragment (see main): a tick or a step button reruns only this
+    function, not the sidebar, tabs and analytics. The alert panel, metric and
+    log live in the right-hand column, so they are written into containers
+    created there (``slots``); the audio player is re-rendered here only on
+    fragment-only reruns, since a full run renders it at the end of main().
+    
+    Time is continuous: ticks advance the journey by the elapsed wall time
+    times the acceleration, and buttons jump to the next event or ahead in time.
+    """
+    from utils.journey import format_duration
+    from utils.sound_alerts import render_audio_player
+    route_points = journey.plan.coords.tolist()
+    upcoming = None
+    
+    if st.session_state.simulation_running:
+        if settings['auto_simulation'] and not journey.finished:
+            # Advance on timer ticks only; a full rerun in between (e.g. a sidebar change) keeps the time
+            now = time.monotonic()
+            last_tick = st.session_state.get('last_auto_tick')
+            if last_tick is None or now - last_tick >= AUTO_STEP_SECONDS * 0.9:
+                # Capped so a stalled or paused session does not leap ahead on its next tick
+                elapsed = AUTO_STEP_SECONDS if last_tick is None else min(now - last_tick, 2 * AUTO_STEP_SECONDS)
+                st.session_state.last_auto_tick = now
+                advance_journey(journey, journey.advance_wall(elapsed))
+                if journey.finished:
+                    # Rerun the whole app so the fragment is re-created without a timer
+                    st.rerun()
+        
+        sim_col1, sim_col2, sim_col3 = st.columns(3)
+        
+        with sim_col1:
+            next_event = journey.next_event()
+            if st.button("⏭️ Next Event", disabled=next_event is None):
+                advance_journey(journey, journey.advance_to(next_event.time_s))
+        
+        with sim_col2:
+            if st.button("⏩ +5 min"):
+                advance_journey(journey, journey.advance(300))
+        
+        with sim_col3:
+            if st.button("🏁 To End"):
+                advance_journey(journey, journey.advance_to(journey.plan.total_s))
+        
+        progress = journey.progress
+        st.progress(progress, text=f"Journey Progress: {progress*100:.1f}% · "
+                                   f"{journey.distance_km:.1f}/{journey.plan.total_km:.1f} km · "
+                                   f"ETA {format_duration(journey.eta_s())}")
+        
+        upcoming = route_metrics.next_entry(journey.distance_km)
+        next_zone = (f"next zone: {journey.plan.zone_names[upcoming.zone]} in {upcoming.distance_km:.1f} km / "
+                     f"{format_duration(upcoming.seconds)}" if upcoming else "no more zones ahead")
+        seed = st.session_state.get('detection_seed')
+        st.caption(f"🚗 {journey.speed_kmph:.0f} km/h · ⏱️ {format_duration(journey.time_s)} driven "
+                   f"at {journey.time_scale:g}× · {next_zone}" + (f" · 🎲 seed {seed}" if seed is not None else ""))
+    
+    current_position = None
+    current_alerts = []
+    if st.session_state.simulation_running:
+        current_position = journey.position
+        # Each point in time is processed once, however many times the view redraws it
+        if st.session_state.get('processed_time') != journey.time_s:
+            passed_events = st.session_state.get('journey_events', [])
+            st.session_state.journey_events = []
+            st.session_state.current_alerts = process_simulation_step(
+                journey, passed_events, corridor, risk_raster, gazetteer, settings['alert_threshold'],
+                settings['enable_sounds'], settings['enable_sms_alerts'],
+                settings['enable_push_notifications'], settings['enable_emergency_sms'])
+            st.session_state.processed_time = journey.time_s
+        current_alerts = st.session_state.get('current_alerts', [])
+    
+    try:
+        enable_map_clicks = (st.session_state.selected_route_mode == "🗺️ Custom Map Selection")
+        
+        # Built once per route and display options; a tick only renders the overlays below
+        base_map = load_base_map(route_key, settings['show_heatmap'], settings['show_zones'], settings['show_route'],
+                                 tuple(map(tuple, st.session_state.map_click_points)), enable_map_clicks)
+        live_layer = create_live_layer(
+            current_position,
+            detected_animals=st.session_state.detected_animals if settings['show_detections'] else None,
+            alert_points=st.session_state.alert_points if settings['show_alert_trail'] else None
+        )
+        # The route goes with the live layer, simplified for the zoom the map last reported;
+        # a zoom change reruns this fragment, which resends the line only for the new band
+        overlays = [live_layer]
+        if settings['show_route']:
+            zoom = route_map_state(base_map).get('zoom') or MAP_ZOOM_START
+            overlays.insert(0, create_route_layer(route_points, zoom))
+        
+        st.markdown('<div style="border-radius: 15px; overflow: hidden; box-shadow: 0 15px 30px rgba(0,0,0,0.2);">', unsafe_allow_html=True)
+        
+        if enable_map_clicks:
+            map_data = show_route_map(base_map, overlays, ["last_clicked", "zoom"])
+            
+            if map_data and map_data.get("last_clicked"):
+                clicked_lat = map_data["last_clicked"]["lat"]
+                clicked_lon = map_data["last_clicked"]["lng"]
+                
+                new_point = (clicked_lat, clicked_lon)
+                if new_point not in st.session_state.map_click_points:
+                    st.session_state.map_click_points.append(new_point)
+                    st.rerun()
+        else:
+            show_route_map(base_map, overlays, ["zoom"])
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+    except Exception as e:
+        st.error(f"Map error: {e}")
+    
+    with slots['live_panel']:
+        render_live_alert_panel(current_alerts, settings['enable_sounds'], settings['enable_sms_alerts'])
+    
+    with slots['current_alerts']:
+        if st.session_state.simulation_running and current_position:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-number">{len(current_alerts)}</div>
+                <div class="metric-label">⚠️ Current Alerts</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if upcoming:
+                st.markdown(f"""
+                <div class="metric-card">
+                    <div class="metric-number">{format_duration(upcoming.seconds)}</div>
+                    <div class="metric-label">⏱️ Until {journey.plan.zone_names[upcoming.zone]}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    with slots['activity_log']:
+        render_activity_log()
+    
+    if not st.session_state.get('full_run_active'):
+        with slots['audio']:
+            render_audio_player(volume=settings['sound_volume'], enabled=settings['enable_sounds'])
 
 # Main Application
 def main():
+    # Reserved first so the audio player keeps a stable position across reruns
+    audio_slot = st.empty()
+    # Tells the simulation fragment whether this full run renders the audio player itself.
+    # Cleared however the run ends: st.rerun(), st.stop() and errors all raise through here
+    st.session_state.full_run_active = True
+    try:
+        render_app(audio_slot)
+    finally:
+        st.session_state.full_run_active = False
+
+def render_app(audio_slot):
+    """Everything a full run draws; the audio player goes last, into ``audio_slot``"""
+    # Provider probing can take seconds; do it off the script thread
+    warm_sms_system()
+    
     st.markdown(
         """
         <style>
@@ -876,12 +1537,9 @@ def main():
         """,
         unsafe_allow_html=True
     )
-    # Load data
-    zones_df = load_animal_zones()
-    incidents_df = load_incident_data()
-    popular_locations = get_popular_locations()
+    library_route = None
     
-    # Sidebar Controls
+    # Sidebar Controls: drawn before any data loads, except what a chosen mode needs
     with st.sidebar: 
          
         st.markdown('<div class="main-container">', unsafe_allow_html=True)
@@ -909,14 +1567,14 @@ def main():
 
         if user_phone:
             st.session_state.user_phone_number = user_phone
-            if sms_system.validate_phone_number(user_phone):
+            if validate_phone_number(user_phone):
                 st.success("✅ Valid phone number - Ready for SMS alerts!")
             else:
                 st.warning("⚠️ Please check phone number format (e.g., +91 9876543210)")
 
         # Test SMS functionality
         if st.button("📲 Test SMS Alert"):
-            if user_phone and sms_system.validate_phone_number(user_phone):
+            if user_phone and validate_phone_number(user_phone):
                 test_data = {
                     'species': 'tiger',
                     'zone_name': 'Dudhwa Tiger Reserve',
@@ -925,11 +1583,15 @@ def main():
                     'confidence': 0.95,
                     'recommended_speed': 25
                 }
-                success = sms_system.send_sms_alert(user_phone, test_data, "warning")
-                if success:
-                    st.success("✅ Test SMS sent successfully!")
+                try:
+                    success = get_sms_system().send_sms_alert(user_phone, test_data, "warning")
+                except Exception as e:
+                    st.error(f"❌ SMS setup failed: {e}")
                 else:
-                    st.error("❌ Failed to send test SMS")
+                    if success:
+                        st.success("✅ Test SMS sent successfully!")
+                    else:
+                        st.error("❌ Failed to send test SMS")
             else:
                 st.error("Please enter a valid phone number first")
         
@@ -952,38 +1614,47 @@ def main():
         if st.session_state.route_type == "alert":
             st.warning("🚨 Alert Test Route Selected - This route will trigger multiple animal alerts!")
         
+        follow_roads = False
+        risk_avoidance = 1.0
+        if st.session_state.route_type == "normal" and route_mode != "🗺️ Custom Map Selection":
+            follow_roads = st.checkbox("🛣️ Follow Road Network", value=True,
+                                       help="Route along roads instead of a straight line")
+            if follow_roads:
+                risk_avoidance = st.slider("🐾 Wildlife Avoidance", 0.0, 5.0, 1.0, 0.5,
+                                           help="Extra driving minutes accepted to avoid one minute inside a wildlife zone")
+        
         if route_mode == "📍 Preset Routes":
             st.markdown("### 🏙️ Select UP Locations")
             
+            place_query = st.text_input("🔎 Search Places", placeholder="Village, town, checkpost or forest gate")
+            location_options = dict(get_popular_locations())
+            if place_query:
+                matches = load_gazetteer().search(place_query, limit=15)
+                for place in matches:
+                    location_options.setdefault(place.name, (place.lat, place.lon))
+                if not matches:
+                    st.caption("No matching places found")
+            
             col1, col2 = st.columns(2)
             with col1:
-                start_location = st.selectbox("Start Location", list(popular_locations.keys()), 
-                                            index=list(popular_locations.keys()).index("Lucknow"))
-                start_lat, start_lon = popular_locations[start_location]
+                start_location = st.selectbox("Start Location", list(location_options.keys()), 
+                                            index=list(location_options.keys()).index("Lucknow"))
+                start_lat, start_lon = location_options[start_location]
             
             with col2:
-                end_location = st.selectbox("End Location", list(popular_locations.keys()), 
-                                          index=list(popular_locations.keys()).index("Dudhwa Tiger Reserve"))
-                end_lat, end_lon = popular_locations[end_location]
+                end_location = st.selectbox("End Location", list(location_options.keys()), 
+                                          index=list(location_options.keys()).index("Dudhwa Tiger Reserve"))
+                end_lat, end_lon = location_options[end_location]
             
             st.markdown("### 🚀 Quick Presets")
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("Lucknow → Dudhwa"):
-                    start_lat, start_lon = popular_locations["Lucknow"]
-                    end_lat, end_lon = popular_locations["Dudhwa Tiger Reserve"]
-                    st.rerun()
-                
-                if st.button("Kanpur → Katarniaghat"):
-                    start_lat, start_lon = popular_locations["Kanpur"]
-                    end_lat, end_lon = popular_locations["Katarniaghat Sanctuary"]
-                    st.rerun()
-            
-            with col2:
-                if st.button("Varanasi → Pilibhit"):
-                    start_lat, start_lon = popular_locations["Varanasi"]
-                    end_lat, end_lon = popular_locations["Pilibhit Tiger Reserve"]
-                    st.rerun()
+            route_library = load_route_library()
+            preset_ids = [route.route_id for route in route_library.presets()]
+            preset_id = st.selectbox("Saved Route", [None] + preset_ids,
+                                     format_func=lambda route_id: "Start → End above" if route_id is None
+                                     else route_library[route_id].name,
+                                     help="Multi-waypoint routes from data/routes.csv")
+            if preset_id is not None:
+                library_route = route_library[preset_id]
         
         elif route_mode == "🔢 Manual Coordinates":
             st.markdown("### 📍 Enter Coordinates")
@@ -1033,14 +1704,30 @@ def main():
         show_alert_trail = st.checkbox("📍 Show Alert History Trail", value=True)
         
         st.markdown("### ⚠️ Safety Settings")
-        alert_threshold = st.slider("Alert Range (km)", min_value=1, max_value=10, value=3)
+        alert_threshold = st.slider("Alert Range (km)", min_value=ALERT_RANGE_PREVIEW_KM[0],
+                                    max_value=ALERT_RANGE_PREVIEW_KM[-1], value=3)
         auto_simulation = st.checkbox("🤖 Auto-advance Simulation", value=False)
+        time_scale = st.select_slider("⏱️ Time Acceleration", options=[1, 10, 30, 60, 120, 300, 600], value=120,
+                                      format_func=lambda x: f"{x}×",
+                                      help="Simulated seconds per real second while auto-advancing")
         
         st.markdown("### 🎮 Simulation")
+        playback_mode = st.checkbox("🎬 Browser Playback", value=False,
+                                    help="Play the whole journey in your browser: the route and its alerts are "
+                                         "sent once, with no server round-trip per step")
         
         if st.button("▶️ Start Route Simulation", width="stretch"):
             st.session_state.simulation_running = True
             st.session_state.simulation_step = 0
+            st.session_state.processed_time = None
+            st.session_state.journey = None
+            st.session_state.journey_events = []
+            st.session_state.detection_simulator = None
+            st.session_state.geofence = None
+            st.session_state.polygon_levels = {}
+            st.session_state.alert_scheduler = None
+            st.session_state.detection_seed = None
+            st.session_state.current_alerts = []
             st.session_state.alert_log = []
             st.session_state.alert_points = []
             st.session_state.detected_animals = []
@@ -1054,6 +1741,15 @@ def main():
         if st.button("🔄 Reset Simulation", width="stretch"):
             st.session_state.simulation_running = False
             st.session_state.simulation_step = 0
+            st.session_state.processed_time = None
+            st.session_state.journey = None
+            st.session_state.journey_events = []
+            st.session_state.detection_simulator = None
+            st.session_state.geofence = None
+            st.session_state.polygon_levels = {}
+            st.session_state.alert_scheduler = None
+            st.session_state.detection_seed = None
+            st.session_state.current_alerts = []
             st.session_state.alert_log = []
             st.session_state.alert_points = []
             st.session_state.detected_animals = []
@@ -1063,26 +1759,58 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Load data
+    import numpy as np
+    from utils.geo import cumulative_km
+    from utils.journey import format_duration
+    from utils.playback import render_journey_playback
+    from utils.route_table import RISK_LEVELS
+    from utils.sound_alerts import play_audio_alert, render_audio_player
+    zones_df = load_animal_zones()
+    zone_table = load_zone_table()
+    incidents_df = load_incident_data()
+    gazetteer = load_gazetteer()
+    risk_raster = load_risk_raster()
+    
     # Generate route points
     try:
         if st.session_state.selected_route_mode == "🗺️ Custom Map Selection" and st.session_state.custom_route_points:
             route_points = st.session_state.custom_route_points
-            route_distance = calculate_distance(route_points[0][0], route_points[0][1], 
-                                              route_points[-1][0], route_points[-1][1])
+            route_distance = float(cumulative_km(route_points)[-1])
             st.info("🗺️ Custom Route Active - You created this route by clicking on the map!")
         
         elif st.session_state.route_type == "alert":
-            route_points = generate_alert_route_points()
-            route_distance = calculate_distance(route_points[0][0], route_points[0][1], 
-                                              route_points[-1][0], route_points[-1][1])
+            from utils.route_library import ALERT_ROUTE_ID
+            library_route = load_route_library()[ALERT_ROUTE_ID]
+            route_points = library_route.points
+            route_distance = library_route.length_km
             st.info("🚨 Alert Test Route Active - This route passes through multiple animal zones!")
+        elif library_route is not None:
+            route_points = library_route.points
+            route_distance = library_route.length_km
+            (start_lat, start_lon), (end_lat, end_lon) = library_route.start, library_route.end
         else:
-            route_points = generate_route_points(start_lat, start_lon, end_lat, end_lon, 120)
-            route_distance = calculate_distance(start_lat, start_lon, end_lat, end_lon)
+            selected_alternative = st.session_state.selected_alternative
+            road_route = None
+            if selected_alternative and selected_alternative['key'] == (start_lat, start_lon, end_lat, end_lon):
+                road_route = selected_alternative['points'], selected_alternative['distance']
+            elif follow_roads:
+                road_route = plan_road_route(start_lat, start_lon, end_lat, end_lon, risk_avoidance)
+            if road_route is not None:
+                route_points, route_distance = road_route
+            else:
+                route_points = generate_route_points(start_lat, start_lon, end_lat, end_lon, 120)
+                route_distance = float(cumulative_km(route_points)[-1])
     except Exception as e:
         st.error(f"Route generation error: {e}")
         return
     
+    if library_route is not None:
+        route_bytes = library_route.key
+    else:
+        route_bytes = np.asarray(route_points, dtype=np.float64).tobytes()
+    route_metrics = load_route_metrics(route_bytes)
+    
     # Main Content Layout
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
     
@@ -1099,6 +1827,8 @@ def main():
         
         elif st.session_state.route_type == "alert":
             st.success("🎯 **Alert Test Route**: This route is designed to demonstrate multiple animal detection scenarios!")
+        elif library_route is not None:
+            st.info(f"📍 **{library_route.name}**: {len(library_route.waypoints)} waypoints, {library_route.length_km:.0f} km")
         else:
             route_mode_display = {
                 "📍 Preset Routes": "Preset Route",
@@ -1106,152 +1836,65 @@ def main():
             }
             st.info(f"📍 **{route_mode_display.get(st.session_state.selected_route_mode, 'Route')}**: {start_lat:.4f}, {start_lon:.4f} → {end_lat:.4f}, {end_lon:.4f}")
         
-        current_position = None
-        current_alerts = []
-        
-        if st.session_state.simulation_running:
-            if auto_simulation:
-                time.sleep(1)
-                if st.session_state.simulation_step < len(route_points) - 1:
-                    st.session_state.simulation_step += 2
-                    st.rerun()
-            
-            sim_col1, sim_col2, sim_col3 = st.columns(3)
-            
-            with sim_col1:
-                if st.button("⏭️ Next Step") and st.session_state.simulation_step < len(route_points) - 1:
-                    st.session_state.simulation_step += 3
-                    st.rerun()
-            
-            with sim_col2:
-                if st.button("⏩ Jump 10"):
-                    st.session_state.simulation_step = min(
-                        st.session_state.simulation_step + 10, 
-                        len(route_points) - 1
-                    )
-                    st.rerun()
-            
-            with sim_col3:
-                if st.button("🏁 To End"):
-                    st.session_state.simulation_step = len(route_points) - 1
-                    st.rerun()
-            
-            progress = st.session_state.simulation_step / max(len(route_points) - 1, 1)
-            st.progress(progress, text=f"Journey Progress: {progress*100:.1f}%")
-            
-            if st.session_state.simulation_step < len(route_points):
-                current_position = route_points[st.session_state.simulation_step]
-                
-                current_alerts = check_animal_zones(
-                    current_position[0], current_position[1], 
-                    zones_df, alert_threshold
-                )
-                
-                new_detections = simulate_animal_detection(current_position, zones_df, detection_radius=3.0)
-                
-                for detection in new_detections:
-                    is_new_detection = True
-                    for existing in st.session_state.detected_animals:
-                        if (existing['species'] == detection['species'] and 
-                            calculate_distance(existing['lat'], existing['lon'], 
-                                             detection['lat'], detection['lon']) < 0.5):
-                            is_new_detection = False
-                            break
-                    
-                    if is_new_detection:
-                        st.session_state.detected_animals.append(detection)
-                        st.session_state.alert_points.append({
-                            'lat': detection['lat'],
-                            'lon': detection['lon'], 
-                            'species': detection['species'],
-                            'timestamp': detection['detection_time']
-                        })
-                
-                if current_alerts:
-                    for alert in current_alerts:
-                        log_entry = f"⚠️ {datetime.now().strftime('%H:%M:%S')} - {alert['risk_level']} ALERT: {alert['species'].title()} zone at {alert['distance']}km"
-                        if log_entry not in st.session_state.alert_log:
-                            st.session_state.alert_log.append(log_entry)
-                            
-                            # Send mobile alerts based on alert type
-                            if enable_sms_alerts or enable_push_notifications:
-                                if alert['risk_level'] == 'CRITICAL':
-                                    mobile_alert = send_mobile_alert(alert, "critical")
-                                    if enable_emergency_sms:
-                                        send_emergency_sms(alert)
-                                elif alert['risk_level'] == 'HIGH':
-                                    mobile_alert = send_mobile_alert(alert, "warning")
-                                else:
-                                    mobile_alert = send_mobile_alert(alert, "warning")
-                            
-                            # Play alert sound if enabled
-                            if enable_sounds:
-                                if alert['risk_level'] == 'CRITICAL':
-                                    play_audio_alert("critical")
-                                else:
-                                    play_audio_alert("general")
-                            
-                            if alert['risk_level'] == 'CRITICAL':
-                                st.session_state.eco_points += 50
-                            elif alert['risk_level'] == 'HIGH':
-                                st.session_state.eco_points += 30
-                            else:
-                                st.session_state.eco_points += 10
-                
-                if new_detections:
-                    for detection in new_detections:
-                        detection_log = f"🚨 {detection['detection_time']} - ANIMAL DETECTED: {detection['species'].title()} at {detection['distance_from_vehicle']:.1f}km (Confidence: {detection['confidence']*100:.0f}%)"
-                        st.session_state.alert_log.append(detection_log)
-                        
-                        # Send mobile alert for animal detection
-                        if enable_sms_alerts or enable_push_notifications:
-                            mobile_alert = send_mobile_alert(detection, "animal_detected")
-                        
-                        # Play animal detection sound if enabled
-                        if enable_sounds:
-                            play_audio_alert("animal_detected")
-                        
-                        st.session_state.eco_points += 75
-                else:
-                    safe_log = f"✅ {datetime.now().strftime('%H:%M:%S')} - Route segment clear"
-                    if len(st.session_state.alert_log) == 0 or not st.session_state.alert_log[-1].startswith("✅"):
-                        st.session_state.alert_log.append(safe_log)
-        
-        try:
-            enable_map_clicks = (st.session_state.selected_route_mode == "🗺️ Custom Map Selection")
-            
-            map_obj = create_map(
-                zones_df, incidents_df, 
-                route_points if show_route else None, 
-                current_position, 
-                show_heatmap, show_zones, show_route,
-                detected_animals=st.session_state.detected_animals if show_detections else None,
-                alert_points=st.session_state.alert_points if show_alert_trail else None,
-                click_points=st.session_state.map_click_points,
-                enable_click=enable_map_clicks
+        # Filled by the simulation fragment below, once the alert panel slots exist
+        simulation_slot = st.container()
+        
+        with st.expander("📋 Route Risk Profile"):
+            route_table = load_route_table(route_bytes, alert_threshold)
+            summary = route_table.summary()
+            risk_cols = st.columns(len(RISK_LEVELS))
+            for risk_col, level in zip(risk_cols, reversed(RISK_LEVELS)):
+                share = summary['risk_points'][level] / max(summary['points'], 1)
+                risk_col.metric(level.title(), f"{share * 100:.0f}%", help="Share of route points in this risk band")
+            # Library margins were computed against the full catalogue, the others against the corridor
+            route_zones = load_route_corridor(route_bytes).zones
+            if library_route is not None:
+                margins, margin_zones = library_route.margins, zone_table
+            else:
+                margins, margin_zones = load_approach_margins(route_bytes), route_zones
+            alert_zones = ", ".join(
+                f"{margin_zones.names[z]} ({'entered' if margin <= 0 else f'{margin:.1f} km'})"
+                for z, margin in zip(margins.zones_within(alert_threshold), margins.margin_km)
+            ) or "none"
+            st.caption(f"Lowest recommended speed: {summary['min_speed_kmph']:.0f} km/h · Zones in alert range: {alert_zones}")
+            preview = " · ".join(
+                f"**{km} km: {count}**" if km == alert_threshold else f"{km} km: {count}"
+                for km, count in zip(ALERT_RANGE_PREVIEW_KM, margins.preview(ALERT_RANGE_PREVIEW_KM).tolist())
             )
-            
-            st.markdown('<div style="border-radius: 15px; overflow: hidden; box-shadow: 0 15px 30px rgba(0,0,0,0.2);">', unsafe_allow_html=True)
-            
-            if enable_map_clicks:
-                map_data = st_folium(map_obj, width=None, height=500, 
-                                   returned_objects=["last_clicked"])
+            st.caption(f"Zones alerting by Alert Range: {preview}")
+            st.download_button("⬇️ Download Risk Table (CSV)",
+                               data=lambda: route_table.to_dataframe(route_zones).to_csv(index=False),
+                               file_name="route_risk_profile.csv", mime="text/csv")
+        
+        if (st.session_state.route_type == "normal" and library_route is None
+                and st.session_state.selected_route_mode != "🗺️ Custom Map Selection"):
+            with st.expander("🔀 Compare Alternative Routes"):
+                route_key = (start_lat, start_lon, end_lat, end_lon)
+                selected_alternative = st.session_state.selected_alternative
+                if selected_alternative and selected_alternative['key'] == route_key:
+                    st.caption(f"Using: {selected_alternative['label']}")
                 
-                if map_data and map_data.get("last_clicked"):
-                    clicked_lat = map_data["last_clicked"]["lat"]
-                    clicked_lon = map_data["last_clicked"]["lng"]
-                    
-                    new_point = (clicked_lat, clicked_lon)
-                    if new_point not in st.session_state.map_click_points:
-                        st.session_state.map_click_points.append(new_point)
-                        st.rerun()
-            else:
-                st_folium(map_obj, width=None, height=500)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        except Exception as e:
-            st.error(f"Map error: {e}")
+                alternatives = get_route_alternatives(start_lat, start_lon, end_lat, end_lon)
+                if alternatives:
+                    alt_cols = st.columns(len(alternatives))
+                    for i, (alt_col, alt) in enumerate(zip(alt_cols, alternatives)):
+                        with alt_col:
+                            st.markdown(f"**{alt['label']}**")
+                            st.metric("Distance", f"{alt['length_km']:.0f} km")
+                            st.metric("Drive Time", f"{alt['travel_minutes']:.0f} min")
+                            st.metric("Wildlife Exposure", f"{alt['exposure_minutes']:.1f} min")
+                            for zone_name, minutes in alt['zone_minutes'].items():
+                                st.caption(f"{zone_name}: {minutes:.1f} min")
+                            if st.button("Use This Route", key=f"use_alternative_{i}"):
+                                st.session_state.selected_alternative = {
+                                    'key': route_key,
+                                    'label': alt['label'],
+                                    'points': alt['points'],
+                                    'distance': alt['length_km']
+                                }
+                                st.rerun()
+                else:
+                    st.info("No alternative routes found between these points")
     
     with col_alerts:
         st.markdown("## 🚨 Live Alert Dashboard")
@@ -1263,88 +1906,8 @@ def main():
             st.markdown('<div class="info-box">🗺️ CUSTOM ROUTE MODE<br><small>You designed this route</small></div>', 
                       unsafe_allow_html=True)
         
-        if st.session_state.simulation_running and current_alerts:
-            st.markdown("### ⚠️ ACTIVE ALERTS")
-            
-            for alert in current_alerts:
-                risk_color = {
-                    "CRITICAL": "alert-box",
-                    "HIGH": "alert-box", 
-                    "MEDIUM": "warning-box"
-                }.get(alert['risk_level'], "warning-box")
-                
-                st.markdown(f"""
-                <div class="{risk_color}">
-                    <h4>{get_species_emoji(alert['species'])} {alert['zone_name']}</h4>
-                    <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
-                        <span><strong>Species:</strong></span>
-                        <span>{alert['species'].title().replace('_', ' ')}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
-                        <span><strong>Distance:</strong></span>
-                        <span>{alert['distance']} km</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
-                        <span><strong>Risk Level:</strong></span>
-                        <span>{alert['risk_level']}</span>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; margin: 0.3rem 0;">
-                        <span><strong>Max Speed:</strong></span>
-                        <span>{alert['recommended_speed']} km/h</span>
-                    </div>
-                    <hr style="margin: 0.5rem 0; border: 1px solid rgba(255,255,255,0.3);">
-                    <p style="margin: 0; font-size: 0.85rem;"><strong>Action:</strong> {alert['notes']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Show alert status
-            if enable_sounds:
-                st.markdown(f"""
-                <div style="background: #4CAF50; color: white; padding: 10px; border-radius: 5px; text-align: center; margin: 10px 0;">
-                    🔊 Alert Sounds: ACTIVE
-                </div>
-                """, unsafe_allow_html=True)
-            
-            if enable_sms_alerts:
-                st.markdown(f"""
-                <div style="background: #2196F3; color: white; padding: 10px; border-radius: 5px; text-align: center; margin: 5px 0;">
-                    📱 SMS Alerts: ACTIVE
-                </div>
-                """, unsafe_allow_html=True)
-                
-        elif st.session_state.simulation_running:
-            st.markdown('<div class="safe-box">✅ All Clear<br><small>No wildlife zones detected in range</small></div>', 
-                      unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="info-box">📍 Start Simulation<br><small>Click "Start Route Simulation" to begin</small></div>', 
-                      unsafe_allow_html=True)
-        
-        if st.session_state.eco_points > 0:
-            st.markdown(f"""
-            <div class="eco-points">
-                🏆 Eco Points: {st.session_state.eco_points}
-                <br><small>Earned for wildlife-safe driving!</small>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Mobile Alerts Preview
-        if st.session_state.mobile_alerts:
-            st.markdown("### 📱 Recent Mobile Alerts")
-            recent_alerts = st.session_state.mobile_alerts[-3:]  # Show last 3 alerts
-            for alert in reversed(recent_alerts):
-                priority_color = {
-                    "critical": "#ff4444",
-                    "high": "#ff6b6b", 
-                    "medium": "#ffa726"
-                }.get(alert.get('priority', 'medium'), "#ffa726")
-                
-                st.markdown(f"""
-                <div style="border-left: 4px solid {priority_color}; padding: 10px; margin: 5px 0; background: #f8f9fa; border-radius: 5px;">
-                    <div style="font-weight: bold; color: {priority_color};">{alert['title']}</div>
-                    <div style="font-size: 0.8rem; color: #666;">{alert['timestamp']}</div>
-                    <div style="margin-top: 5px; font-size: 0.9rem;">{alert['message']}</div>
-                </div>
-                """, unsafe_allow_html=True)
+        # Active alerts, eco points and recent mobile alerts change every tick
+        live_panel_slot = st.container()
         
         st.markdown("### 📊 Route Statistics")
         
@@ -1355,6 +1918,13 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-number">{format_duration(route_metrics.travel_s)}</div>
+            <div class="metric-label">⏱️ Drive Time at Safe Speeds</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-number">{len(zones_df)}</div>
@@ -1362,14 +1932,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        if st.session_state.simulation_running and current_position:
-            nearby_zones = len(current_alerts)
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-number">{nearby_zones}</div>
-                <div class="metric-label">⚠️ Current Alerts</div>
-            </div>
-            """, unsafe_allow_html=True)
+        current_alerts_slot = st.container()
         
         if st.session_state.selected_route_mode == "🗺️ Custom Map Selection":
             st.markdown("### 🗺️ Custom Route Info")
@@ -1417,15 +1980,39 @@ def main():
             </div>
             """, unsafe_allow_html=True)
         
-        st.markdown("### 📜 Activity Log")
-        
-        if st.session_state.alert_log:
-            for log_entry in st.session_state.alert_log[-5:]:
-                log_class = "alert-log" if "ALERT" in log_entry else "safe-log"
-                st.markdown(f'<div class="{log_class}">{log_entry}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="info-box"><small>No activity yet - start simulation to see logs</small></div>', 
-                      unsafe_allow_html=True)
+        activity_log_slot = st.container()
+    
+    # Only this part of the page redraws on a simulation tick or step button
+    if playback_mode:
+        # The whole journey plays in the browser; nothing here reruns per step
+        with simulation_slot:
+            render_journey_playback(load_playback(route_bytes, alert_threshold), time_scale=time_scale,
+                                    volume=sound_volume, enabled=enable_sounds)
+        with live_panel_slot:
+            st.markdown('<div class="info-box">🎬 Browser Playback<br><small>Alerts for this journey '
+                        'play on the map; press ▶️ Play below it</small></div>', unsafe_allow_html=True)
+        with activity_log_slot:
+            render_activity_log()
+    else:
+        journey = get_journey(route_points, alert_threshold, time_scale)
+        ticking = auto_simulation and st.session_state.simulation_running and not journey.finished
+        simulation_view = st.fragment(render_simulation_view, run_every=AUTO_STEP_SECONDS if ticking else None)
+        with simulation_slot:
+            simulation_view(
+                journey, route_bytes, route_metrics, load_route_corridor(route_bytes), risk_raster, gazetteer,
+                settings={
+                    'auto_simulation': auto_simulation, 'alert_threshold': alert_threshold,
+                    'show_route': show_route, 'show_heatmap': show_heatmap, 'show_zones': show_zones,
+                    'show_detections': show_detections, 'show_alert_trail': show_alert_trail,
+                    'enable_sounds': enable_sounds, 'sound_volume': sound_volume,
+                    'enable_sms_alerts': enable_sms_alerts, 'enable_push_notifications': enable_push_notifications,
+                    'enable_emergency_sms': enable_emergency_sms
+                },
+                slots={
+                    'live_panel': live_panel_slot, 'current_alerts': current_alerts_slot,
+                    'activity_log': activity_log_slot, 'audio': audio_slot
+                }
+            )
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1518,6 +2105,7 @@ def main():
             'Risk Level': ['Critical', 'High', 'Medium', 'High', 'Medium', 'Low', 'Medium']
         }
         
+        import pandas as pd
         species_df = pd.DataFrame(species_data)
         st.dataframe(species_df, width="stretch")
         
@@ -1683,6 +2271,10 @@ def main():
     }
     </style>
     """, unsafe_allow_html=True)
+    
+    # Play the highest-priority sound queued during this run
+    with audio_slot:
+        render_audio_player(volume=sound_volume, enabled=enable_sounds)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,124 @@
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Higher ranks win when a step produces several events
+RISK_RANK = {
+    'CRITICAL': 4,
+    'animal_detected': 3,
+    'HIGH': 2,
+    'MEDIUM': 1,
+    'LOW': 0
+}
+
+# Minimum seconds between two notifications on the same channel, on the clock
+# passed to flush(): the app passes simulated journey time, so the limits are in
+# driving time however much the simulation is accelerated. An event that
+# outranks the last one sent on a channel is let through regardless.
+DEFAULT_RATE_LIMITS = {
+    'audio': 10.0,
+    'push': 0.0,
+    'sms': 120.0,
+    'emergency': 600.0
+}
+
+
+class AlertEvent(NamedTuple):
+    rank: int
+    kind: str           # risk level for zone alerts, 'animal_detected' for detections
+    data: Any           # utils.records ZoneAlert / Detection, or a plain dict
+
+
+class AlertScheduler:
+    """
+    Collects the alerts and detections of one simulation step and sends a single
+    consolidated notification per channel.
+
+    Usage per step::
+
+        scheduler.collect(alert['risk_level'], alert)
+        scheduler.collect('animal_detected', detection)
+        scheduler.flush({'audio': play, 'push': push, 'sms': sms})
+
+    Each handler is called at most once per flush with the top-ranked event and
+    the list of all events of the step, and only if the channel's rate limit
+    allows it.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS)
+        if rate_limits:
+            self.rate_limits.update(rate_limits)
+        self.clock = clock
+        self.pending: List[AlertEvent] = []
+        self.last_sent: Dict[str, tuple] = {}   # channel -> (time, rank)
+        self.suppressed: Dict[str, int] = {}
+
+    def collect(self, kind: str, data: Any):
+        """Queue an event for the current step."""
+        self.pending.append(AlertEvent(RISK_RANK.get(kind, 0), kind, data))
+
+    def allows(self, channel: str, rank: int, now: Optional[float] = None) -> bool:
+        """Whether the channel's rate limit lets an event of this rank through now."""
+        last = self.last_sent.get(channel)
+        if last is None:
+            return True
+        now = self.clock() if now is None else now
+        sent_at, sent_rank = last
+        elapsed = now - sent_at
+        # A clock that went backwards (a new journey) leaves nothing to wait for
+        return rank > sent_rank or elapsed < 0 or elapsed >= self.rate_limits.get(channel, 0.0)
+
+    def flush(self, handlers: Dict[str, Callable[[AlertEvent, List[AlertEvent]], Any]],
+              min_rank: Optional[Dict[str, int]] = None, now: Optional[float] = None) -> Dict[str, AlertEvent]:
+        """
+        Dispatch the step's events and clear the queue.
+
+        Args:
+            handlers: Channel name -> callable(top_event, all_events). Leave out
+                channels that are disabled.
+            min_rank: Optional channel -> lowest rank worth sending on it
+                (e.g. emergency SMS only for CRITICAL)
+            now: Time the rate limits are measured on (default: the scheduler's clock)
+
+        Returns:
+            Channel -> event that was sent on it
+        """
+        events = sorted(self.pending, key=lambda e: e.rank, reverse=True)
+        self.pending = []
+        if not events:
+            return {}
+
+        top = events[0]
+        now = self.clock() if now is None else now
+        sent = {}
+        for channel, handler in handlers.items():
+            if min_rank and top.rank < min_rank.get(channel, 0):
+                continue
+            if not self.allows(channel, top.rank, now):
+                self.suppressed[channel] = self.suppressed.get(channel, 0) + len(events)
+                continue
+            handler(top, events)
+            self.last_sent[channel] = (now, top.rank)
+            sent[channel] = top
+        return sent
+
+
+def consolidated_data(top: AlertEvent, events: List[AlertEvent]) -> Dict[str, Any]:
+    """
+    Plain-dict copy of the top event's data annotated with how many other events
+    it stands for. This is where records become dicts for the notification channels.
+    """
+    data = top.data.as_dict() if hasattr(top.data, 'as_dict') else dict(top.data)
+    if len(events) > 1:
+        data['additional_alerts'] = len(events) - 1
+    return data
+
+
+def get_alert_scheduler() -> AlertScheduler:
+    """The session's scheduler, so rate limits carry across reruns (set it to None to start afresh)."""
+    import streamlit as st
+
+    if st.session_state.get('alert_scheduler') is None:
+        st.session_state.alert_scheduler = AlertScheduler()
+    return st.session_state.alert_scheduler
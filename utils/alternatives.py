@@ -0,0 +1,313 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_KM, densify_polyline, haversine_km
+from utils.routing import RISK_BUFFER_KM, RISK_SAMPLE_KM
+from utils.species import SPECIES_SPEED_KMPH, DEFAULT_SPEED_KMPH, recommended_speed_array, species_risk_weight
+
+# Assumed speed for the travel-time estimate of candidates that are not on the road graph
+CRUISE_SPEED_KMPH = 60.0
+# Extra clearance (km) beyond radius_km for waypoints that detour around a zone
+DETOUR_CLEARANCE_KM = 2.0
+
+_KM_PER_DEG = EARTH_RADIUS_KM * np.pi / 180
+
+
+class ZoneArrays(NamedTuple):
+    names: Tuple[str, ...]
+    lat: np.ndarray
+    lon: np.ndarray
+    radius_km: np.ndarray
+    base_speed: np.ndarray
+    weight: np.ndarray
+
+    @classmethod
+    def from_dataframe(cls, zones_df) -> "ZoneArrays":
+        """Pull the columns scoring needs out of the zone DataFrame once."""
+        species = list(zones_df['species'])
+        return cls(
+            names=tuple(zones_df['name']),
+            lat=zones_df['lat'].to_numpy(dtype=np.float64),
+            lon=zones_df['lon'].to_numpy(dtype=np.float64),
+            radius_km=zones_df['radius_km'].to_numpy(dtype=np.float64),
+            base_speed=np.array([SPECIES_SPEED_KMPH.get(s, DEFAULT_SPEED_KMPH) for s in species], dtype=np.float64),
+            weight=np.array([species_risk_weight(s) for s in species], dtype=np.float64)
+        )
+
+    def take(self, rows) -> "ZoneArrays":
+        """The zones at the given row indices, in that order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return ZoneArrays(tuple(self.names[i] for i in rows.tolist()), self.lat[rows], self.lon[rows],
+                          self.radius_km[rows], self.base_speed[rows], self.weight[rows])
+
+    def near(self, coords: np.ndarray, reach_km: float) -> np.ndarray:
+        """
+        Rows of zones whose centre lies in the route's bounding box grown by
+        ``radius_km + reach_km``: a superset of the zones any point can reach.
+        """
+        dlat = (self.radius_km + reach_km) / _KM_PER_DEG
+        # Degrees of longitude shrink towards the pole: size the box at its edge furthest from the equator
+        far_lat = np.minimum(np.abs(coords[:, 0]).max() + dlat, 89.0)
+        dlon = dlat / np.cos(np.radians(far_lat))
+        lat_min, lon_min = coords.min(axis=0)
+        lat_max, lon_max = coords.max(axis=0)
+        return np.nonzero((self.lat >= lat_min - dlat) & (self.lat <= lat_max + dlat)
+                          & (self.lon >= lon_min - dlon) & (self.lon <= lon_max + dlon))[0]
+
+
+class RouteScore(NamedTuple):
+    label: str
+    points: np.ndarray
+    length_km: float
+    travel_minutes: float
+    exposure_minutes: float
+    zone_minutes: Dict[str, float]
+
+
+def score_exposure(points, zones: ZoneArrays, cruise_kmph: float = CRUISE_SPEED_KMPH,
+                   label: str = "", buffer_km: float = RISK_BUFFER_KM) -> RouteScore:
+    """
+    Score a route's wildlife exposure with the road graph's risk metric
+    (see RoadGraph.apply_zone_risk).
+
+    A segment is exposed within ``radius_km + buffer_km`` of a zone; its
+    exposure is the time to drive it at the recommended speed for that species
+    and distance, weighted by the species risk weight, taking the worst zone
+    when several overlap. Densify the route to ``RISK_SAMPLE_KM`` to sample it
+    as the graph does.
+
+    Args:
+        points: (N, 2) array or sequence of (latitude, longitude)
+        zones: Zone columns from :meth:`ZoneArrays.from_dataframe`
+        cruise_kmph: Speed for the travel-time estimate (the route has no road speeds)
+        label: Name to carry through to the result
+        buffer_km: Extra distance beyond radius_km that still counts as exposed
+
+    Returns:
+        RouteScore with totals and a per-zone breakdown of weighted minutes
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(coords) < 2:
+        return RouteScore(label, coords, 0.0, 0.0, 0.0, {})
+
+    seg_km = haversine_km(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+    length = float(seg_km.sum())
+    travel = length * 60.0 / cruise_kmph
+
+    rows = zones.near(coords, buffer_km)
+    if not len(rows):
+        return RouteScore(label, coords, length, travel, 0.0, {})
+    near = zones.take(rows)
+
+    mid_lat = (coords[:-1, 0] + coords[1:, 0]) / 2
+    mid_lon = (coords[:-1, 1] + coords[1:, 1]) / 2
+    dist = haversine_km(mid_lat[:, None], mid_lon[:, None], near.lat[None, :], near.lon[None, :])
+    exposed = dist <= near.radius_km[None, :] + buffer_km
+    speed = recommended_speed_array(np.broadcast_to(near.base_speed, dist.shape), dist)
+    weighted = np.where(exposed, seg_km[:, None] * 60.0 / speed * near.weight[None, :], 0.0)
+
+    # Worst zone per segment, credited to that zone in the breakdown
+    worst = weighted.argmax(axis=1)
+    per_zone = np.bincount(worst, weights=weighted[np.arange(len(worst)), worst], minlength=len(rows))
+    zone_minutes = {near.names[i]: float(per_zone[i]) for i in np.nonzero(per_zone)[0]}
+    return RouteScore(label, coords, length, travel, float(per_zone.sum()), zone_minutes)
+
+
+def score_road_route(result, zones: ZoneArrays, label: str = "") -> RouteScore:
+    """
+    Score a RouteResult with the graph's own totals: drive time at edge speeds
+    and the risk minutes the search minimised. The per-zone breakdown comes
+    from :func:`score_exposure` on the same metric.
+    """
+    score = score_exposure(result.points, zones, label=label)
+    return score._replace(length_km=result.length_km, travel_minutes=result.travel_minutes,
+                          exposure_minutes=result.risk_minutes)
+
+
+def score_routes(routes: Sequence[Tuple[str, object]], zones: ZoneArrays,
+                 max_workers: Optional[int] = None) -> List[RouteScore]:
+    """
+    Score several candidate routes in parallel.
+
+    NumPy releases the GIL inside its kernels, so a thread pool gives real
+    parallelism here without the start-up and pickling cost of processes.
+
+    Args:
+        routes: Sequence of (label, points) pairs, or (label, RouteResult) for road routes
+        zones: Zone columns from :meth:`ZoneArrays.from_dataframe`
+        max_workers: Thread pool size (default: one per route, capped at 8)
+
+    Returns:
+        RouteScores in the same order as ``routes``
+    """
+    if not routes:
+        return []
+    workers = max_workers or min(len(routes), 8)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda r: _score(r, zones), routes))
+
+
+def _score(candidate, zones: ZoneArrays) -> RouteScore:
+    label, route = candidate
+    if hasattr(route, 'risk_minutes'):
+        return score_road_route(route, zones, label)
+    return score_exposure(route, zones, label=label)
+
+
+def road_candidates(graph, start: Tuple[float, float], end: Tuple[float, float], k: int = 3,
+                    risk_weights: Sequence[float] = (0.0, 1.0, 5.0), penalty: float = 1.6,
+                    step_km: float = RISK_SAMPLE_KM) -> List[Tuple[str, object]]:
+    """
+    Generate up to ``k`` distinct road routes.
+
+    First varies the wildlife-risk weight (fastest ... most cautious), then
+    repeatedly penalises the edges of routes already found so the search is
+    pushed onto different roads.
+
+    Args:
+        graph: utils.routing.RoadGraph
+        start: (latitude, longitude) of the origin
+        end: (latitude, longitude) of the destination
+        k: Number of candidates wanted
+        risk_weights: Risk weights tried before switching to edge penalties
+        penalty: Cost multiplier applied to an edge each time it is reused
+        step_km: Spacing of the returned route points (RISK_SAMPLE_KM samples them as the graph does)
+
+    Returns:
+        List of (label, RouteResult) pairs
+    """
+    candidates = []
+    seen = set()
+    penalties: Dict[int, float] = {}
+
+    def add(result, label):
+        if result is None:
+            return False
+        key = tuple(result.nodes)
+        if key in seen:
+            return False
+        seen.add(key)
+        candidates.append((label, result))
+        for e in graph.edges_on_path(result.nodes).tolist():
+            penalties[e] = penalties.get(e, 1.0) * penalty
+        return True
+
+    for w in risk_weights:
+        if len(candidates) >= k:
+            break
+        label = "Fastest road" if w == 0 else f"Risk-averse (weight {w:g})"
+        add(graph.route(start, end, risk_weight=w, step_km=step_km), label)
+
+    attempts = 0
+    while len(candidates) < k and attempts < 2 * k:
+        attempts += 1
+        result = graph.route(start, end, risk_weight=1.0, step_km=step_km, edge_penalty=dict(penalties))
+        if not add(result, f"Alternative {len(candidates) + 1}"):
+            # Same path again: strengthen penalties and retry
+            for e in list(penalties):
+                penalties[e] *= penalty
+
+    return candidates
+
+
+def waypoint_candidates(start: Tuple[float, float], end: Tuple[float, float], zones: ZoneArrays,
+                        k: int = 3, step_km: float = RISK_SAMPLE_KM,
+                        seed: Optional[int] = None) -> List[Tuple[str, np.ndarray]]:
+    """
+    Generate up to ``k`` straight-segment candidates when no road graph is available.
+
+    The direct line comes first. Then come detours that pass each zone the direct
+    line crosses on its left or right at ``radius_km + DETOUR_CLEARANCE_KM``.
+    Randomly bowed midpoints fill any remaining slots.
+    """
+    rng = np.random.default_rng(seed)
+    a = np.asarray(start, dtype=np.float64)
+    b = np.asarray(end, dtype=np.float64)
+    direct = densify_polyline([a, b], step_km)
+    candidates = [("Direct", direct)]
+
+    # Local planar frame (km) so perpendicular offsets are isotropic
+    km_per_deg_lat = 111.32
+    km_per_deg_lon = 111.32 * np.cos(np.radians((a[0] + b[0]) / 2))
+    scale = np.array([km_per_deg_lat, km_per_deg_lon])
+    d = (b - a) * scale
+    length = float(np.hypot(*d)) or 1.0
+    normal = np.array([-d[1], d[0]]) / length
+
+    rows = zones.near(direct, 0.0)
+    dist = haversine_km(direct[:, 0][:, None], direct[:, 1][:, None], zones.lat[None, rows], zones.lon[None, rows])
+    crossed = rows[(dist <= zones.radius_km[None, rows]).any(axis=0)]
+    if len(crossed):
+        centres = np.column_stack((zones.lat[crossed], zones.lon[crossed]))
+        along = ((centres - a) * scale) @ (d / length)
+        order = np.argsort(along)
+        for side, name in ((1.0, "Detour left"), (-1.0, "Detour right")):
+            waypoints = [a]
+            for i in order:
+                z = crossed[i]
+                offset = normal * side * (zones.radius_km[z] + DETOUR_CLEARANCE_KM)
+                waypoints.append(centres[i] + offset / scale)
+            waypoints.append(b)
+            candidates.append((name, densify_polyline(waypoints, step_km)))
+
+    while len(candidates) < k:
+        bow = rng.uniform(-0.25, 0.25) * length
+        mid = (a + b) / 2 + normal * bow / scale
+        candidates.append((f"Variant {len(candidates)}", densify_polyline([a, mid, b], step_km)))
+
+    return candidates[:k]
+
+
+def compare_alternatives(start: Tuple[float, float], end: Tuple[float, float], zones_df, graph=None,
+                         k: int = 3, max_workers: Optional[int] = None) -> List[RouteScore]:
+    """
+    Generate and score ``k`` alternative routes between two points.
+
+    Uses the road graph when one is supplied, otherwise perturbed waypoint sets.
+    Road routes are scored with the graph's travel and risk minutes, the same
+    numbers they were chosen by. The fastest candidate is labelled "Fastest"
+    and the lowest-exposure one "Least wildlife exposure".
+
+    Returns:
+        RouteScores ordered by exposure (safest first)
+    """
+    zones = ZoneArrays.from_dataframe(zones_df)
+    candidates = road_candidates(graph, start, end, k) if graph is not None else []
+    if not candidates:
+        candidates = waypoint_candidates(start, end, zones, k)
+
+    scores = score_routes(candidates, zones, max_workers)
+    if not scores:
+        return []
+    fastest = min(range(len(scores)), key=lambda i: scores[i].travel_minutes)
+    safest = min(range(len(scores)), key=lambda i: scores[i].exposure_minutes)
+    labelled = []
+    for i, score in enumerate(scores):
+        if i == fastest and i == safest:
+            label = "Fastest & least exposure"
+        elif i == fastest:
+            label = "Fastest"
+        elif i == safest:
+            label = "Least wildlife exposure"
+        else:
+            label = score.label
+        labelled.append(score._replace(label=label))
+    return sorted(labelled, key=lambda s: (s.exposure_minutes, s.travel_minutes))
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+
+    zones_df = pd.read_csv('data/animal_zones.csv')
+    zones = ZoneArrays.from_dataframe(zones_df)
+    candidates = waypoint_candidates((26.8467, 80.9462), (28.7000, 79.9000), zones, k=10, step_km=0.1, seed=0)
+    print(f"Scoring {len(candidates)} candidates of ~{len(candidates[0][1]):,} points each")
+    score_routes(candidates, zones)
+    t0 = time.perf_counter()
+    scores = score_routes(candidates, zones)
+    print(f"Scored in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+    for s in scores:
+        print(f"  {s.label:<14} {s.length_km:6.1f} km {s.travel_minutes:6.1f} min  exposure {s.exposure_minutes:5.1f}")
@@ -0,0 +1,256 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from utils.geo import cumulative_km, densify_polyline
+from utils.route_table import CRITICAL, HIGH, MEDIUM, approach_margins, score_points
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ROUTES = os.path.join(REPO_ROOT, 'data', 'routes.csv')
+DEFAULT_ZONES = os.path.join(REPO_ROOT, 'data', 'animal_zones.csv')
+FORMATS = ('csv', 'json', 'parquet')
+
+# Exposure report columns, in output order
+REPORT_FIELDS: Tuple[str, ...] = (
+    'route_id', 'route_name', 'waypoints', 'points', 'length_km',
+    'critical_km', 'high_km', 'medium_km', 'exposure_km', 'exposure_share',
+    'min_speed_kmph', 'travel_min', 'zones_entered', 'alert_zones', 'closest_zone', 'closest_margin_km'
+)
+
+Route = Tuple[str, str, np.ndarray]
+
+
+def iter_routes(path: str) -> Iterator[Route]:
+    """
+    Stream ``route_id,route_name,latitude,longitude`` rows as one polyline per route.
+
+    Only the route being read is held in memory, so the rows of a route must
+    be consecutive (as written by any export that sorts or groups by id).
+
+    Yields:
+        (route_id, route_name, (N, 2) float64 waypoints)
+
+    Raises:
+        ValueError: if a route_id reappears after another route started
+    """
+    seen = set()
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        col = {name.strip(): i for i, name in enumerate(header)}
+        i_id, i_name, i_lat, i_lon = col['route_id'], col['route_name'], col['latitude'], col['longitude']
+
+        route_id, route_name, waypoints = None, '', []
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            if row[i_id] != route_id:
+                if route_id is not None:
+                    yield route_id, route_name, np.array(waypoints, dtype=np.float64)
+                route_id, route_name, waypoints = row[i_id], row[i_name], []
+                if route_id in seen:
+                    raise ValueError(f"{path}:{line}: rows of route {route_id!r} are not consecutive")
+                seen.add(route_id)
+            waypoints.append((float(row[i_lat]), float(row[i_lon])))
+        if route_id is not None:
+            yield route_id, route_name, np.array(waypoints, dtype=np.float64)
+
+
+def score_route(route_id: str, route_name: str, waypoints: np.ndarray, zones,
+                step_km: float = 0.5, threshold_km: float = 3.0) -> Dict[str, Any]:
+    """
+    Exposure of one route: distance driven in each risk band and the zones it alerts on.
+
+    Each point of the densified route stands for half of each adjacent
+    segment, so band distances add up to the route length.
+    """
+    dense = densify_polyline(waypoints, step_km=step_km)
+    table = score_points(dense, zones, threshold_km=threshold_km)
+    cum = cumulative_km(dense)
+    seg = np.diff(cum)
+    weight = np.zeros(len(dense))
+    weight[:-1] += seg / 2
+    weight[1:] += seg / 2
+    band_km = np.bincount(table.risk, weights=weight, minlength=CRITICAL + 1)
+    length = float(cum[-1]) if len(cum) else 0.0
+
+    margins = approach_margins(dense, zones)
+    alerting = margins.zones_within(threshold_km)
+    closest = int(margins.zone[0]) if len(margins.zone) else -1
+    return {
+        'route_id': route_id,
+        'route_name': route_name,
+        'waypoints': len(waypoints),
+        'points': len(dense),
+        'length_km': round(length, 3),
+        'critical_km': round(float(band_km[CRITICAL]), 3),
+        'high_km': round(float(band_km[HIGH]), 3),
+        'medium_km': round(float(band_km[MEDIUM]), 3),
+        'exposure_km': round(float(band_km[MEDIUM:].sum()), 3),
+        'exposure_share': round(float(band_km[MEDIUM:].sum()) / length, 4) if length else 0.0,
+        'min_speed_kmph': float(table.speed_kmph.min()) if len(table) else None,
+        'travel_min': round(float(np.sum(weight / table.speed_kmph)) * 60, 1),
+        'zones_entered': int(np.count_nonzero(margins.margin_km <= 0)),
+        'alert_zones': '; '.join(zones.names[z] for z in alerting),
+        'closest_zone': zones.names[closest] if closest >= 0 else '',
+        'closest_margin_km': round(float(margins.margin_km[0]), 3) if closest >= 0 else None,
+    }
+
+
+# Zone catalogue of a worker process, loaded once by _init_worker
+_zones = None
+
+
+def _load_zones(path: str):
+    import pandas as pd
+    from utils.records import ZoneTable
+    return ZoneTable.from_dataframe(pd.read_csv(path))
+
+
+def _init_worker(zones_path: str) -> None:
+    global _zones
+    _zones = _load_zones(zones_path)
+
+
+def _score_chunk(routes: List[Route], step_km: float, threshold_km: float) -> List[Dict[str, Any]]:
+    return [score_route(route_id, name, waypoints, _zones, step_km, threshold_km)
+            for route_id, name, waypoints in routes]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_routes(routes: Iterable[Route], zones_path: str = DEFAULT_ZONES, step_km: float = 0.5,
+                 threshold_km: float = 3.0, workers: Optional[int] = None,
+                 chunk: int = 256) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Score a stream of routes across a process pool, yielding report rows per chunk in input order.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    however long the input is.
+
+    Args:
+        routes: Iterable of (route_id, route_name, waypoints), e.g. iter_routes()
+        zones_path: Zone catalogue CSV, loaded once per worker
+        step_km: Densification step along each route
+        threshold_km: Alert range beyond radius_km
+        workers: Processes (default: CPU count); 1 scores in this process
+        chunk: Routes per task
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = _chunks(routes, chunk)
+    if workers == 1:
+        _init_worker(zones_path)
+        for batch in batches:
+            yield _score_chunk(batch, step_km, threshold_km)
+        return
+
+    # Imported here: serial scoring and modules that only use the helpers never need a pool
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(zones_path,)) as pool:
+        pending = []
+        for batch in batches:
+            pending.append(pool.submit(_score_chunk, batch, step_km, threshold_km))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class ReportWriter:
+    """Streaming writer for the exposure report: CSV, a JSON array, or Parquet (needs pyarrow)."""
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        self.path = path
+        self.format = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown report format {self.format!r}; use one of {', '.join(FORMATS)}")
+        self.rows = 0
+        self._parquet = None
+        if self.format == 'parquet':
+            import pyarrow.parquet   # imported here so a missing pyarrow fails before any scoring
+            self._pq = pyarrow.parquet
+            self._file = None
+        else:
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            if self.format == 'csv':
+                self._csv = csv.DictWriter(self._file, fieldnames=REPORT_FIELDS)
+                self._csv.writeheader()
+            else:
+                self._file.write('[')
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self.format == 'csv':
+            self._csv.writerows(rows)
+        elif self.format == 'json':
+            for row in rows:
+                self._file.write((',\n' if self.rows else '\n') + json.dumps(row))
+                self.rows += 1
+            return
+        else:
+            import pyarrow as pa
+            batch = pa.Table.from_pylist(rows, schema=self._parquet.schema if self._parquet else None)
+            if self._parquet is None:
+                self._parquet = self._pq.ParquetWriter(self.path, batch.schema)
+            self._parquet.write_table(batch)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        if self.format == 'json':
+            self._file.write('\n]\n')
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score every route of a routes CSV against the zone catalogue")
+    parser.add_argument('routes', nargs='?', default=DEFAULT_ROUTES,
+                        help="route_id,route_name,latitude,longitude CSV, rows grouped by route_id")
+    parser.add_argument('-o', '--output', default='route_exposure.csv',
+                        help="report path; the format follows the extension unless --format is given")
+    parser.add_argument('--format', choices=FORMATS, help="report format")
+    parser.add_argument('--zones', default=DEFAULT_ZONES, help="zone catalogue CSV")
+    parser.add_argument('--step-km', type=float, default=0.5, help="densification step along each route")
+    parser.add_argument('--threshold-km', type=float, default=3.0, help="alert range beyond each zone's radius")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk', type=int, default=256, help="routes per worker task")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    with ReportWriter(args.output, args.format) as writer:
+        for rows in score_routes(iter_routes(args.routes), args.zones, args.step_km, args.threshold_km,
+                                 args.workers, args.chunk):
+            writer.write(rows)
+    elapsed = time.perf_counter() - t0
+    print(f"{writer.rows:,} routes scored in {elapsed:.2f} s ({writer.rows / max(elapsed, 1e-9):,.0f} routes/s) "
+          f"-> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
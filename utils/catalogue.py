@@ -0,0 +1,67 @@
+# Zone catalogue and incident history as DataFrames, shared by the app and the
+# offline builders (risk raster, road graph) so both fingerprint the same inputs
+
+ZONES_PATH = 'data/animal_zones.csv'
+INCIDENTS_PATH = 'data/incidents.csv'
+
+# Used when the CSV is missing: the Uttar Pradesh sample catalogue
+SAMPLE_ZONES = {
+    'name': [
+        'Dudhwa Tiger Corridor',
+        'Katarniaghat Elephant Zone', 
+        'Kishanpur Deer Crossing',
+        'Pilibhit Tiger Area',
+        'Sohagi Barwa Sanctuary',
+        'Chandrapur Bear Zone',
+        'Ranipur Wildlife',
+        'Nawabganj Bird Sanctuary',
+        'Saman Sanctuary'
+    ],
+    'lat': [28.5000, 28.2833, 28.4333, 28.7000, 27.3000, 28.1000, 25.2500, 26.6167, 26.7500],
+    'lon': [80.7000, 81.0167, 80.2833, 79.9000, 82.2000, 79.8000, 81.1500, 80.6500, 81.2500],
+    'radius_km': [5.0, 3.0, 4.0, 2.5, 3.5, 4.5, 2.0, 3.0, 2.5],
+    'species': ['tiger', 'elephant', 'deer', 'tiger', 'leopard', 'sloth_bear', 'deer', 'birds', 'nilgai'],
+    'notes': [
+        'Highway stretch near Dudhwa forest',
+        'Seasonal elephant migration route',
+        'Dense forest area crossing',
+        'Tiger movement corridor', 
+        'Leopard territory',
+        'Bear habitat near villages',
+        'Wildlife sanctuary crossing',
+        'Bird migration area',
+        'Grassland animal crossing'
+    ]
+}
+
+# Used when the CSV is missing: UP-specific sample incidents
+SAMPLE_INCIDENTS = {
+    'lat': [28.5000, 28.2833, 28.4333, 28.7000, 27.3000, 28.1000, 25.2500, 26.6167, 26.7500, 27.5000, 26.8500],
+    'lon': [80.7000, 81.0167, 80.2833, 79.9000, 82.2000, 79.8000, 81.1500, 80.6500, 81.2500, 80.5000, 81.0000],
+    'species': ['tiger', 'elephant', 'deer', 'tiger', 'leopard', 'sloth_bear', 'deer', 'birds', 'nilgai', 'elephant', 'tiger'],
+    'severity': [5, 4, 3, 2, 4, 2, 3, 5, 3, 4, 2],
+    'timestamp': [
+        '2024-01-15 14:30:00', '2024-02-03 09:15:00', '2024-02-20 18:45:00',
+        '2024-03-10 07:20:00', '2024-03-25 16:10:00', '2024-04-05 11:30:00',
+        '2024-04-18 20:15:00', '2024-05-02 06:45:00', '2024-05-20 19:30:00',
+        '2024-06-08 13:20:00', '2024-06-25 15:40:00'
+    ]
+}
+
+
+def load_zones(path: str = ZONES_PATH):
+    """Animal crossing zones from CSV, or the sample catalogue when the file is missing."""
+    import pandas as pd
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        return pd.DataFrame(SAMPLE_ZONES)
+
+
+def load_incidents(path: str = INCIDENTS_PATH):
+    """Past incidents from CSV, or the sample incidents when the file is missing."""
+    import pandas as pd
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        return pd.DataFrame(SAMPLE_INCIDENTS)
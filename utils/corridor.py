@@ -0,0 +1,142 @@
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_KM
+from utils.records import PREFILTER_SLACK, ZoneTable
+
+# Route points per envelope box: short enough that a bend does not sweep a
+# large empty rectangle, long enough that a national route is a few hundred boxes
+CHUNK_POINTS = 32
+
+_KM_PER_DEG = EARTH_RADIUS_KM * np.pi / 180
+
+
+class RouteCorridor:
+    """
+    The zones a route can ever alert on, selected once when the route is set.
+
+    The route is cut into chunks of ``CHUNK_POINTS`` points (consecutive
+    chunks share an end point, so every segment is covered) and each chunk's
+    bounding box is grown by the reach plus the zone's radius, with the same
+    slack as ZoneTable.within. A zone is kept when its centre falls in any
+    grown box; zones are sorted by latitude once, so each box is a binary
+    search and a test over the zones in its latitude band.
+
+    Any position on the route, at any range up to ``reach_km``, is therefore
+    checked against ``zones`` alone: the result is the same as against the
+    full catalogue, at a per-step cost set by the corridor rather than the
+    catalogue.
+    """
+
+    __slots__ = ('rows', 'zones', 'boxes', 'reach_km', '_projected')
+
+    def __init__(self, rows: np.ndarray, zones: ZoneTable, boxes: np.ndarray, reach_km: float):
+        """
+        Args:
+            rows: Catalogue row of each corridor zone, ascending
+            zones: The catalogue restricted to ``rows``
+            boxes: (B, 4) route envelope as lat_min, lon_min, lat_max, lon_max, before growing
+            reach_km: Distance beyond each zone's radius the corridor covers
+        """
+        self.rows = rows
+        self.zones = zones
+        self.boxes = boxes
+        self.reach_km = reach_km
+        self._projected = None
+
+    @classmethod
+    def build(cls, points, zones: ZoneTable, reach_km: float, chunk: int = CHUNK_POINTS) -> "RouteCorridor":
+        """
+        Corridor of a (N, 2) (latitude, longitude) route against a zone catalogue.
+
+        Args:
+            reach_km: Largest alert range / sensor radius any step will use
+        """
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(coords) or not len(zones):
+            return cls(np.empty(0, dtype=np.intp), zones.take([]), np.empty((0, 4)), reach_km)
+
+        # Per-segment boxes, merged per chunk of segments (a single point is one empty segment)
+        ends = coords[1:] if len(coords) > 1 else coords
+        starts = coords[:-1] if len(coords) > 1 else coords
+        lo, hi = np.minimum(starts, ends), np.maximum(starts, ends)
+        first = np.arange(0, len(lo), chunk)
+        boxes = np.column_stack((np.minimum.reduceat(lo, first), np.maximum.reduceat(hi, first)))
+
+        # Latitude band per box, wide enough for the largest zone
+        lat, lon = zones.records['lat'], zones.records['lon']
+        reach = (zones.records['radius_km'].astype(np.float64) + reach_km) * PREFILTER_SLACK
+        band = float(reach.max()) / _KM_PER_DEG
+        order = np.argsort(lat, kind='stable')
+        sorted_lat = lat[order]
+        begin = np.searchsorted(sorted_lat, boxes[:, 0] - band, side='left')
+        stop = np.searchsorted(sorted_lat, boxes[:, 2] + band, side='right')
+
+        # Every (box, zone in its band) pair, then the exact grown-box test with the zone's own radius
+        counts = stop - begin
+        box = np.repeat(np.arange(len(boxes)), counts)
+        idx = order[np.arange(counts.sum()) + np.repeat(begin - (np.cumsum(counts) - counts), counts)]
+        dlat = reach[idx] / _KM_PER_DEG
+        # Degrees of longitude shrink towards the pole: use the box edge furthest from the equator
+        far_lat = np.minimum(np.maximum(np.abs(boxes[box, 0]), np.abs(boxes[box, 2])) + dlat, 89.0)
+        dlon = dlat / np.cos(np.radians(far_lat))
+        keep = ((boxes[box, 0] - dlat <= lat[idx]) & (lat[idx] <= boxes[box, 2] + dlat)
+                & (boxes[box, 1] - dlon <= lon[idx]) & (lon[idx] <= boxes[box, 3] + dlon))
+        rows = np.unique(idx[keep])
+        return cls(rows, zones.take(rows), boxes, reach_km)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def projected(self):
+        """The corridor zones in the local UP projection (utils.projection), projected on first use."""
+        if self._projected is None:
+            from utils.projection import ProjectedZones
+            self._projected = ProjectedZones(self.zones)
+        return self._projected
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.geo import densify_polyline, haversine_km
+    from utils.route_library import ALERT_ROUTE_WAYPOINTS
+
+    # A national catalogue: the real zones plus 100,000 synthetic ones across India
+    base = pd.read_csv('data/animal_zones.csv')
+    rng = np.random.default_rng(0)
+    n = 100_000
+    synthetic = pd.DataFrame({
+        'name': [f"Zone {i}" for i in range(n)],
+        'lat': rng.uniform(8.0, 35.0, n), 'lon': rng.uniform(68.0, 97.0, n),
+        'radius_km': rng.uniform(1, 8, n), 'species': rng.choice(base['species'], n), 'notes': '',
+    })
+    table = ZoneTable.from_dataframe(pd.concat([base, synthetic], ignore_index=True))
+    route = densify_polyline(ALERT_ROUTE_WAYPOINTS, step_km=0.1)
+    reach_km = 10.0
+
+    t0 = time.perf_counter()
+    corridor = RouteCorridor.build(route, table, reach_km)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"{len(route):,}-point route, {len(table):,} zones: {len(corridor)} corridor zones "
+          f"from {len(corridor.boxes)} boxes in {build_ms:.1f} ms")
+
+    # Per-step zone check, whole catalogue vs corridor, on every 10th point
+    steps = route[::10]
+    t0 = time.perf_counter()
+    full = [table.within(a, b, reach_km) for a, b in steps]
+    full_us = (time.perf_counter() - t0) / len(steps) * 1e6
+    t0 = time.perf_counter()
+    narrow = [corridor.zones.within(a, b, reach_km) for a, b in steps]
+    narrow_us = (time.perf_counter() - t0) / len(steps) * 1e6
+    print(f"ZoneTable.within per step: {full_us:.0f} us on the catalogue, {narrow_us:.0f} us on the corridor")
+
+    # Nothing within reach of any route point may be missing from the corridor
+    missed = 0
+    for a, b in route:
+        d = haversine_km(a, b, table.records['lat'], table.records['lon'])
+        near = np.nonzero(d <= table.records['radius_km'] + reach_km)[0]
+        missed += np.count_nonzero(~np.isin(near, corridor.rows))
+    same = all(np.array_equal(f, corridor.rows[c]) for f, c in zip(full, narrow))
+    print(f"zones within reach of any of the {len(route):,} points but outside the corridor: {missed}; "
+          f"per-step candidates identical: {same}")
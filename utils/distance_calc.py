@@ -1,19 +1,31 @@
-from geopy.distance import geodesic
 from typing import List, Tuple
+import numpy as np
 import pandas as pd
+from utils.geo import distance_backend
 
-def calculate_distance(point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
+def calculate_distance(point1: Tuple[float, float], point2: Tuple[float, float], backend: str = None) -> float:
     """
-    Calculate distance between two points in meters using geodesic distance.
+    Calculate distance between two points in meters.
     
     Args:
         point1: Tuple of (latitude, longitude)
         point2: Tuple of (latitude, longitude)
+        backend: Distance backend name (default: DISTANCE_BACKEND, else vincenty)
     
     Returns:
         Distance in meters
     """
-    return geodesic(point1, point2).meters
+    return float(distance_backend(backend)(point1[0], point1[1], point2[0], point2[1])) * 1000
+
+def distance_matrix(points_a: List[Tuple[float, float]], points_b: List[Tuple[float, float]],
+                    backend: str = None) -> np.ndarray:
+    """
+    Distances in meters between every point of ``points_a`` (rows) and ``points_b`` (columns),
+    computed in one vectorized call.
+    """
+    a = np.asarray(points_a, dtype=np.float64).reshape(-1, 2)
+    b = np.asarray(points_b, dtype=np.float64).reshape(-1, 2)
+    return distance_backend(backend)(a[:, 0, None], a[:, 1, None], b[None, :, 0], b[None, :, 1]) * 1000
 
 def check_proximity(route_points: List[Tuple[float, float]], 
                    zone_points: List[Tuple[float, float]], 
@@ -37,9 +49,10 @@ def check_proximity(route_points: List[Tuple[float, float]],
     except:
         zones_df = None
     
+    distances = distance_matrix(route_points, zone_points)
     for i, route_point in enumerate(route_points):
         for j, zone_point in enumerate(zone_points):
-            distance = calculate_distance(route_point, zone_point)
+            distance = float(distances[i, j])
             
             if distance <= threshold:
                 if zones_df is not None and j < len(zones_df):
@@ -67,13 +80,9 @@ def find_nearest_zone(route_point: Tuple[float, float],
     Returns:
         Tuple of (min_distance, zone_index)
     """
-    min_distance = float('inf')
-    nearest_zone_idx = -1
-    
-    for i, zone_point in enumerate(zone_points):
-        distance = calculate_distance(route_point, zone_point)
-        if distance < min_distance:
-            min_distance = distance
-            nearest_zone_idx = i
+    if not len(zone_points):
+        return float('inf'), -1
     
-    return min_distance, nearest_zone_idx
\ No newline at end of file
+    distances = distance_matrix([route_point], zone_points)[0]
+    nearest_zone_idx = int(distances.argmin())
+    return float(distances[nearest_zone_idx]), nearest_zone_idx
\ No newline at end of file
@@ -0,0 +1,278 @@
+import csv
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.geo import compass_direction, haversine_km, initial_bearing
+
+# Spatial grid cell size in degrees (~5.5 km north-south)
+GRID_CELL_DEG = 0.05
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+class Place(NamedTuple):
+    name: str
+    lat: float
+    lon: float
+    kind: str
+    popular: bool
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalize a place name for indexing: strip accents, lowercase and collapse
+    punctuation/whitespace to single spaces.
+    """
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+class Gazetteer:
+    """
+    Offline place index for Uttar Pradesh.
+
+    Names are held in a sorted key list (full names plus every word suffix, so
+    "tiger" finds "Dudhwa Tiger Reserve") searched with ``bisect``. Coordinates
+    are bucketed into a uniform lat/lon grid for nearest-place lookups.
+    """
+
+    def __init__(self, places: Iterable[Place]):
+        self.places: List[Place] = list(places)
+        self.lats = np.array([p.lat for p in self.places], dtype=np.float64)
+        self.lons = np.array([p.lon for p in self.places], dtype=np.float64)
+        self._build_name_index()
+        self._build_grid()
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Gazetteer":
+        """
+        Load places from a CSV with columns ``name,lat,lon,kind,popular``.
+
+        Args:
+            path: Path to the places file
+
+        Returns:
+            Indexed Gazetteer
+        """
+        places = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                places.append(Place(
+                    name=row['name'].strip(),
+                    lat=float(row['lat']),
+                    lon=float(row['lon']),
+                    kind=(row.get('kind') or 'place').strip(),
+                    popular=str(row.get('popular', '')).strip().lower() in ('1', 'true', 'yes')
+                ))
+        return cls(places)
+
+    @classmethod
+    def from_dict(cls, locations: Dict[str, Tuple[float, float]], kind: str = 'place') -> "Gazetteer":
+        """Build a gazetteer from a ``{name: (lat, lon)}`` mapping, all marked popular."""
+        return cls(Place(name, lat, lon, kind, True) for name, (lat, lon) in locations.items())
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    # ------------------------------------------------------------------
+    # Index construction
+    # ------------------------------------------------------------------
+    def _build_name_index(self):
+        entries = []
+        for idx, place in enumerate(self.places):
+            words = normalize_name(place.name).split()
+            # rank 0 = match on the full name, 1 = match on a later word
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), 0 if start == 0 else 1, idx))
+        entries.sort()
+        self._keys = [e[0] for e in entries]
+        self._entries = [(e[1], e[2]) for e in entries]
+        self._alphabet = sorted({c for key in self._keys for c in key})
+
+    def _build_grid(self):
+        cells = defaultdict(list)
+        rows = np.floor(self.lats / GRID_CELL_DEG).astype(np.int64)
+        cols = np.floor(self.lons / GRID_CELL_DEG).astype(np.int64)
+        for idx, cell in enumerate(zip(rows.tolist(), cols.tolist())):
+            cells[cell].append(idx)
+        self._grid = {cell: np.array(idxs, dtype=np.int64) for cell, idxs in cells.items()}
+        if len(self.places):
+            self._row_range = (int(rows.min()), int(rows.max()))
+            self._col_range = (int(cols.min()), int(cols.max()))
+
+    # ------------------------------------------------------------------
+    # Name search
+    # ------------------------------------------------------------------
+    def _prefix_matches(self, prefix: str, limit: int, found: Dict[int, int]):
+        pos = bisect_left(self._keys, prefix)
+        scanned = 0
+        while pos < len(self._keys) and self._keys[pos].startswith(prefix):
+            rank, idx = self._entries[pos]
+            if idx not in found or rank < found[idx]:
+                found[idx] = rank
+            pos += 1
+            scanned += 1
+            if scanned >= limit * 8:
+                break
+
+    def _edit_variants(self, query: str) -> List[str]:
+        """Single-edit variants of the query (deletion, insertion, transposition, substitution)."""
+        variants = set()
+        for i in range(len(query) + 1):
+            for c in self._alphabet:
+                variants.add(query[:i] + c + query[i:])
+        for i in range(len(query)):
+            variants.add(query[:i] + query[i + 1:])
+            if i + 1 < len(query):
+                variants.add(query[:i] + query[i + 1] + query[i] + query[i + 2:])
+            for c in self._alphabet:
+                if c != query[i]:
+                    variants.add(query[:i] + c + query[i + 1:])
+        variants.discard('')
+        return list(variants)
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Place]:
+        """
+        Prefix search over place names, falling back to one-typo matches.
+
+        Args:
+            query: Partial place name as typed by the user
+            limit: Maximum number of results
+            fuzzy: Allow one edit (typo) in the query when exact prefixes run short
+
+        Returns:
+            Matching places, exact full-name matches first, popular places ahead of others
+        """
+        q = normalize_name(query)
+        if not q:
+            return []
+
+        found: Dict[int, int] = {}
+        self._prefix_matches(q, limit, found)
+
+        if fuzzy and len(found) < limit and len(q) >= 3:
+            fuzzy_found: Dict[int, int] = {}
+            for variant in self._edit_variants(q):
+                self._prefix_matches(variant, limit, fuzzy_found)
+            for idx, rank in fuzzy_found.items():
+                found.setdefault(idx, rank + 2)
+
+        ordered = sorted(found.items(), key=lambda item: (
+            item[1], not self.places[item[0]].popular, len(self.places[item[0]].name), item[0]))
+        return [self.places[idx] for idx, _ in ordered[:limit]]
+
+    # ------------------------------------------------------------------
+    # Reverse geocoding
+    # ------------------------------------------------------------------
+    def nearest(self, lat: float, lon: float, max_km: float = 50.0) -> Optional[Tuple[Place, float]]:
+        """
+        Find the nearest place to a coordinate using the spatial grid.
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            max_km: Give up beyond this distance
+
+        Returns:
+            Tuple of (place, distance_km), or None if nothing is within max_km
+        """
+        if not self.places:
+            return None
+
+        row = int(np.floor(lat / GRID_CELL_DEG))
+        col = int(np.floor(lon / GRID_CELL_DEG))
+        # A ring of cells is at least this far away in the north-south direction;
+        # east-west cells shrink with latitude, so use the cosine for a safe bound.
+        cell_km = GRID_CELL_DEG * 111.0 * max(np.cos(np.radians(abs(lat) + GRID_CELL_DEG)), 0.1)
+        max_ring = int(np.ceil(max_km / cell_km)) + 1
+
+        best_idx, best_dist = -1, float('inf')
+        for ring in range(max_ring + 1):
+            if best_idx >= 0 and (ring - 1) * cell_km > best_dist:
+                break
+            candidates = []
+            for r in range(row - ring, row + ring + 1):
+                if r < self._row_range[0] or r > self._row_range[1]:
+                    continue
+                if abs(r - row) == ring:
+                    cols = range(col - ring, col + ring + 1)
+                else:
+                    cols = (col - ring, col + ring)
+                for c in cols:
+                    cell = self._grid.get((r, c))
+                    if cell is not None:
+                        candidates.append(cell)
+            if not candidates:
+                continue
+            idxs = np.concatenate(candidates)
+            dists = haversine_km(lat, lon, self.lats[idxs], self.lons[idxs])
+            i = int(np.argmin(dists))
+            if dists[i] < best_dist:
+                best_idx, best_dist = int(idxs[i]), float(dists[i])
+
+        if best_idx < 0 or best_dist > max_km:
+            return None
+        return self.places[best_idx], best_dist
+
+    def describe(self, lat: float, lon: float, max_km: float = 50.0) -> Optional[str]:
+        """
+        Human-readable location such as "2 km north of Palia Kalan".
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            max_km: Ignore places further away than this
+
+        Returns:
+            Description string, or None when no place is close enough
+        """
+        result = self.nearest(lat, lon, max_km)
+        if result is None:
+            return None
+        place, dist = result
+        if dist < 0.5:
+            return f"at {place.name}"
+        direction = compass_direction(float(initial_bearing(place.lat, place.lon, lat, lon)))
+        return f"{dist:.0f} km {direction} of {place.name}"
+
+    def popular_locations(self) -> Dict[str, Tuple[float, float]]:
+        """Return ``{name: (lat, lon)}`` for places flagged popular, in file order."""
+        return {p.name: (p.lat, p.lon) for p in self.places if p.popular}
+
+
+if __name__ == "__main__":
+    import time
+
+    gaz = Gazetteer.from_csv('data/places.csv')
+    rng = np.random.default_rng(0)
+    n = 100_000
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    synthetic = [Place(''.join(rng.choice(letters, 8)) + ' ' + ''.join(rng.choice(letters, 6)),
+                       float(rng.uniform(23.8, 30.4)), float(rng.uniform(77.0, 84.7)), 'village', False)
+                 for _ in range(n)]
+    t0 = time.perf_counter()
+    big = Gazetteer(list(gaz.places) + synthetic)
+    print(f"Indexed {len(big):,} places in {time.perf_counter() - t0:.2f}s")
+
+    queries = ['luck', 'dudhwa', 'tiger', 'pilbhit', 'katarn', 'abc', 'zq']
+    t0 = time.perf_counter()
+    for _ in range(200):
+        for q in queries:
+            big.search(q)
+    per_search = (time.perf_counter() - t0) / (200 * len(queries))
+    print(f"search: {per_search * 1e3:.3f} ms/query")
+
+    pts = np.column_stack((rng.uniform(24, 30, 2000), rng.uniform(78, 84, 2000)))
+    t0 = time.perf_counter()
+    for lat, lon in pts:
+        big.nearest(lat, lon)
+    print(f"nearest: {(time.perf_counter() - t0) / len(pts) * 1e3:.3f} ms/query")
+
+    for q in ['luck', 'pilbhit', 'tiger res']:
+        print(q, '->', [p.name for p in gaz.search(q, limit=3)])
+    print(gaz.describe(28.45, 80.60))
@@ -0,0 +1,157 @@
+from typing import List, NamedTuple
+
+import numpy as np
+
+from utils.geo import haversine_km
+from utils.route_table import CLEAR, CRITICAL, HIGH_MARGIN_KM, RISK_LEVELS
+
+# A level is entered at its boundary but only left this far beyond it, so a
+# vehicle hovering at an edge (or GPS jitter) does not flap between levels
+HYSTERESIS_KM = 0.25
+
+
+class GeofenceEvent(NamedTuple):
+    kind: str             # 'enter', 'escalate', 'deescalate' or 'exit'
+    zone: int             # ZoneTable row
+    level: int            # new level, index into RISK_LEVELS (CLEAR after an exit)
+    previous: int         # level before the change
+    distance_km: float    # to the zone centre
+
+    @property
+    def risk_level(self) -> str:
+        return RISK_LEVELS[self.level]
+
+
+class GeofenceTracker:
+    """
+    Per-vehicle zone state (CLEAR / MEDIUM / HIGH / CRITICAL, as in
+    check_animal_zones) that is updated incrementally from successive fixes.
+
+    Each zone keeps a slack: how far the vehicle can drive before its distance
+    to the zone could reach a boundary that changes the zone's level. Since a
+    move of m km changes any distance by at most m, an update only measures
+    the zones whose slack the move has used up, plus the zones the vehicle is
+    currently in (their distances are shown). Far-away zones are measured
+    again only after the vehicle has covered the distance to them.
+
+    Boundaries, by zone radius r and alert threshold T: CRITICAL within r,
+    HIGH within r + min(2, T), MEDIUM within r + T. A level is kept until the
+    vehicle is ``hysteresis_km`` beyond the boundary that entered it.
+    """
+
+    def __init__(self, zones, threshold_km: float, hysteresis_km: float = HYSTERESIS_KM,
+                 distance_fn=haversine_km):
+        self.zones = zones
+        self.threshold_km = threshold_km
+        self.hysteresis_km = hysteresis_km
+        self.distance_fn = distance_fn
+        self._lat = zones.records['lat'].astype(np.float64)
+        self._lon = zones.records['lon'].astype(np.float64)
+        radius = zones.records['radius_km'].astype(np.float64)
+        # (zones, 4): the outer boundary of each level; CLEAR's is never reached
+        self._bounds = np.column_stack((np.full(len(radius), np.inf), radius + threshold_km,
+                                        radius + min(HIGH_MARGIN_KM, threshold_km), radius))
+        self.level = np.zeros(len(zones), dtype=np.uint8)
+        self.distance_km = np.full(len(zones), np.inf)
+        self._slack = np.full(len(zones), -1.0)
+        self._position = None
+        self.checks = 0     # zone distances measured so far, for profiling
+
+    def _levels(self, dist: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+        """Innermost level whose boundary holds each distance."""
+        return (dist[:, None] <= bounds[:, 1:]).sum(axis=1).astype(np.uint8)
+
+    def active(self) -> np.ndarray:
+        """Zones at MEDIUM or above, nearest first."""
+        rows = np.nonzero(self.level > CLEAR)[0]
+        return rows[np.argsort(self.distance_km[rows], kind='stable')]
+
+    def update(self, lat: float, lon: float) -> List[GeofenceEvent]:
+        """
+        Move the vehicle to a new fix and return the level changes, in zone order.
+        """
+        if self._position is not None:
+            # Same metric as the zone distances, so the triangle inequality bounds their change
+            moved = float(self.distance_fn(self._position[0], self._position[1], lat, lon))
+            self._slack -= moved
+        self._position = (lat, lon)
+
+        due = np.nonzero((self._slack <= 0) | (self.level > CLEAR))[0]
+        if not len(due):
+            return []
+        dist = np.asarray(self.distance_fn(lat, lon, self._lat[due], self._lon[due]), dtype=np.float64)
+        self.checks += len(due)
+        bounds = self._bounds[due]
+        old = self.level[due]
+
+        # Escalate as soon as a boundary is crossed; step down only past boundary + hysteresis
+        raw = self._levels(dist, bounds)
+        held = np.minimum(self._levels(dist, bounds + self.hysteresis_km), old)
+        new = np.where(raw >= old, raw, held).astype(np.uint8)
+
+        # Slack: distance to the next boundary inwards, or to the way out of the current level
+        rows = np.arange(len(due))
+        inward = np.where(new < CRITICAL, dist - bounds[rows, np.minimum(new + 1, CRITICAL)], np.inf)
+        outward = np.where(new > CLEAR, bounds[rows, new] + self.hysteresis_km - dist, np.inf)
+        self._slack[due] = np.maximum(np.minimum(inward, outward), 0.0)
+        self.level[due] = new
+        self.distance_km[due] = dist
+
+        events = []
+        for i in np.nonzero(new != old)[0].tolist():
+            before, after = int(old[i]), int(new[i])
+            if before == CLEAR:
+                kind = 'enter'
+            elif after == CLEAR:
+                kind = 'exit'
+            else:
+                kind = 'escalate' if after > before else 'deescalate'
+            events.append(GeofenceEvent(kind, int(due[i]), after, before, float(dist[i])))
+        return events
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.geo import densify_polyline
+    from utils.records import ZoneTable
+
+    base = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+
+    # A vehicle creeping along the HIGH/MEDIUM edge of Dudhwa with 100 m of GPS jitter
+    rng = np.random.default_rng(0)
+    lat0, lon0 = float(base.records['lat'][0]), float(base.records['lon'][0])
+    edge_km = float(base.records['radius_km'][0]) + HIGH_MARGIN_KM
+    fixes = [(lat0 + (edge_km + rng.normal(0, 0.1)) / 111.2, lon0) for _ in range(500)]
+    for hysteresis in (0.0, HYSTERESIS_KM):
+        tracker = GeofenceTracker(base, threshold_km=3.0, hysteresis_km=hysteresis)
+        changes = sum(len(tracker.update(a, b)) for a, b in fixes)
+        print(f"hovering at the HIGH edge for 500 fixes, hysteresis {hysteresis:.2f} km: {changes} level changes")
+
+    # Many zones, one long drive: work per tick with the slack bookkeeping vs a full scan
+    n_zones = 5000
+    records = np.empty(n_zones, dtype=base.records.dtype)
+    records['lat'] = rng.uniform(24.0, 30.3, n_zones)
+    records['lon'] = rng.uniform(77.2, 84.5, n_zones)
+    records['radius_km'] = rng.uniform(1, 5, n_zones)
+    records['species'] = rng.integers(0, len(base.records), n_zones)
+    zones = ZoneTable(records, tuple(f"Zone {i}" for i in range(n_zones)), ('',) * n_zones)
+    route = densify_polyline([(26.85, 80.95), (28.50, 80.70), (28.28, 81.02), (28.70, 79.90)], step_km=0.1)
+
+    tracker = GeofenceTracker(zones, threshold_km=3.0, hysteresis_km=0.0)
+    t0 = time.perf_counter()
+    events = [tracker.update(a, b) for a, b in route]
+    tracked_s = time.perf_counter() - t0
+
+    # Re-deriving every zone's level at every fix, timed on every 50th fix
+    t0 = time.perf_counter()
+    for a, b in route[::50]:
+        tracker._levels(haversine_km(a, b, records['lat'], records['lon']), tracker._bounds)
+    full_s = (time.perf_counter() - t0) * 50
+
+    # With no hysteresis the tracked levels must equal a from-scratch evaluation at the last fix
+    d = haversine_km(route[-1, 0], route[-1, 1], records['lat'], records['lon'])
+    mismatches = np.count_nonzero((d[:, None] <= tracker._bounds[:, 1:]).sum(axis=1) != tracker.level)
+    print(f"{len(route):,} fixes x {n_zones:,} zones: {tracker.checks / len(route):.0f} zones measured per tick "
+          f"(full scan: {n_zones:,}); {tracked_s * 1e3:.0f} ms tracked vs ~{full_s * 1e3:.0f} ms scanning; "
+          f"{sum(map(len, events))} events; final levels vs full scan: {mismatches} mismatches")
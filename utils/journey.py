@@ -0,0 +1,360 @@
+import heapq
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_KM, cumulative_km, haversine_km
+from utils.species import SPEED_BANDS_KM, get_recommended_speed
+
+# Speed outside wildlife zones; matches the travel-time estimate in utils.alternatives
+CRUISE_SPEED_KMPH = 60.0
+KM_PER_DEG = EARTH_RADIUS_KM * math.pi / 180.0
+
+# Ring crossings, named by direction. The outermost ring of a zone is its alert
+# range (radius_km + alert threshold), then radius_km, then the speed bands.
+INWARD_KINDS = ('approach', 'enter', 'band')
+OUTWARD_KINDS = ('leave', 'exit', 'band')
+
+
+class JourneyEvent(NamedTuple):
+    time_s: float         # simulated seconds since departure
+    distance_km: float    # along the route
+    kind: str             # approach / enter / band / exit / leave / arrive
+    zone: int             # ZoneTable row, -1 for 'arrive'
+    ring_km: float        # radius of the ring crossed
+    speed_kmph: float     # vehicle speed from this event on
+    probe_km: float       # a point inside the stretch that starts here (where its alerts are checked)
+
+
+def _zone_rings(radius_km: float, threshold_km: float) -> List[Tuple[float, int]]:
+    """Rings of one zone from the outside in, as (radius, kind index into INWARD_KINDS)."""
+    rings = []
+    if threshold_km > 0:
+        rings.append((radius_km + threshold_km, 0))
+    rings.append((radius_km, 1))
+    rings.extend((band, 2) for band in sorted(SPEED_BANDS_KM, reverse=True) if band < radius_km)
+    return rings
+
+
+class JourneyPlan:
+    """
+    Immutable timetable of a drive along a route through the zone catalogue.
+
+    The vehicle cruises at ``cruise_kmph`` and slows to ``get_recommended_speed``
+    inside a zone. That speed only changes where the route crosses one of a
+    zone's rings, so every crossing is found exactly once up front (per segment
+    and ring, in a local plane around the zone centre). The crossings are then
+    swept in route order through a priority queue, which assigns each one its
+    time. Between events speed is constant, so time and distance are piecewise
+    linear in each other and ETAs are exact.
+
+    Build one per (route, threshold) and share it; :class:`Journey` is the
+    per-session cursor.
+    """
+
+    def __init__(self, coords: np.ndarray, cum_km: np.ndarray, events: List[JourneyEvent],
+                 bp_km: np.ndarray, bp_s: np.ndarray, zone_names: Tuple[str, ...]):
+        self.coords = coords
+        self.cum_km = cum_km
+        self.events = events
+        self.bp_km = bp_km
+        self.bp_s = bp_s
+        self.zone_names = zone_names
+
+    @property
+    def total_km(self) -> float:
+        return float(self.cum_km[-1])
+
+    @property
+    def total_s(self) -> float:
+        return float(self.bp_s[-1])
+
+    @classmethod
+    def build(cls, route_points, zones, threshold_km: float = 0.0,
+              cruise_kmph: float = CRUISE_SPEED_KMPH) -> "JourneyPlan":
+        """
+        Args:
+            route_points: (N, 2) array or sequence of (latitude, longitude)
+            zones: utils.records.ZoneTable
+            threshold_km: Alert range beyond radius_km; crossings of it become
+                'approach' / 'leave' events (no speed change)
+            cruise_kmph: Speed outside zones
+
+        Returns:
+            JourneyPlan with its events in time order
+        """
+        coords = np.asarray(route_points, dtype=np.float64).reshape(-1, 2)
+        if len(coords) < 2:
+            coords = np.vstack((coords, coords))[:2]
+        cum_km = cumulative_km(coords)
+        seg_km = np.diff(cum_km)
+
+        # One row per ring of every zone
+        ring_zone, ring_km, ring_kind, ring_depth = [], [], [], []
+        zone_speeds: Dict[int, List[float]] = {}
+        for i in range(len(zones)):
+            rec = zones.records[i]
+            rings = _zone_rings(float(rec['radius_km']), threshold_km)
+            for depth, (radius, kind) in enumerate(rings):
+                ring_zone.append(i)
+                ring_km.append(radius)
+                ring_kind.append(kind)
+                ring_depth.append(depth)
+            # Speed at each depth (number of rings the vehicle is inside), taken
+            # mid-way through the annulus so get_recommended_speed picks its band
+            species = zones.species(i)
+            inner = [r for r, _ in rings[1:]] + [0.0]
+            speeds = [cruise_kmph]
+            for (outer, kind), inner_km in zip(rings, inner):
+                inside_zone = kind != 0
+                speeds.append(min(cruise_kmph, get_recommended_speed(species, (outer + inner_km) / 2))
+                              if inside_zone else cruise_kmph)
+            zone_speeds[i] = speeds
+        if not ring_zone:
+            return cls._timetable(coords, cum_km, [], {}, {}, cruise_kmph, zones)
+
+        ring_zone = np.array(ring_zone)
+        ring_km = np.array(ring_km)
+        ring_kind = np.array(ring_kind)
+        ring_depth = np.array(ring_depth)
+        c_lat = zones.records['lat'][ring_zone].astype(np.float64)
+        c_lon = zones.records['lon'][ring_zone].astype(np.float64)
+
+        # Segment end points in a local plane (km) around each ring's centre: (segments, rings)
+        kx = KM_PER_DEG * np.cos(np.radians(c_lat))[None, :]
+        ax = (coords[:-1, 1, None] - c_lon[None, :]) * kx
+        ay = (coords[:-1, 0, None] - c_lat[None, :]) * KM_PER_DEG
+        dx = (coords[1:, 1, None] - coords[:-1, 1, None]) * kx
+        dy = (coords[1:, 0, None] - coords[:-1, 0, None]) * KM_PER_DEG
+
+        # |A + t D| = R  ->  a t^2 + b t + c = 0; the smaller root enters, the larger exits
+        a = dx * dx + dy * dy
+        b = 2 * (ax * dx + ay * dy)
+        c = ax * ax + ay * ay - ring_km[None, :] ** 2
+        disc = b * b - 4 * a * c
+        hit = (disc > 0) & (a > 0)
+        root = np.sqrt(np.where(hit, disc, 0.0))
+        a2 = np.where(hit, 2 * a, 1.0)
+        t_in = (-b - root) / a2
+        t_out = (-b + root) / a2
+
+        # Crossings strictly after a segment's start, so shared vertices count once
+        crossings = []
+        for t, inward in ((t_in, True), (t_out, False)):
+            seg, ring = np.nonzero(hit & (t > 0) & (t <= 1))
+            dist = cum_km[seg] + t[seg, ring] * seg_km[seg]
+            crossings.extend(zip(dist.tolist(), ring.tolist(), [inward] * len(seg)))
+
+        # Rings the route starts inside of
+        start_d = haversine_km(coords[0, 0], coords[0, 1], c_lat, c_lon)
+        depth: Dict[int, int] = {}
+        for r in np.nonzero(start_d <= ring_km)[0].tolist():
+            z = int(ring_zone[r])
+            depth[z] = max(depth.get(z, 0), int(ring_depth[r]) + 1)
+
+        queue = [(d, n, r, inward) for n, (d, r, inward) in enumerate(crossings)]
+        heapq.heapify(queue)
+        ring_info = {
+            'zone': ring_zone.tolist(), 'km': ring_km.tolist(),
+            'kind': ring_kind.tolist(), 'depth': ring_depth.tolist()
+        }
+        return cls._timetable(coords, cum_km, queue, ring_info, depth, cruise_kmph, zones, zone_speeds)
+
+    @classmethod
+    def _timetable(cls, coords, cum_km, queue, rings, depth, cruise_kmph, zones, zone_speeds=None):
+        """Sweep the crossing queue in route order, giving every event its time."""
+        zone_speeds = zone_speeds or {}
+        speeds = {z: zone_speeds[z][d] for z, d in depth.items() if zone_speeds[z][d] < cruise_kmph}
+        speed = min(speeds.values(), default=cruise_kmph)
+
+        events: List[JourneyEvent] = []
+        bp_km, bp_s = [0.0], [0.0]
+        now_km, now_s = 0.0, 0.0
+        pop = heapq.heappop
+        while queue:
+            dist_km, _, r, inward = pop(queue)
+            now_s += (dist_km - now_km) / speed * 3600.0
+            now_km = dist_km
+
+            z = rings['zone'][r]
+            # Crossing ring k inward puts the vehicle k + 1 rings deep; outward, k deep
+            depth[z] = rings['depth'][r] + 1 if inward else rings['depth'][r]
+            zone_speed = zone_speeds[z][depth[z]]
+            if zone_speed < cruise_kmph:
+                speeds[z] = zone_speed
+            else:
+                speeds.pop(z, None)
+            speed = min(speeds.values(), default=cruise_kmph)
+
+            kinds = INWARD_KINDS if inward else OUTWARD_KINDS
+            events.append(JourneyEvent(now_s, now_km, kinds[rings['kind'][r]], z, rings['km'][r], speed, now_km))
+            if bp_km[-1] != now_km:
+                bp_km.append(now_km)
+                bp_s.append(now_s)
+
+        total_km = float(cum_km[-1])
+        end_s = now_s + (total_km - now_km) / speed * 3600.0
+        events.append(JourneyEvent(end_s, total_km, 'arrive', -1, 0.0, 0.0, total_km))
+        if bp_km[-1] != total_km or len(bp_km) == 1:
+            bp_km.append(total_km)
+            bp_s.append(end_s)
+
+        # Each event's probe point is the middle of the stretch it opens
+        for n in range(len(events) - 1):
+            events[n] = events[n]._replace(probe_km=(events[n].distance_km + events[n + 1].distance_km) / 2)
+
+        return cls(coords, cum_km, events, np.array(bp_km), np.array(bp_s), tuple(zones.names))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def time_at(self, distance_km: float) -> float:
+        """Seconds from departure until the vehicle reaches ``distance_km``."""
+        return float(np.interp(distance_km, self.bp_km, self.bp_s))
+
+    def distance_at(self, time_s: float) -> float:
+        """Distance along the route (km) after ``time_s`` seconds."""
+        return float(np.interp(time_s, self.bp_s, self.bp_km))
+
+    def position_at_distance(self, distance_km: float) -> Tuple[float, float]:
+        lat = float(np.interp(distance_km, self.cum_km, self.coords[:, 0]))
+        lon = float(np.interp(distance_km, self.cum_km, self.coords[:, 1]))
+        return lat, lon
+
+    def vertex_index(self, distance_km: float) -> int:
+        """Index of the last route vertex at or before ``distance_km``."""
+        return int(np.searchsorted(self.cum_km, distance_km, side='right')) - 1
+
+    def speed_at(self, time_s: float) -> float:
+        """Vehicle speed (km/h) at ``time_s``."""
+        i = int(np.searchsorted(self.bp_s, time_s, side='right'))
+        i = min(max(i, 1), len(self.bp_s) - 1)
+        dt = self.bp_s[i] - self.bp_s[i - 1]
+        return float((self.bp_km[i] - self.bp_km[i - 1]) / dt * 3600.0) if dt > 0 else 0.0
+
+
+class Journey:
+    """
+    A vehicle's progress through a :class:`JourneyPlan`.
+
+    Time only moves when asked (``advance`` / ``advance_to``), by any amount;
+    every event passed on the way is returned, so a large time step can not
+    skip over a zone. ``time_scale`` is simulated seconds per wall-clock second.
+    """
+
+    def __init__(self, plan: JourneyPlan, time_s: float = 0.0, time_scale: float = 1.0):
+        self.plan = plan
+        self.time_s = min(max(float(time_s), 0.0), plan.total_s)
+        self.time_scale = float(time_scale)
+        # The plan's events are in time order, which already satisfies the heap invariant
+        self._queue = [(e.time_s, n, e) for n, e in enumerate(plan.events) if e.time_s > self.time_s]
+        self._seq = len(plan.events)
+
+    def schedule(self, event: JourneyEvent):
+        """Add an extra event (e.g. from an external trigger) to this journey's queue."""
+        heapq.heappush(self._queue, (event.time_s, self._seq, event))
+        self._seq += 1
+
+    def advance_to(self, time_s: float) -> List[JourneyEvent]:
+        """Move to ``time_s`` (clamped to arrival) and return the events passed, in order."""
+        self.time_s = min(max(float(time_s), self.time_s), self.plan.total_s)
+        passed = []
+        while self._queue and self._queue[0][0] <= self.time_s:
+            passed.append(heapq.heappop(self._queue)[2])
+        return passed
+
+    def advance(self, seconds: float) -> List[JourneyEvent]:
+        """Advance by ``seconds`` of simulated time."""
+        return self.advance_to(self.time_s + seconds)
+
+    def advance_wall(self, wall_seconds: float) -> List[JourneyEvent]:
+        """Advance by ``wall_seconds`` of real time at the current ``time_scale``."""
+        return self.advance(wall_seconds * self.time_scale)
+
+    def next_event(self, kinds: Optional[Tuple[str, ...]] = None) -> Optional[JourneyEvent]:
+        """The next pending event, optionally of one of ``kinds``."""
+        if kinds is None:
+            return self._queue[0][2] if self._queue else None
+        for _, _, event in sorted(self._queue):
+            if event.kind in kinds:
+                return event
+        return None
+
+    def eta_s(self, event: Optional[JourneyEvent] = None) -> float:
+        """Seconds until ``event`` (default: arrival)."""
+        target = event.time_s if event is not None else self.plan.total_s
+        return max(target - self.time_s, 0.0)
+
+    @property
+    def distance_km(self) -> float:
+        return self.plan.distance_at(self.time_s)
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return self.plan.position_at_distance(self.distance_km)
+
+    @property
+    def speed_kmph(self) -> float:
+        return 0.0 if self.finished else self.plan.speed_at(self.time_s)
+
+    @property
+    def progress(self) -> float:
+        return self.time_s / self.plan.total_s if self.plan.total_s > 0 else 1.0
+
+    @property
+    def finished(self) -> bool:
+        return self.time_s >= self.plan.total_s
+
+
+def format_duration(seconds: float) -> str:
+    """Short h/min/s rendering for ETAs."""
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.geo import densify_polyline
+    from utils.records import ZoneTable
+
+    # Drive through the centres of the Dudhwa and Katarniaghat zones
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    route = densify_polyline([(28.56, 80.55), (28.50, 80.70), (28.2833, 81.0167), (28.20, 81.15)], step_km=0.5)
+
+    t0 = time.perf_counter()
+    plan = JourneyPlan.build(route, table, threshold_km=3.0)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"{plan.total_km:.1f} km, {format_duration(plan.total_s)}, {len(plan.events)} events "
+          f"(built in {build_ms:.2f} ms)")
+    for e in plan.events:
+        name = plan.zone_names[e.zone] if e.zone >= 0 else ''
+        print(f"  {format_duration(e.time_s):>8}  {e.distance_km:6.2f} km  {e.kind:<8} "
+              f"{e.ring_km:4.1f} km ring  -> {e.speed_kmph:4.0f} km/h  {name}")
+
+    # Cross-check the exact timetable against brute-force integration in 1 m steps
+    step_km = 0.001
+    d = np.arange(0.0, plan.total_km, step_km) + step_km / 2
+    lat = np.interp(d, plan.cum_km, plan.coords[:, 0])
+    lon = np.interp(d, plan.cum_km, plan.coords[:, 1])
+    speed = np.full(len(d), CRUISE_SPEED_KMPH)
+    for i in range(len(table)):
+        dist = haversine_km(lat, lon, table.records['lat'][i], table.records['lon'][i])
+        inside = dist <= table.records['radius_km'][i]
+        species = table.species(i)
+        zone_speed = np.array([get_recommended_speed(species, x) for x in dist[inside]])
+        speed[inside] = np.minimum(speed[inside], zone_speed)
+    brute_s = float((step_km / speed * 3600).sum())
+    print(f"brute force: {format_duration(brute_s)} ({abs(brute_s - plan.total_s):.2f} s apart)")
+
+    # A time-accelerated run never misses an event however coarse the steps
+    journey = Journey(plan, time_scale=600)
+    seen = []
+    while not journey.finished:
+        seen.extend(journey.advance_wall(1.0))
+    print(f"600x in 1 s ticks: {len(seen)}/{len(plan.events)} events delivered")
@@ -1,16 +1,17 @@
 import os
 import logging
-import requests
+import threading
 from typing import List, Dict, Optional
 from datetime import datetime
-from dotenv import load_dotenv
+
+from utils.shared import get_shared, peek_shared
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Connections kept open per provider host, shared by all sessions
+SMS_POOL_SIZE = 8
 
 class SMSAlertSystem:
     """Unified SMS System - Supports Fast2SMS and MSG91"""
@@ -24,6 +25,12 @@ class SMSAlertSystem:
         self.active_provider = None
         self.is_initialized = False
         
+        # One pooled HTTP session for the process; urllib3's pool is thread-safe
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=SMS_POOL_SIZE))
+        
         # Debug: Log status
         logger.info("=" * 50)
         logger.info("SMS SYSTEM INITIALIZATION")
@@ -81,7 +88,7 @@ class SMSAlertSystem:
             }
             payload = {"mobile": "1234567890"}
             
-            response = requests.post(url, json=payload, headers=headers, timeout=5)
+            response = self._http.post(url, json=payload, headers=headers, timeout=5)
             
             # If we get auth error, key is wrong. If we get other error, key is valid
             if 'authkey' in response.text.lower() and 'invalid' in response.text.lower():
@@ -110,7 +117,7 @@ class SMSAlertSystem:
                 "numbers": "9999999999"
             }
             
-            response = requests.post(url, data=payload, headers=headers, timeout=5)
+            response = self._http.post(url, data=payload, headers=headers, timeout=5)
             
             if response.status_code == 200:
                 result = response.json()
@@ -142,7 +149,7 @@ class SMSAlertSystem:
         formatted_phone = self.format_phone_number(phone_number)
         message = self._create_alert_message(alert_data, alert_type)
         
-        # Send using active provider
+        # Send using active provider (fixed at construction, so safe to read from any session)
         if self.is_initialized and self.active_provider:
             if self.active_provider == "MSG91":
                 return self._send_via_msg91(formatted_phone, message)
@@ -169,7 +176,7 @@ class SMSAlertSystem:
                 'country': '91'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self._http.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 logger.info(f"✅ SMS SENT via MSG91!")
@@ -203,7 +210,7 @@ class SMSAlertSystem:
                 "Content-Type": "application/x-www-form-urlencoded"
             }
             
-            response = requests.post(url, data=payload, headers=headers)
+            response = self._http.post(url, data=payload, headers=headers, timeout=10)
             result = response.json()
             
             if result.get('return') == True:
@@ -260,33 +267,22 @@ class SMSAlertSystem:
         
         urgency, action = urgency_map.get(alert_type, urgency_map["warning"])
         
-        message = f"{urgency}\n{species} at {zone}\n{dist:.1f}km ahead | {conf*100:.0f}%\nSpeed: {speed}kmph\n{action}\n-UP Wildlife"
+        location = alert_data.get('location_hint')
+        where = f"\n{location}" if location else ""
+        more = alert_data.get('additional_alerts', 0)
+        also = f"\n+{more} more nearby" if more else ""
+        
+        message = f"{urgency}\n{species} at {zone}{where}\n{dist:.1f}km ahead | {conf*100:.0f}%\nSpeed: {speed}kmph{also}\n{action}\n-UP Wildlife"
         
         return message.strip()
     
     def validate_phone_number(self, phone_number: str) -> bool:
         """Validate Indian phone number"""
-        if not phone_number:
-            return False
-        
-        cleaned = ''.join(c for c in phone_number if c.isdigit())
-        
-        if cleaned.startswith('91') and len(cleaned) == 12:
-            cleaned = cleaned[2:]
-        
-        if len(cleaned) == 10 and cleaned[0] in '6789':
-            return True
-        
-        return False
+        return validate_phone_number(phone_number)
     
     def format_phone_number(self, phone_number: str) -> str:
         """Format to 10-digit Indian number"""
-        cleaned = ''.join(c for c in phone_number if c.isdigit())
-        
-        if cleaned.startswith('91') and len(cleaned) == 12:
-            return cleaned[2:]
-        
-        return cleaned
+        return format_phone_number(phone_number)
     
     def get_status(self) -> Dict:
         """Get SMS system status"""
@@ -299,11 +295,88 @@ class SMSAlertSystem:
             "ready_for_sms": self.is_initialized
         }
 
-# Global SMS system instance
-sms_system = SMSAlertSystem()
+def validate_phone_number(phone_number: str) -> bool:
+    """Validate Indian phone number (no SMS provider needed)"""
+    if not phone_number:
+        return False
+    
+    cleaned = ''.join(c for c in phone_number if c.isdigit())
+    
+    if cleaned.startswith('91') and len(cleaned) == 12:
+        cleaned = cleaned[2:]
+    
+    if len(cleaned) == 10 and cleaned[0] in '6789':
+        return True
+    
+    return False
+
+def format_phone_number(phone_number: str) -> str:
+    """Format to 10-digit Indian number"""
+    cleaned = ''.join(c for c in phone_number if c.isdigit())
+    
+    if cleaned.startswith('91') and len(cleaned) == 12:
+        return cleaned[2:]
+    
+    return cleaned
+
+def _create_sms_system() -> SMSAlertSystem:
+    # Deferred from import time: reading .env and probing providers can take seconds
+    from dotenv import load_dotenv
+    load_dotenv()
+    return SMSAlertSystem()
+
+# Why the last attempt to create the SMS system failed; cleared once one succeeds
+_init_error: Optional[Exception] = None
+
+def get_sms_system() -> SMSAlertSystem:
+    """
+    The process-wide SMS system shared by all sessions, created on first use.
+    A failed creation is not cached, so the next call tries again.
+    """
+    global _init_error
+    try:
+        system = get_shared('sms_system', _create_sms_system)
+    except Exception as e:
+        _init_error = e
+        raise
+    _init_error = None
+    return system
+
+def peek_sms_system() -> Optional[SMSAlertSystem]:
+    """The SMS system if it has finished initializing, without waiting for it"""
+    return peek_shared('sms_system')
+
+def sms_system_error() -> Optional[Exception]:
+    """The error from the last failed initialization, or None"""
+    return _init_error
+
+_warm_lock = threading.Lock()
+_warm_started = False
+
+def _warm_up():
+    try:
+        get_sms_system()
+    except Exception:
+        # Kept in sms_system_error for the sidebar; get_sms_system retries on use
+        logger.exception("SMS system initialization failed")
+
+def warm_sms_system():
+    """Start initializing the SMS system in the background (once per process)"""
+    global _warm_started
+    with _warm_lock:
+        if _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=_warm_up, name="sms-system-init", daemon=True).start()
+
+def __getattr__(name):
+    # Backwards compatible `from utils.mobile_alerts import sms_system` (initializes on access)
+    if name == 'sms_system':
+        return get_sms_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def send_mobile_alert(alert_data: Dict, alert_type: str = "warning") -> Dict:
-    """Send mobile alert (in-app + SMS)"""
+def send_mobile_alert(alert_data: Dict, alert_type: str = "warning", send_sms: bool = True) -> Dict:
+    """Send mobile alert (in-app, plus SMS unless send_sms is False)"""
     import streamlit as st
     
     if 'mobile_alerts' not in st.session_state:
@@ -333,6 +406,11 @@ def send_mobile_alert(alert_data: Dict, alert_type: str = "warning") -> Dict:
     
     title, message = alert_templates.get(alert_type, alert_templates["warning"])
     
+    if alert_data.get('location_hint'):
+        message = f"{message} ({alert_data['location_hint']})"
+    if alert_data.get('additional_alerts'):
+        message = f"{message} +{alert_data['additional_alerts']} more"
+    
     priority_map = {
         "critical": "high",
         "emergency": "critical", 
@@ -357,6 +435,19 @@ def send_mobile_alert(alert_data: Dict, alert_type: str = "warning") -> Dict:
     logger.info(f"✅ Alert created: {title}")
     
     # Send SMS if enabled
+    if send_sms:
+        send_user_sms(alert_data, alert_type, alert)
+    
+    # Keep only last 50 alerts
+    if len(st.session_state.mobile_alerts) > 50:
+        st.session_state.mobile_alerts = st.session_state.mobile_alerts[-50:]
+    
+    return alert
+
+def send_user_sms(alert_data: Dict, alert_type: str = "warning", alert: Optional[Dict] = None) -> bool:
+    """Send an SMS to the user's phone if SMS alerts are enabled, marking the in-app alert as sent"""
+    import streamlit as st
+    
     try:
         enable_sms = st.session_state.get('enable_sms_alerts', False)
         user_phone = st.session_state.get('user_phone_number', '').strip()
@@ -364,16 +455,19 @@ def send_mobile_alert(alert_data: Dict, alert_type: str = "warning") -> Dict:
         logger.info(f"SMS Settings - Enabled: {enable_sms}, Phone: {user_phone[:3] if user_phone else 'None'}...")
         
         if enable_sms and user_phone:
-            if sms_system.validate_phone_number(user_phone):
-                formatted_phone = sms_system.format_phone_number(user_phone)
+            if validate_phone_number(user_phone):
+                formatted_phone = format_phone_number(user_phone)
+                sms_system = get_sms_system()
                 logger.info(f"📱 Sending SMS to: {formatted_phone}")
                 
                 sms_success = sms_system.send_sms_alert(formatted_phone, alert_data, alert_type)
                 
                 if sms_success or not sms_system.is_initialized:
-                    alert['sms_sent'] = True
-                    alert['sms_recipient'] = f"+91{formatted_phone}"
+                    if alert is not None:
+                        alert['sms_sent'] = True
+                        alert['sms_recipient'] = f"+91{formatted_phone}"
                     logger.info(f"✅ SMS {'sent' if sms_system.is_initialized else 'simulated'}")
+                    return True
                 else:
                     logger.warning(f"⚠️ SMS sending failed")
             else:
@@ -389,11 +483,7 @@ def send_mobile_alert(alert_data: Dict, alert_type: str = "warning") -> Dict:
         import traceback
         logger.error(traceback.format_exc())
     
-    # Keep only last 50 alerts
-    if len(st.session_state.mobile_alerts) > 50:
-        st.session_state.mobile_alerts = st.session_state.mobile_alerts[-50:]
-    
-    return alert
+    return False
 
 def send_emergency_sms(alert_data: Dict) -> bool:
     """Send emergency SMS to all contacts"""
@@ -412,11 +502,11 @@ def send_emergency_sms(alert_data: Dict) -> bool:
             phone = contact.get('number', '').strip()
             name = contact.get('name', 'Unknown')
             
-            if sms_system.validate_phone_number(phone):
-                formatted_phone = sms_system.format_phone_number(phone)
+            if validate_phone_number(phone):
+                formatted_phone = format_phone_number(phone)
                 logger.info(f"   → Sending to {name}: {formatted_phone}")
                 
-                if sms_system.send_sms_alert(formatted_phone, alert_data, "emergency"):
+                if get_sms_system().send_sms_alert(formatted_phone, alert_data, "emergency"):
                     success_count += 1
                     logger.info(f"     ✅ Sent to {name}")
             else:
@@ -442,11 +532,11 @@ def get_unread_count() -> int:
 
 def get_sms_system_status() -> Dict:
     """Get SMS system status"""
-    return sms_system.get_status()
+    return get_sms_system().get_status()
 
 def test_sms_system() -> Dict:
     """Test SMS system"""
-    status = sms_system.get_status()
+    status = get_sms_system().get_status()
     return {
         "success": status['initialized'],
         "message": f"Active provider: {status['provider']}" if status['initialized'] else "No provider configured",
@@ -0,0 +1,142 @@
+import hashlib
+import os
+from typing import Any, Dict, List
+
+import numpy as np
+import streamlit.components.v1 as components
+
+from utils.journey import JourneyPlan
+from utils.sound_alerts import get_sound_name
+from utils.sound_assets import get_sound_manifest
+
+# Browser-side journey player; see playback_component/index.html
+_journey_playback = components.declare_component(
+    "journey_playback",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "playback_component")
+)
+
+# Coordinates are sent with 5 decimals (~1 m), distances and times with 3
+COORD_DECIMALS = 5
+PROFILE_DECIMALS = 3
+
+
+def _event_alert(event, zone_name: str, species: str, notes: str, alert_threshold: float) -> Dict[str, Any]:
+    """Level, text and sound for one journey event, matching what the server-side steps would raise."""
+    label = species.title().replace('_', ' ')
+    speed = int(round(event.speed_kmph))
+    if event.kind == 'approach':
+        # check_animal_zones: HIGH within 2 km of the zone edge, MEDIUM beyond
+        level = 'HIGH' if alert_threshold <= 2 else 'MEDIUM'
+        return {'level': level, 'title': f"Approaching {zone_name}",
+                'message': f"{label} zone {alert_threshold:g} km ahead - reduce speed", 'sound_type': 'general'}
+    if event.kind == 'enter':
+        return {'level': 'CRITICAL', 'title': f"Entering {zone_name}",
+                'message': f"{notes}. Max {speed} km/h", 'sound_type': 'critical'}
+    if event.kind == 'band':
+        return {'level': 'INFO', 'title': f"{zone_name}: {speed} km/h",
+                'message': f"{event.ring_km:g} km from the {label.lower()} zone centre", 'sound_type': None}
+    if event.kind == 'exit':
+        return {'level': 'INFO', 'title': f"Leaving {zone_name}",
+                'message': f"Resume {speed} km/h", 'sound_type': None}
+    if event.kind == 'leave':
+        return {'level': 'INFO', 'title': f"Clear of {zone_name}", 'message': "", 'sound_type': None}
+    return {'level': 'INFO', 'title': "Arrived", 'message': "Journey complete", 'sound_type': None}
+
+
+def build_playback(plan: JourneyPlan, zones, risk_raster=None, alert_threshold: float = 3.0) -> Dict[str, Any]:
+    """
+    Everything the browser needs to play a journey back on its own.
+
+    The route, its time/distance breakpoints (the speed profile), per-vertex
+    risk from the raster, the zone circles the route touches and every
+    scheduled event with its alert text and sound. The result is plain JSON
+    and is sent once per journey; the browser animates the vehicle and fires
+    the alerts locally, so playback costs no server reruns.
+
+    Args:
+        plan: Timetable from :meth:`JourneyPlan.build`
+        zones: utils.records.ZoneTable the plan was built from
+        risk_raster: Optional utils.risk_raster.RiskRaster for colouring the route
+        alert_threshold: Alert range the plan was built with
+
+    Returns:
+        JSON-ready dict; ``id`` changes whenever the journey does
+    """
+    coords = np.round(plan.coords, COORD_DECIMALS)
+    digest = hashlib.blake2b(plan.coords.tobytes(), digest_size=8)
+    digest.update(repr(alert_threshold).encode())
+
+    risk: List[int] = []
+    if risk_raster is not None:
+        risk = risk_raster.lookup_many(plan.coords[:, 0], plan.coords[:, 1]).tolist()
+
+    events = []
+    touched = set()
+    for event in plan.events:
+        zone_name, species, notes = '', '', ''
+        if event.zone >= 0:
+            zone_name, species, notes = plan.zone_names[event.zone], zones.species(event.zone), zones.notes[event.zone]
+            touched.add(event.zone)
+        alert = _event_alert(event, zone_name, species, notes, alert_threshold)
+        sound_type = alert.pop('sound_type')
+        events.append({
+            't': round(event.time_s, PROFILE_DECIMALS),
+            'km': round(event.distance_km, PROFILE_DECIMALS),
+            'kind': event.kind,
+            'zone': event.zone,
+            'speed': round(event.speed_kmph, 1),
+            'sound': get_sound_name(sound_type, species) if sound_type else None,
+            'type': sound_type,
+            **alert
+        })
+
+    zone_rows = [{
+        'id': i,
+        'name': plan.zone_names[i],
+        'species': zones.species(i),
+        'lat': float(zones.records['lat'][i]),
+        'lon': float(zones.records['lon'][i]),
+        'radius_km': float(zones.records['radius_km'][i])
+    } for i in sorted(touched)]
+
+    return {
+        'id': digest.hexdigest(),
+        'route': coords.tolist(),
+        'cum_km': np.round(plan.cum_km, PROFILE_DECIMALS).tolist(),
+        'bp_km': np.round(plan.bp_km, PROFILE_DECIMALS).tolist(),
+        'bp_s': np.round(plan.bp_s, PROFILE_DECIMALS).tolist(),
+        'risk': risk,
+        'zones': zone_rows,
+        'events': events,
+        'total_km': round(plan.total_km, PROFILE_DECIMALS),
+        'total_s': round(plan.total_s, PROFILE_DECIMALS),
+        'alert_threshold': alert_threshold
+    }
+
+
+def render_journey_playback(payload: Dict[str, Any], time_scale: float = 120, volume: float = 0.7,
+                            enabled: bool = True, height: int = 560, key: str = "journey_playback"):
+    """
+    Render the browser-side player.
+
+    Args are identical on every rerun until the journey changes, so the iframe
+    keeps playing undisturbed; it returns nothing and never triggers a rerun.
+    """
+    _journey_playback(journey=payload, sounds=get_sound_manifest(), time_scale=float(time_scale),
+                      volume=float(volume), enabled=bool(enabled), height=int(height), key=key, default=None)
+
+
+if __name__ == "__main__":
+    import json
+    import pandas as pd
+    from utils.geo import densify_polyline
+    from utils.records import ZoneTable
+
+    # Payload for the Dudhwa / Katarniaghat demo drive: sent once instead of one rerun per step
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    route = densify_polyline([(28.56, 80.55), (28.50, 80.70), (28.2833, 81.0167), (28.20, 81.15)], step_km=0.5)
+    plan = JourneyPlan.build(route, table, threshold_km=3.0)
+    payload = build_playback(plan, table, alert_threshold=3.0)
+    size = len(json.dumps(payload, separators=(',', ':')))
+    print(f"{len(payload['route'])} vertices, {len(payload['events'])} events, {len(payload['zones'])} zones: "
+          f"{size / 1024:.1f} KiB once per journey")
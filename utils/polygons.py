@@ -0,0 +1,216 @@
+import json
+import sys
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from utils.projection import UP_PROJECTION, LocalProjection
+from utils.records import species_code, species_name
+
+# A ring as GeoJSON stores it: [[lon, lat], ...], closed (first vertex repeated last)
+Ring = Sequence[Sequence[float]]
+
+
+class PolygonHits(NamedTuple):
+    """Polygon zones near one position, as columns."""
+    zone: np.ndarray          # int32 row in the PolygonZones
+    distance_km: np.ndarray   # float32 to the nearest edge, 0 inside
+    inside: np.ndarray        # bool
+
+    def __len__(self) -> int:
+        return len(self.zone)
+
+
+class PolygonZones:
+    """
+    Wildlife zones drawn as GeoJSON (Multi)Polygons, alongside the circular ZoneTable.
+
+    Vertices are projected once (utils.projection) and every ring edge of every
+    polygon is stored in flat float32 arrays, grouped by polygon. A query keeps
+    the polygons whose bounding box, grown by the reach, holds the point, then
+    runs even-odd ray casting and point-to-segment distance over just their
+    edges in one vectorized pass. Holes and multi-part zones need no special
+    case: every ring's edges count towards the crossing parity.
+    """
+
+    __slots__ = ('names', 'notes', 'species_codes', 'parts', 'bbox', 'edge_start',
+                 'ax', 'ay', 'bx', 'by', 'projection')
+
+    def __init__(self, names: Tuple[str, ...], notes: Tuple[str, ...], species: Sequence[str],
+                 parts: List[List[List[Ring]]], projection: LocalProjection = UP_PROJECTION):
+        """
+        Args:
+            names, notes, species: One entry per zone
+            parts: Per zone, its polygons; per polygon, its rings (outer first, then holes)
+            projection: Local projection the geometry is evaluated in
+        """
+        self.names = names
+        self.notes = notes
+        self.species_codes = np.array([species_code(s) for s in species], dtype=np.uint8)
+        self.parts = parts
+        self.projection = projection
+
+        edges, counts, boxes = [], [], []
+        for polygons in parts:
+            rings = []
+            for ring in (ring for polygon in polygons for ring in polygon):
+                coords = np.asarray(ring, dtype=np.float64).reshape(-1, 2)
+                if len(coords) > 1 and not np.array_equal(coords[0], coords[-1]):
+                    coords = np.vstack((coords, coords[:1]))
+                x, y = projection.forward(coords[:, 1], coords[:, 0])
+                rings.append(np.column_stack((x[:-1], y[:-1], x[1:], y[1:])))
+            zone_edges = np.vstack(rings) if rings else np.empty((0, 4), dtype=np.float32)
+            edges.append(zone_edges)
+            counts.append(len(zone_edges))
+            xs, ys = zone_edges[:, [0, 2]], zone_edges[:, [1, 3]]
+            boxes.append((xs.min(), ys.min(), xs.max(), ys.max()) if len(zone_edges) else (np.inf, np.inf, -np.inf, -np.inf))
+
+        flat = np.vstack(edges) if edges else np.empty((0, 4), dtype=np.float32)
+        self.ax, self.ay, self.bx, self.by = (np.ascontiguousarray(flat[:, i], dtype=np.float32) for i in range(4))
+        self.edge_start = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.bbox = np.array(boxes, dtype=np.float32).reshape(-1, 4)
+
+    @classmethod
+    def from_geojson(cls, source, projection: LocalProjection = UP_PROJECTION) -> "PolygonZones":
+        """
+        Polygon and MultiPolygon features of a GeoJSON FeatureCollection (a path or
+        an already parsed dict). Properties: name, species, and optionally notes.
+        Features of any other geometry type are skipped.
+        """
+        if isinstance(source, dict):
+            collection = source
+        else:
+            with open(source, encoding='utf-8') as f:
+                collection = json.load(f)
+
+        names, notes, species, parts = [], [], [], []
+        for feature in collection.get('features', []):
+            geometry = feature.get('geometry') or {}
+            if geometry.get('type') == 'Polygon':
+                polygons = [geometry['coordinates']]
+            elif geometry.get('type') == 'MultiPolygon':
+                polygons = geometry['coordinates']
+            else:
+                continue
+            props = feature.get('properties') or {}
+            names.append(sys.intern(str(props.get('name', f"Zone {len(names) + 1}"))))
+            notes.append(sys.intern(str(props.get('notes', ''))))
+            species.append(str(props.get('species', 'wildlife')))
+            parts.append(polygons)
+        return cls(tuple(names), tuple(notes), species, parts, projection)
+
+    @classmethod
+    def empty(cls) -> "PolygonZones":
+        return cls((), (), [], [])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def species(self, i: int) -> str:
+        return species_name(self.species_codes[i])
+
+    def candidates(self, x: float, y: float, reach_km: float = 0.0) -> np.ndarray:
+        """Zones whose bounding box grown by ``reach_km`` holds the projected point."""
+        b = self.bbox
+        return np.nonzero((b[:, 0] - reach_km <= x) & (x <= b[:, 2] + reach_km)
+                          & (b[:, 1] - reach_km <= y) & (y <= b[:, 3] + reach_km))[0]
+
+    def near(self, lat: float, lon: float, reach_km: float = 0.0) -> bool:
+        """Bounding-box test only: whether any zone may lie within ``reach_km`` of the position."""
+        x, y = self.projection.forward(lat, lon)
+        return bool(len(self.candidates(x, y, reach_km)))
+
+    def query(self, lat: float, lon: float, reach_km: float = 0.0) -> PolygonHits:
+        """
+        Zones containing the position or with an edge within ``reach_km`` of it.
+
+        Returns:
+            PolygonHits, distance 0 for the zones the position is inside
+        """
+        x, y = self.projection.forward(lat, lon)
+        rows = self.candidates(x, y, reach_km)
+        if not len(rows):
+            return PolygonHits(rows.astype(np.int32), np.empty(0, dtype=np.float32), np.empty(0, dtype=bool))
+
+        # Gather the candidates' edges, still grouped by zone
+        counts = self.edge_start[rows + 1] - self.edge_start[rows]
+        group_start = np.cumsum(counts) - counts
+        idx = np.arange(counts.sum()) + np.repeat(self.edge_start[rows] - group_start, counts)
+        ax, ay, bx, by = self.ax[idx], self.ay[idx], self.bx[idx], self.by[idx]
+        dx, dy = bx - ax, by - ay
+
+        # Even-odd ray casting towards +x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crosses = ((ay > y) != (by > y)) & (x < ax + (y - ay) * dx / dy)
+        inside = np.add.reduceat(crosses.astype(np.int32), group_start) % 2 == 1
+
+        length2 = dx * dx + dy * dy
+        t = np.clip(((x - ax) * dx + (y - ay) * dy) / np.where(length2 > 0, length2, 1), 0, 1)
+        edge_km = np.minimum.reduceat(np.hypot(ax + t * dx - x, ay + t * dy - y), group_start)
+
+        distance = np.where(inside, np.float32(0), edge_km).astype(np.float32)
+        keep = distance <= reach_km
+        return PolygonHits(rows[keep].astype(np.int32), distance[keep], inside[keep])
+
+    def folium_locations(self, i: int) -> List[List[List[Tuple[float, float]]]]:
+        """Zone ``i`` as folium.Polygon locations: per polygon, its rings as (lat, lon)."""
+        return [[[(lat, lon) for lon, lat in ring] for ring in polygon] for polygon in self.parts[i]]
+
+
+def _ray_cast_reference(px: float, py: float, ring: np.ndarray) -> bool:
+    """Textbook per-edge loop, kept for the cross-check below."""
+    inside = False
+    for (ax, ay), (bx, by) in zip(ring[:-1], ring[1:]):
+        if (ay > py) != (by > py) and px < ax + (py - ay) * (bx - ax) / (by - ay):
+            inside = not inside
+    return inside
+
+
+if __name__ == "__main__":
+    import time
+
+    # Thousands of complex zones: 3,000 wobbly 200-vertex polygons over UP, a third with a hole
+    rng = np.random.default_rng(0)
+    n_zones, n_vertices = 3000, 200
+    features = []
+    for i in range(n_zones):
+        lat0, lon0 = rng.uniform(24.0, 30.3), rng.uniform(77.2, 84.5)
+        angles = np.linspace(0, 2 * np.pi, n_vertices, endpoint=False)
+        radius = rng.uniform(0.02, 0.08) * (1 + 0.3 * np.sin(angles * rng.integers(2, 7)) + rng.uniform(0, 0.2, n_vertices))
+        stretch = rng.uniform(1, 4)
+        outer = np.column_stack((lon0 + radius * np.cos(angles) * stretch, lat0 + radius * np.sin(angles)))
+        rings = [np.vstack((outer, outer[:1])).tolist()]
+        if i % 3 == 0:
+            hole = np.column_stack((lon0 + 0.3 * radius * np.cos(-angles), lat0 + 0.3 * radius * np.sin(-angles)))
+            rings.append(np.vstack((hole, hole[:1])).tolist())
+        features.append({'type': 'Feature', 'properties': {'name': f"Zone {i}", 'species': 'tiger'},
+                         'geometry': {'type': 'Polygon', 'coordinates': rings}})
+
+    t0 = time.perf_counter()
+    zones = PolygonZones.from_geojson({'type': 'FeatureCollection', 'features': features})
+    print(f"{n_zones:,} polygons / {len(zones.ax):,} edges loaded in {time.perf_counter() - t0:.2f} s")
+
+    # Fixes concentrated near zones so most queries have real work to do
+    fixes = 2000
+    pick = rng.integers(0, n_zones, fixes)
+    centres = zones.bbox[pick]
+    cx = rng.uniform(centres[:, 0] - 3, centres[:, 2] + 3)
+    cy = rng.uniform(centres[:, 1] - 3, centres[:, 3] + 3)
+    lats, lons = zones.projection.inverse(cx, cy)
+
+    t0 = time.perf_counter()
+    results = [zones.query(a, b, 3.0) for a, b in zip(lats, lons)]
+    per_fix_us = (time.perf_counter() - t0) / fixes * 1e6
+    print(f"query with a 3 km reach: {per_fix_us:.0f} us per fix, "
+          f"{sum(len(r) for r in results) / fixes:.2f} zones returned on average")
+
+    mismatches = 0
+    for (a, b), hits in zip(zip(lats[:300], lons[:300]), results[:300]):
+        x, y = zones.projection.forward(a, b)
+        for row in zones.candidates(x, y, 3.0):
+            parity = False
+            for ring in zones.parts[row][0]:
+                rx, ry = zones.projection.forward(np.array(ring)[:, 1], np.array(ring)[:, 0])
+                parity ^= _ray_cast_reference(float(x), float(y), np.column_stack((rx, ry)).tolist())
+            mismatches += parity != bool(hits.inside[hits.zone == row].any())
+    print(f"containment vs per-edge reference on 300 fixes: {mismatches} mismatches")
@@ -0,0 +1,164 @@
+from typing import Tuple
+
+import numpy as np
+
+from utils.geo import WGS84_A_KM, WGS84_F
+
+# Centre of the app's map (create_map); every deployment so far is inside Uttar Pradesh
+UP_CENTER: Tuple[float, float] = (27.13, 80.75)
+
+_E2 = WGS84_F * (2 - WGS84_F)
+
+
+class LocalProjection:
+    """
+    Azimuthal equidistant projection about a fixed centre, in km.
+
+    East and north offsets are scaled by the WGS-84 prime-vertical and
+    meridional radii at the centre, so Euclidean distances between projected
+    points stay within 0.13% of the geodesic anywhere in Uttar Pradesh
+    (haversine: 0.40%; python -m utils.projection). Coordinates are float32:
+    at 500 km from the centre that is still centimetre resolution.
+    """
+
+    def __init__(self, lat0: float, lon0: float):
+        self.lat0, self.lon0 = lat0, lon0
+        phi0 = np.radians(lat0)
+        w = 1 - _E2 * np.sin(phi0) ** 2
+        self.m_km = float(WGS84_A_KM * (1 - _E2) / w ** 1.5)   # north-south radius of curvature
+        self.n_km = float(WGS84_A_KM / np.sqrt(w))             # east-west radius of curvature
+        self._sin0, self._cos0 = float(np.sin(phi0)), float(np.cos(phi0))
+        self._lam0 = float(np.radians(lon0))
+
+    def forward(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        """Projected (x east, y north) in km as float32, for scalars or arrays of degrees."""
+        phi = np.radians(np.asarray(lat, dtype=np.float64))
+        dlam = np.radians(np.asarray(lon, dtype=np.float64)) - self._lam0
+        sin_phi, cos_phi, cos_dlam = np.sin(phi), np.cos(phi), np.cos(dlam)
+        c = np.arccos(np.clip(self._sin0 * sin_phi + self._cos0 * cos_phi * cos_dlam, -1.0, 1.0))
+        # c / sin(c), which tends to 1 at the centre
+        k = np.divide(c, np.sin(c), out=np.ones_like(c), where=c > 0)
+        x = k * cos_phi * np.sin(dlam) * self.n_km
+        y = k * (self._cos0 * sin_phi - self._sin0 * cos_phi * cos_dlam) * self.m_km
+        return x.astype(np.float32), y.astype(np.float32)
+
+    def forward_points(self, points) -> np.ndarray:
+        """(N, 2) (latitude, longitude) to an (N, 2) float32 array of (x, y) km."""
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return np.column_stack(self.forward(coords[:, 0], coords[:, 1]))
+
+    def inverse(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """(latitude, longitude) in float64 degrees for projected km, e.g. to display results."""
+        e = np.asarray(x, dtype=np.float64) / self.n_km
+        n = np.asarray(y, dtype=np.float64) / self.m_km
+        c = np.hypot(e, n)
+        sin_c, cos_c = np.sin(c), np.cos(c)
+        n_over_c = np.divide(n, c, out=np.zeros_like(c), where=c > 0)
+        phi = np.arcsin(np.clip(cos_c * self._sin0 + n_over_c * sin_c * self._cos0, -1.0, 1.0))
+        lam = self._lam0 + np.arctan2(e * sin_c, c * self._cos0 * cos_c - n * self._sin0 * sin_c)
+        return np.degrees(phi), (np.degrees(lam) + 540.0) % 360.0 - 180.0
+
+    def distance_km(self, lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Projected Euclidean distance, as a utils.geo distance backend (haversine_km signature)."""
+        x1, y1 = self.forward(lat1, lon1)
+        x2, y2 = self.forward(lat2, lon2)
+        return np.hypot(x2 - x1, y2 - y1)
+
+
+UP_PROJECTION = LocalProjection(*UP_CENTER)
+
+
+class ProjectedZones:
+    """
+    A ZoneTable projected once: zone centres as float32 km, so proximity
+    checks are a subtraction and a hypot per zone, with no trigonometry.
+    """
+
+    __slots__ = ('projection', 'xy', 'radius_km')
+
+    def __init__(self, zones, projection: LocalProjection = UP_PROJECTION):
+        self.projection = projection
+        x, y = projection.forward(zones.records['lat'], zones.records['lon'])
+        self.xy = np.column_stack((x, y))
+        self.radius_km = zones.records['radius_km'].astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    def distances_km(self, xy) -> np.ndarray:
+        """Distance to every zone centre: (Z,) for one projected point, (N, Z) for (N, 2) points."""
+        xy = np.asarray(xy, dtype=np.float32)
+        d = xy[..., None, :] - self.xy
+        return np.hypot(d[..., 0], d[..., 1])
+
+    def within(self, xy, reach_km: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zones whose radius plus ``reach_km`` contains one projected point.
+
+        Returns:
+            (row indices, distances in km); exact in the projection, so no
+            confirmation pass is needed
+        """
+        dist = self.distances_km(xy)
+        rows = np.nonzero(dist <= self.radius_km + np.float32(reach_km))[0]
+        return rows, dist[rows]
+
+    def within_lat_lon(self, lat: float, lon: float, reach_km: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """:meth:`within` for a (latitude, longitude) position."""
+        x, y = self.projection.forward(lat, lon)
+        return self.within((x, y), reach_km)
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from geopy.distance import geodesic
+    from utils.geo import densify_polyline, haversine_km, vincenty_km
+    from utils.records import ZoneTable
+
+    # Accuracy: pairs anywhere in UP at the alert ranges, against geopy's geodesic
+    rng = np.random.default_rng(0)
+    print("max error vs geodesic over 2,000 random UP pairs per range")
+    for range_km in (1, 3, 5, 10, 15):
+        lat1, lon1 = rng.uniform(23.8, 30.5, 2000), rng.uniform(77.0, 84.7, 2000)
+        ends = np.array([geodesic(kilometers=range_km).destination((a, b), c)[:2]
+                         for a, b, c in zip(lat1, lon1, rng.uniform(0, 360, 2000))])
+        projected = UP_PROJECTION.distance_km(lat1, lon1, ends[:, 0], ends[:, 1])
+        spherical = haversine_km(lat1, lon1, ends[:, 0], ends[:, 1])
+        print(f"  {range_km:2d} km: projected {np.abs(projected - range_km).max() * 1e3:5.1f} m, "
+              f"haversine {np.abs(spherical - range_km).max() * 1e3:5.1f} m")
+
+    lat, lon = rng.uniform(23.8, 30.5, 100_000), rng.uniform(77.0, 84.7, 100_000)
+    back_lat, back_lon = UP_PROJECTION.inverse(*UP_PROJECTION.forward(lat, lon))
+    print(f"round trip through float32: max {np.abs(back_lat - lat).max() * 111_000:.2f} m in latitude, "
+          f"{np.abs(back_lon - lon).max() * 111_000:.2f} m in longitude")
+
+    # Throughput: a long route's proximity to every zone, geodesic path vs projected once
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    route = densify_polyline([(26.8467, 80.9462), (28.5, 80.7), (28.2833, 81.0167), (28.7, 79.9)], step_km=0.01)
+    zone_lat, zone_lon = table.records['lat'], table.records['lon']
+    reach = table.records['radius_km'] + 3.0
+
+    n = 200
+    t0 = time.perf_counter()
+    reference = np.array([[geodesic(p, (a, b)).kilometers for a, b in zip(zone_lat, zone_lon)] for p in route[:n]])
+    geodesic_us = (time.perf_counter() - t0) / (n * len(table)) * 1e6
+    t0 = time.perf_counter()
+    exact = vincenty_km(route[:, 0, None], route[:, 1, None], zone_lat, zone_lon)
+    vincenty_us = (time.perf_counter() - t0) / exact.size * 1e6
+
+    zones = ProjectedZones(table)
+    t0 = time.perf_counter()
+    xy = UP_PROJECTION.forward_points(route)
+    project_ms = (time.perf_counter() - t0) * 1e3
+    t0 = time.perf_counter()
+    fast = zones.distances_km(xy)
+    fast_us = (time.perf_counter() - t0) / fast.size * 1e6
+
+    print(f"{len(route):,} route points x {len(table)} zones:")
+    print(f"  geodesic   {geodesic_us * 1e3:9.1f} ns/pair")
+    print(f"  vincenty   {vincenty_us * 1e3:9.1f} ns/pair")
+    print(f"  projected  {fast_us * 1e3:9.1f} ns/pair (+ {project_ms:.1f} ms to project the route once)")
+    print(f"  projected vs geodesic on the first {n} points: max {np.abs(fast[:n] - reference).max() * 1e3:.0f} m")
+    flips = np.count_nonzero((fast <= reach) != (exact <= reach))
+    print(f"  in-range decisions differing from vincenty at a 3 km alert range: {flips} of {fast.size:,}")
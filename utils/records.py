@@ -0,0 +1,185 @@
+import sys
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.geo import haversine_km
+from utils.species import SPECIES_SPEED_KMPH
+
+# Species are stored as uint8 codes into this table; unknown species are appended
+SPECIES_NAMES: List[str] = [sys.intern(s) for s in SPECIES_SPEED_KMPH]
+_SPECIES_INDEX: Dict[str, int] = {s: i for i, s in enumerate(SPECIES_NAMES)}
+# Script runs share these tables across sessions' threads; appends take the lock
+_SPECIES_LOCK = threading.Lock()
+
+ZONE_DTYPE = np.dtype([
+    ('lat', np.float64),
+    ('lon', np.float64),
+    ('radius_km', np.float32),
+    ('species', np.uint8)
+])
+
+# haversine vs. ellipsoidal geodesic differ by well under 1%; candidates found
+# with this slack are confirmed with the exact distance function
+PREFILTER_SLACK = 1.01
+
+
+def species_code(species: str) -> int:
+    """Interned uint8 code for a species name."""
+    code = _SPECIES_INDEX.get(species)
+    if code is not None:
+        return code
+    with _SPECIES_LOCK:
+        # Another thread may have added it since the unlocked lookup
+        code = _SPECIES_INDEX.get(species)
+        if code is None:
+            if len(SPECIES_NAMES) >= 255:
+                raise ValueError("Too many species for a uint8 code")
+            code = len(SPECIES_NAMES)
+            # Name first: a code is only published once species_name() can resolve it
+            SPECIES_NAMES.append(sys.intern(species))
+            _SPECIES_INDEX[species] = code
+    return code
+
+
+def species_name(code: int) -> str:
+    return SPECIES_NAMES[code]
+
+
+class _Record:
+    """Dict-style helpers shared by the alert and detection records."""
+
+    __slots__ = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict for the UI / notification boundary."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True)
+class ZoneAlert(_Record):
+    zone_name: str
+    species: str
+    distance: float
+    risk_level: str
+    notes: str
+    recommended_speed: int
+    zone_radius: float
+    location_hint: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Detection(_Record):
+    lat: float
+    lon: float
+    species: str
+    zone_name: str
+    detection_time: str
+    distance_from_vehicle: float
+    confidence: float
+    location_hint: Optional[str] = None
+
+
+class ZoneTable:
+    """
+    Zone catalogue as a NumPy structured array (lat, lon, radius_km, species code).
+
+    Names and notes stay in tuples of interned strings indexed by row, so the
+    records created from a zone share those strings instead of copying them.
+    """
+
+    __slots__ = ('records', 'names', 'notes')
+
+    def __init__(self, records: np.ndarray, names: Tuple[str, ...], notes: Tuple[str, ...]):
+        self.records = records
+        self.names = names
+        self.notes = notes
+
+    @classmethod
+    def from_dataframe(cls, zones_df) -> "ZoneTable":
+        records = np.empty(len(zones_df), dtype=ZONE_DTYPE)
+        records['lat'] = zones_df['lat'].to_numpy(dtype=np.float64)
+        records['lon'] = zones_df['lon'].to_numpy(dtype=np.float64)
+        records['radius_km'] = zones_df['radius_km'].to_numpy(dtype=np.float32)
+        records['species'] = [species_code(s) for s in zones_df['species']]
+        notes = zones_df['notes'] if 'notes' in zones_df else [''] * len(zones_df)
+        return cls(records,
+                   tuple(sys.intern(str(n)) for n in zones_df['name']),
+                   tuple(sys.intern(str(n)) for n in notes))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def species(self, i: int) -> str:
+        return SPECIES_NAMES[self.records['species'][i]]
+
+    def take(self, rows) -> "ZoneTable":
+        """A table of just the given rows, in that order (names and notes still shared)."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return ZoneTable(self.records[rows], tuple(self.names[i] for i in rows.tolist()),
+                         tuple(self.notes[i] for i in rows.tolist()))
+
+    def within(self, lat: float, lon: float, reach_km: float = 0.0) -> np.ndarray:
+        """
+        Row indices of zones whose radius plus ``reach_km`` may contain the point.
+
+        A vectorized haversine prefilter with a small slack; callers confirm
+        with their own distance function.
+        """
+        dist = haversine_km(lat, lon, self.records['lat'], self.records['lon'])
+        reach = (self.records['radius_km'].astype(np.float64) + reach_km) * PREFILTER_SLACK
+        return np.nonzero(dist <= reach)[0]
+
+
+if __name__ == "__main__":
+    import random
+    import tracemalloc
+    from datetime import datetime
+    import pandas as pd
+
+    # A long session: alerts and detections accumulated over a full day of steps
+    n = 20_000
+    zones_df = pd.read_csv('data/animal_zones.csv')
+    table = ZoneTable.from_dataframe(zones_df)
+    rng = random.Random(0)
+    now = datetime.now().strftime('%H:%M:%S')
+
+    def build(as_records: bool):
+        alerts, detections = [], []
+        for _ in range(n):
+            i = rng.randrange(len(table))
+            species, name, notes = table.species(i), table.names[i], table.notes[i]
+            alert = dict(zone_name=name, species=species, distance=round(rng.uniform(0, 10), 2),
+                         risk_level='HIGH', notes=notes, recommended_speed=20,
+                         zone_radius=float(table.records['radius_km'][i]), location_hint=None)
+            detection = dict(lat=rng.uniform(24, 30), lon=rng.uniform(78, 84), species=species,
+                             zone_name=name, detection_time=now, distance_from_vehicle=rng.uniform(0, 3),
+                             confidence=round(rng.uniform(0.85, 0.98), 2), location_hint=None)
+            if as_records:
+                alerts.append(ZoneAlert(**alert))
+                detections.append(Detection(**detection))
+            else:
+                alerts.append(alert)
+                detections.append(detection)
+        return alerts, detections
+
+    for label, as_records in (("dicts", False), ("slotted records", True)):
+        tracemalloc.start()
+        kept = build(as_records)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<16} {n:,} alerts + {n:,} detections: {size / 1024 / 1024:6.2f} MiB "
+              f"({size / (2 * n):.0f} B/record)")
+        del kept
+
+    tracemalloc.start()
+    rows = list(zones_df.iterrows())
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"zones: iterrows() Series {size / 1024:.1f} KiB per scan vs. structured array "
+          f"{table.records.nbytes / 1024:.1f} KiB total")
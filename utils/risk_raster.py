@@ -0,0 +1,217 @@
+import hashlib
+import json
+import sys
+from typing import Optional
+
+import numpy as np
+
+from utils.geo import haversine_km
+from utils.species import species_risk_weight
+
+# Grid covering Uttar Pradesh with a margin; 0.01 deg is ~1.1 km north-south
+DEFAULT_BOUNDS = (23.8, 77.0, 30.5, 84.7)   # lat_min, lon_min, lat_max, lon_max
+DEFAULT_CELL_DEG = 0.01
+# Largest value of the "Alert Range (km)" slider; cells within radius_km plus this
+# distance of any zone are guaranteed non-zero so the raster can gate zone checks.
+DEFAULT_MAX_THRESHOLD_KM = 10.0
+# Incidents within this distance of a cell add to its score
+INCIDENT_RADIUS_KM = 5.0
+KM_PER_DEG = 111.32
+
+
+def catalogue_hash(zones_df, incidents_df=None) -> str:
+    """Fingerprint of the inputs a raster was built from, used to detect stale files."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(zones_df[['lat', 'lon', 'radius_km', 'species']].to_csv(index=False).encode())
+    if incidents_df is not None and len(incidents_df):
+        h.update(incidents_df[['lat', 'lon', 'severity']].to_csv(index=False).encode())
+    return h.hexdigest()
+
+
+class RiskRaster:
+    """
+    Wildlife risk on a fixed lat/lon grid, stored as uint8 (0 = no zone in reach).
+
+    The grid is saved as a plain ``.npy`` so it can be memory-mapped; geometry
+    lives in a small JSON header next to it. A lookup is two multiplications and
+    an array index.
+    """
+
+    def __init__(self, grid: np.ndarray, lat_min: float, lon_min: float, cell_deg: float,
+                 max_threshold_km: float = DEFAULT_MAX_THRESHOLD_KM, source_hash: str = ""):
+        self.grid = grid
+        self.lat_min = float(lat_min)
+        self.lon_min = float(lon_min)
+        self.cell_deg = float(cell_deg)
+        self.inv_cell = 1.0 / self.cell_deg
+        self.rows, self.cols = grid.shape
+        self.max_threshold_km = float(max_threshold_km)
+        self.source_hash = source_hash
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, zones_df, incidents_df=None, bounds=DEFAULT_BOUNDS, cell_deg: float = DEFAULT_CELL_DEG,
+              max_threshold_km: float = DEFAULT_MAX_THRESHOLD_KM) -> "RiskRaster":
+        """
+        Rasterize the zone catalogue.
+
+        Each cell's score combines the highest species-weighted proximity of any
+        zone in reach with nearby incident severity, scaled to 1..255. Reach is
+        ``radius_km + max_threshold_km`` plus half a cell diagonal, which keeps the
+        "zero means nothing nearby" guarantee exact for any point inside the cell.
+
+        Args:
+            zones_df: DataFrame with lat, lon, radius_km and species columns
+            incidents_df: Optional DataFrame with lat, lon and severity columns
+            bounds: (lat_min, lon_min, lat_max, lon_max) of the grid
+            cell_deg: Cell size in degrees
+            max_threshold_km: Largest alert threshold the raster must cover
+
+        Returns:
+            RiskRaster holding an in-memory grid
+        """
+        lat_min, lon_min, lat_max, lon_max = bounds
+        rows = int(np.ceil((lat_max - lat_min) / cell_deg))
+        cols = int(np.ceil((lon_max - lon_min) / cell_deg))
+        score = np.zeros((rows, cols), dtype=np.float32)
+        reached = np.zeros((rows, cols), dtype=bool)
+        half_diag_km = 0.5 * np.hypot(cell_deg * KM_PER_DEG, cell_deg * KM_PER_DEG)
+
+        for zone in zones_df[['lat', 'lon', 'radius_km', 'species']].itertuples(index=False):
+            reach = float(zone.radius_km) + max_threshold_km + half_diag_km
+            r0, r1, c0, c1 = cls._window(zone.lat, zone.lon, reach, lat_min, lon_min, cell_deg, rows, cols)
+            if r0 >= r1 or c0 >= c1:
+                continue
+            lat_c = lat_min + (np.arange(r0, r1) + 0.5) * cell_deg
+            lon_c = lon_min + (np.arange(c0, c1) + 0.5) * cell_deg
+            dist = haversine_km(lat_c[:, None], lon_c[None, :], zone.lat, zone.lon)
+            # 1% slack absorbs the haversine vs. ellipsoidal-geodesic difference
+            inside_reach = dist - half_diag_km <= (float(zone.radius_km) + max_threshold_km) * 1.01
+            # 1.0 inside the zone, falling linearly to 0 at the edge of the alert range
+            proximity = np.clip(1.0 - (dist - float(zone.radius_km)) / max_threshold_km, 0.0, 1.0)
+            zone_score = (proximity * species_risk_weight(zone.species)).astype(np.float32)
+            window = (slice(r0, r1), slice(c0, c1))
+            score[window] = np.maximum(score[window], np.where(inside_reach, zone_score, 0.0))
+            reached[window] |= inside_reach
+
+        if incidents_df is not None and len(incidents_df):
+            density = np.zeros((rows, cols), dtype=np.float32)
+            for inc in incidents_df[['lat', 'lon', 'severity']].itertuples(index=False):
+                r0, r1, c0, c1 = cls._window(inc.lat, inc.lon, INCIDENT_RADIUS_KM, lat_min, lon_min, cell_deg, rows, cols)
+                if r0 >= r1 or c0 >= c1:
+                    continue
+                lat_c = lat_min + (np.arange(r0, r1) + 0.5) * cell_deg
+                lon_c = lon_min + (np.arange(c0, c1) + 0.5) * cell_deg
+                dist = haversine_km(lat_c[:, None], lon_c[None, :], inc.lat, inc.lon)
+                density[r0:r1, c0:c1] += np.where(dist <= INCIDENT_RADIUS_KM, float(inc.severity), 0.0)
+            # A severity-5 incident is worth about as much as a tiger zone boundary
+            score += density / 25.0
+            reached |= density > 0
+
+        top = float(score.max()) or 1.0
+        grid = np.where(reached, np.clip(np.rint(score / top * 254.0) + 1, 1, 255), 0).astype(np.uint8)
+        return cls(grid, lat_min, lon_min, cell_deg, max_threshold_km, catalogue_hash(zones_df, incidents_df))
+
+    @staticmethod
+    def _window(lat, lon, reach_km, lat_min, lon_min, cell_deg, rows, cols):
+        dlat = reach_km / KM_PER_DEG
+        dlon = reach_km / (KM_PER_DEG * max(np.cos(np.radians(abs(lat) + dlat)), 0.01))
+        r0 = max(int(np.floor((lat - dlat - lat_min) / cell_deg)), 0)
+        r1 = min(int(np.ceil((lat + dlat - lat_min) / cell_deg)) + 1, rows)
+        c0 = max(int(np.floor((lon - dlon - lon_min) / cell_deg)), 0)
+        c1 = min(int(np.ceil((lon + dlon - lon_min) / cell_deg)) + 1, cols)
+        return r0, r1, c0, c1
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str):
+        """Write ``<path>`` (.npy grid) and ``<path minus .npy>.json`` (header)."""
+        np.save(path, np.ascontiguousarray(self.grid))
+        with open(_header_path(path), 'w') as f:
+            json.dump({
+                'lat_min': self.lat_min, 'lon_min': self.lon_min, 'cell_deg': self.cell_deg,
+                'rows': self.rows, 'cols': self.cols, 'max_threshold_km': self.max_threshold_km,
+                'source_hash': self.source_hash
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "RiskRaster":
+        """Memory-map a raster written by :meth:`save`."""
+        with open(_header_path(path)) as f:
+            header = json.load(f)
+        grid = np.load(path, mmap_mode='r')
+        return cls(grid, header['lat_min'], header['lon_min'], header['cell_deg'],
+                   header.get('max_threshold_km', DEFAULT_MAX_THRESHOLD_KM), header.get('source_hash', ''))
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def lookup(self, lat: float, lon: float) -> Optional[int]:
+        """
+        Risk score (0-255) of the cell containing a point.
+
+        Returns:
+            Cell value, or None when the point is outside the grid (risk unknown)
+        """
+        row = int((lat - self.lat_min) * self.inv_cell)
+        col = int((lon - self.lon_min) * self.inv_cell)
+        if lat < self.lat_min or lon < self.lon_min or row >= self.rows or col >= self.cols:
+            return None
+        return int(self.grid[row, col])
+
+    def lookup_many(self, lats, lons) -> np.ndarray:
+        """
+        Vectorized lookup. Points outside the grid get 255 so callers that gate
+        on zero fall back to a full check.
+        """
+        rows = np.floor((np.asarray(lats) - self.lat_min) * self.inv_cell).astype(np.int64)
+        cols = np.floor((np.asarray(lons) - self.lon_min) * self.inv_cell).astype(np.int64)
+        valid = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        out = np.full(rows.shape, 255, dtype=np.uint8)
+        out[valid] = self.grid[rows[valid], cols[valid]]
+        return out
+
+    def may_alert(self, lat: float, lon: float, threshold_km: float) -> bool:
+        """
+        Whether a zone check at this point could produce any alert.
+
+        False only when the cell is zero and the threshold is covered by the
+        raster; anything else (non-zero, off-grid, larger threshold) says check.
+        """
+        if threshold_km > self.max_threshold_km:
+            return True
+        value = self.lookup(lat, lon)
+        return value is None or value > 0
+
+
+def _header_path(path: str) -> str:
+    return (path[:-4] if path.endswith('.npy') else path) + '.json'
+
+
+if __name__ == "__main__":
+    import time
+    from utils.catalogue import load_incidents, load_zones
+
+    out = sys.argv[1] if len(sys.argv) > 1 else 'data/risk_raster.npy'
+    # The same inputs (and sample fallbacks) as the app's load_risk_raster, so the hash matches
+    zones, incidents = load_zones(), load_incidents()
+
+    t0 = time.perf_counter()
+    raster = RiskRaster.build(zones, incidents)
+    raster.save(out)
+    print(f"Built {raster.rows}x{raster.cols} raster ({raster.grid.nbytes / 1024:.0f} KiB, "
+          f"{np.count_nonzero(raster.grid):,} non-zero cells) in {time.perf_counter() - t0:.2f}s -> {out}")
+
+    raster = RiskRaster.load(out)
+    rng = np.random.default_rng(0)
+    pts = np.column_stack((rng.uniform(24, 30, 100_000), rng.uniform(78, 84, 100_000)))
+    t0 = time.perf_counter()
+    for lat, lon in pts[:10_000]:
+        raster.lookup(lat, lon)
+    print(f"lookup: {(time.perf_counter() - t0) / 10_000 * 1e6:.2f} us/fix")
+    t0 = time.perf_counter()
+    raster.lookup_many(pts[:, 0], pts[:, 1])
+    print(f"lookup_many: {(time.perf_counter() - t0) / len(pts) * 1e9:.1f} ns/fix")
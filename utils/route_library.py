@@ -0,0 +1,151 @@
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.batch_score import iter_routes
+from utils.geo import cumulative_km, densify_polyline
+from utils.route_table import ApproachMargins, approach_margins
+
+ALERT_ROUTE_ID = 'alert'
+# Lucknow -> Dudhwa -> Katarniaghat -> Kishanpur -> Pilibhit, through several zones
+ALERT_ROUTE_WAYPOINTS: Tuple[Tuple[float, float], ...] = (
+    (26.8467, 80.9462),
+    (27.5000, 80.5000), (28.0000, 80.6000),
+    (28.5000, 80.7000), (28.5500, 80.7500),
+    (28.3000, 80.9000), (28.2833, 81.0167),
+    (28.2500, 81.1000),
+    (28.4000, 80.4000), (28.4333, 80.2833),
+    (28.7000, 79.9000)
+)
+# The alert route keeps its historical spacing: 5 points per leg plus the end point
+ALERT_POINTS_PER_LEG = 5
+# Spacing of routes loaded from the CSV
+PRESET_STEP_KM = 1.0
+
+
+class LibraryRoute(NamedTuple):
+    """A ready-to-drive route: densified points, their byte key and the threshold-free risk profile."""
+    route_id: str
+    name: str
+    waypoints: np.ndarray       # (W, 2) float64 as stored
+    points: np.ndarray          # (N, 2) float64, read-only
+    key: bytes                  # points.tobytes(), the key of the app's per-route caches
+    cum_km: np.ndarray          # distance along the route at each point
+    margins: ApproachMargins    # closest approach to every zone
+
+    @property
+    def length_km(self) -> float:
+        return float(self.cum_km[-1]) if len(self.cum_km) else 0.0
+
+    @property
+    def start(self) -> Tuple[float, float]:
+        return tuple(self.points[0].tolist())
+
+    @property
+    def end(self) -> Tuple[float, float]:
+        return tuple(self.points[-1].tolist())
+
+
+def _legs(waypoints: np.ndarray, per_leg: int) -> np.ndarray:
+    """``per_leg`` evenly spaced points per leg (each leg's end excluded), then the last waypoint."""
+    frac = np.arange(per_leg) / per_leg
+    a, b = waypoints[:-1, None, :], waypoints[1:, None, :]
+    return np.vstack(((a + (b - a) * frac[:, None]).reshape(-1, 2), waypoints[-1:]))
+
+
+def _make_route(route_id: str, name: str, waypoints, points: np.ndarray, zones) -> LibraryRoute:
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    points.flags.writeable = False
+    return LibraryRoute(route_id, name, np.asarray(waypoints, dtype=np.float64), points, points.tobytes(),
+                        cumulative_km(points), approach_margins(points, zones))
+
+
+class RouteLibrary:
+    """
+    Preset routes (data/routes.csv) plus the built-in alert test route, built once.
+
+    Lookups are a dict access; ``stamp`` records the source file's (mtime, size)
+    so callers can key a cache on :meth:`source_stamp` and reload when it changes.
+    """
+
+    def __init__(self, routes: Dict[str, LibraryRoute], path: Optional[str] = None,
+                 stamp: Optional[Tuple[int, int]] = None):
+        self.routes = routes
+        self.path = path
+        self.stamp = stamp
+
+    @staticmethod
+    def source_stamp(path: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the routes file, or None when it does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @classmethod
+    def load(cls, path: str, zones, step_km: float = PRESET_STEP_KM) -> "RouteLibrary":
+        """
+        Build every route of ``path`` (route_id,route_name,latitude,longitude) and
+        the alert route. A missing file leaves just the alert route.
+        """
+        waypoints = np.asarray(ALERT_ROUTE_WAYPOINTS, dtype=np.float64)
+        routes = {ALERT_ROUTE_ID: _make_route(ALERT_ROUTE_ID, "Alert Test Route", waypoints,
+                                              _legs(waypoints, ALERT_POINTS_PER_LEG), zones)}
+        stamp = cls.source_stamp(path)
+        if stamp is not None:
+            for route_id, name, waypoints in iter_routes(path):
+                if route_id in routes:
+                    raise ValueError(f"{path}: route id {route_id!r} is reserved")
+                routes[route_id] = _make_route(route_id, name, waypoints,
+                                               densify_polyline(waypoints, step_km=step_km), zones)
+        return cls(routes, path, stamp)
+
+    def __getitem__(self, route_id: str) -> LibraryRoute:
+        return self.routes[route_id]
+
+    def __contains__(self, route_id: str) -> bool:
+        return route_id in self.routes
+
+    def __iter__(self) -> Iterator[LibraryRoute]:
+        return iter(self.routes.values())
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def presets(self) -> List[LibraryRoute]:
+        """Routes from the file, in file order (the alert route excluded)."""
+        return [route for route in self if route.route_id != ALERT_ROUTE_ID]
+
+    def is_current(self) -> bool:
+        """Whether the source file is unchanged since loading."""
+        return self.path is None or self.source_stamp(self.path) == self.stamp
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.records import ZoneTable
+
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    t0 = time.perf_counter()
+    library = RouteLibrary.load('data/routes.csv', table)
+    print(f"{len(library)} routes built in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+    for route in library:
+        entered = [table.names[z] for z, m in zip(route.margins.zone, route.margins.margin_km) if m <= 0]
+        print(f"  {route.route_id:>5}  {route.name:<24} {len(route.points):4d} points {route.length_km:6.1f} km, "
+              f"enters {', '.join(entered) or 'no zone'}")
+
+    # The alert route is the one app.py used to rebuild on every rerun
+    legacy = []
+    for a, b in zip(ALERT_ROUTE_WAYPOINTS[:-1], ALERT_ROUTE_WAYPOINTS[1:]):
+        legacy.extend(list(zip(np.linspace(a[0], b[0], 6), np.linspace(a[1], b[1], 6)))[:-1])
+    legacy.append(ALERT_ROUTE_WAYPOINTS[-1])
+    print("alert route matches the per-rerun construction:", np.allclose(library[ALERT_ROUTE_ID].points, legacy))
+
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        library[ALERT_ROUTE_ID]
+    print(f"lookup: {(time.perf_counter() - t0) / n * 1e9:.0f} ns")
@@ -0,0 +1,119 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from utils.geo import haversine_km
+from utils.journey import JourneyPlan
+
+
+class ZoneEntry(NamedTuple):
+    zone: int             # ZoneTable row
+    distance_km: float    # still to drive until the entry
+    seconds: float        # still to drive until the entry
+
+
+class RouteMetrics(NamedTuple):
+    """
+    Distance and time profile of a route at the recommended speeds.
+
+    ``cum_km`` / ``eta_s`` have one entry per route point; ``entry_*`` list
+    every zone entry (crossing of radius_km) in route order, so the next one
+    from any position is a binary search.
+    """
+    cum_km: np.ndarray
+    eta_s: np.ndarray
+    entry_km: np.ndarray
+    entry_s: np.ndarray
+    entry_zone: np.ndarray
+
+    @property
+    def length_km(self) -> float:
+        return float(self.cum_km[-1]) if len(self.cum_km) else 0.0
+
+    @property
+    def travel_s(self) -> float:
+        return float(self.eta_s[-1]) if len(self.eta_s) else 0.0
+
+    @classmethod
+    def from_plan(cls, plan: JourneyPlan) -> "RouteMetrics":
+        """Per-point ETAs from a journey timetable (time is piecewise linear in distance there)."""
+        entries = [e for e in plan.events if e.kind == 'enter']
+        return cls(
+            cum_km=plan.cum_km,
+            eta_s=np.interp(plan.cum_km, plan.bp_km, plan.bp_s),
+            entry_km=np.array([e.distance_km for e in entries], dtype=np.float64),
+            entry_s=np.array([e.time_s for e in entries], dtype=np.float64),
+            entry_zone=np.array([e.zone for e in entries], dtype=np.int32)
+        )
+
+    def time_at(self, distance_km: float) -> float:
+        """Seconds from departure to ``distance_km`` along the route."""
+        return float(np.interp(distance_km, self.cum_km, self.eta_s))
+
+    def next_entry(self, distance_km: float) -> Optional[ZoneEntry]:
+        """The first zone entry strictly ahead of ``distance_km``, or None; O(log n)."""
+        i = int(np.searchsorted(self.entry_km, distance_km, side='right'))
+        if i == len(self.entry_km):
+            return None
+        return ZoneEntry(int(self.entry_zone[i]), float(self.entry_km[i] - distance_km),
+                         float(self.entry_s[i] - self.time_at(distance_km)))
+
+    def next_entries(self, distances_km) -> ZoneEntry:
+        """
+        Vectorized :meth:`next_entry` for an array of positions. Rows with no
+        entry ahead get zone -1 and infinite distance and time.
+        """
+        d = np.asarray(distances_km, dtype=np.float64)
+        if not len(self.entry_km):
+            inf = np.full(d.shape, np.inf)
+            return ZoneEntry(np.full(d.shape, -1, dtype=np.int32), inf, inf.copy())
+        i = np.searchsorted(self.entry_km, d, side='right')
+        ahead = i < len(self.entry_km)
+        j = np.minimum(i, len(self.entry_km) - 1)
+        t = np.interp(d, self.cum_km, self.eta_s)
+        return ZoneEntry(np.where(ahead, self.entry_zone[j], -1),
+                         np.where(ahead, self.entry_km[j] - d, np.inf),
+                         np.where(ahead, self.entry_s[j] - t, np.inf))
+
+
+def route_metrics(points, zones, cruise_kmph: Optional[float] = None) -> RouteMetrics:
+    """
+    Cumulative distance, per-point ETA and zone entries of a route.
+
+    Args:
+        points: (N, 2) array or sequence of (latitude, longitude)
+        zones: utils.records.ZoneTable
+        cruise_kmph: Speed outside zones (default: utils.journey.CRUISE_SPEED_KMPH)
+
+    Returns:
+        RouteMetrics
+    """
+    kwargs = {} if cruise_kmph is None else {'cruise_kmph': cruise_kmph}
+    return RouteMetrics.from_plan(JourneyPlan.build(points, zones, **kwargs))
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.geo import densify_polyline
+    from utils.records import ZoneTable
+
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    waypoints = [(28.56, 80.55), (28.50, 80.70), (28.2833, 81.0167), (28.20, 81.15)]
+    route = densify_polyline(waypoints, step_km=0.05)
+    straight = float(haversine_km(*waypoints[0], *waypoints[-1]))
+
+    t0 = time.perf_counter()
+    metrics = route_metrics(route, table)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"{len(route):,} points: {metrics.length_km:.1f} km along the route (straight line {straight:.1f} km), "
+          f"{metrics.travel_s / 60:.0f} min at recommended speeds, built in {build_ms:.1f} ms")
+
+    positions = np.random.default_rng(0).uniform(0, metrics.length_km, 1_000_000)
+    t0 = time.perf_counter()
+    ahead = metrics.next_entries(positions)
+    print(f"next zone entry for 1,000,000 positions in {(time.perf_counter() - t0) * 1e3:.0f} ms")
+    for km in (0.0, 30.0, 60.0):
+        entry = metrics.next_entry(km)
+        print(f"  at {km:4.1f} km: " + (f"{table.names[entry.zone]} in {entry.distance_km:.1f} km / "
+                                      f"{entry.seconds / 60:.1f} min" if entry else "no zone ahead"))
@@ -0,0 +1,167 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Web Mercator ground resolution at the equator for zoom level 0 (metres per pixel)
+METERS_PER_PIXEL_Z0 = 156543.03392
+EARTH_RADIUS_M = 6371008.8
+
+_CACHE_SIZE = 256
+_cache: "OrderedDict[Tuple[str, int, float], Tuple[Tuple[float, float], ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def route_hash(route_points: Sequence[Tuple[float, float]]) -> str:
+    """
+    Hash a route's coordinates so simplified versions can be cached.
+
+    Args:
+        route_points: Sequence of (latitude, longitude) tuples
+
+    Returns:
+        Hex digest identifying the exact geometry
+    """
+    coords = np.ascontiguousarray(route_points, dtype=np.float64)
+    return hashlib.blake2b(coords.tobytes(), digest_size=16).hexdigest()
+
+
+def zoom_tolerance_m(zoom: int, latitude: float, pixel_tolerance: float = 1.0) -> float:
+    """
+    Convert an on-screen tolerance in pixels to metres for a given zoom level.
+
+    Args:
+        zoom: Leaflet/Web Mercator zoom level
+        latitude: Latitude the tolerance applies at (Mercator scale varies with latitude)
+        pixel_tolerance: Allowed deviation from the original line in screen pixels
+
+    Returns:
+        Tolerance in metres
+    """
+    meters_per_pixel = METERS_PER_PIXEL_Z0 * np.cos(np.radians(latitude)) / (2 ** zoom)
+    return float(pixel_tolerance * meters_per_pixel)
+
+
+def _project_local(coords: np.ndarray) -> np.ndarray:
+    """Project (lat, lon) degrees to a local equirectangular plane in metres."""
+    lat0 = np.radians(coords[:, 0].mean())
+    x = np.radians(coords[:, 1]) * np.cos(lat0) * EARTH_RADIUS_M
+    y = np.radians(coords[:, 0]) * EARTH_RADIUS_M
+    return np.column_stack((x, y))
+
+
+def douglas_peucker_mask(xy: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification on planar coordinates.
+
+    Each split evaluates the distances of a whole span in one NumPy pass, so the
+    Python-level work is proportional to the number of vertices kept, not the
+    number of input vertices.
+
+    Args:
+        xy: (N, 2) array of planar coordinates
+        tolerance: Maximum allowed perpendicular deviation, in the units of ``xy``
+
+    Returns:
+        Boolean mask of the vertices to keep (first and last are always kept)
+    """
+    n = len(xy)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    if n < 3:
+        return keep
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        a = xy[start]
+        seg = xy[end] - a
+        pts = xy[start + 1:end] - a
+        seg_len_sq = float(seg @ seg)
+
+        if seg_len_sq == 0.0:
+            dist = np.hypot(pts[:, 0], pts[:, 1])
+        else:
+            # Distance to the segment (not the infinite line) so loops are preserved
+            t = np.clip((pts @ seg) / seg_len_sq, 0.0, 1.0)
+            proj = np.outer(t, seg)
+            dist = np.hypot(pts[:, 0] - proj[:, 0], pts[:, 1] - proj[:, 1])
+
+        idx = int(np.argmax(dist))
+        if dist[idx] > tolerance:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
+
+
+def simplify_route(route_points: Sequence[Tuple[float, float]], zoom: int,
+                   pixel_tolerance: float = 1.0) -> Tuple[Tuple[float, float], ...]:
+    """
+    Simplify a route for display at a given map zoom level.
+
+    Only use the result for rendering; risk computation should keep working on the
+    full-resolution route. Results are cached per (route hash, zoom) and shared
+    across sessions, hence returned as an immutable tuple.
+
+    Args:
+        route_points: Sequence of (latitude, longitude) tuples
+        zoom: Map zoom level the line will be drawn at
+        pixel_tolerance: Allowed on-screen deviation in pixels (default: 1px)
+
+    Returns:
+        Tuple of (latitude, longitude) tuples with redundant vertices removed
+    """
+    if route_points is None or len(route_points) < 3:
+        return tuple(tuple(p) for p in route_points) if route_points is not None else ()
+
+    key = (route_hash(route_points), int(zoom), float(pixel_tolerance))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    coords = np.asarray(route_points, dtype=np.float64)
+    tolerance = zoom_tolerance_m(zoom, float(coords[:, 0].mean()), pixel_tolerance)
+    mask = douglas_peucker_mask(_project_local(coords), tolerance)
+    simplified = tuple((float(lat), float(lon)) for lat, lon in coords[mask])
+
+    with _cache_lock:
+        _cache[key] = simplified
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return simplified
+
+
+# Map zoom bands [min, max) the route is drawn for, each simplified for its most detailed zoom
+ZOOM_BANDS: Tuple[Tuple[int, int], ...] = ((0, 8), (8, 10), (10, 12), (12, 14), (14, 19))
+
+
+def zoom_band(zoom: int, bands=ZOOM_BANDS) -> Tuple[int, int]:
+    """The [min, max) band holding ``zoom``, clamped to the first and last band."""
+    for lo, hi in bands:
+        if zoom < hi:
+            return (lo, hi) if zoom >= lo else bands[0]
+    return bands[-1]
+
+
+def simplify_for_zoom(route_points: Sequence[Tuple[float, float]], zoom: int, bands=ZOOM_BANDS,
+                      pixel_tolerance: float = 1.0) -> Tuple[Tuple[float, float], ...]:
+    """
+    The route as drawn at ``zoom``: simplified at the highest zoom of its band,
+    so it stays within ``pixel_tolerance`` at every zoom in the band and the
+    line only has to be resent when the map leaves the band.
+    """
+    _, hi = zoom_band(int(zoom), bands)
+    return simplify_route(route_points, hi - 1, pixel_tolerance)
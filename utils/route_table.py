@@ -0,0 +1,246 @@
+from typing import Any, Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from utils.geo import EARTH_RADIUS_KM, haversine_km
+from utils.records import SPECIES_NAMES
+from utils.species import SPEED_BANDS_KM, speed_lookup_table
+
+# Risk bands as in check_animal_zones, stored as uint8 codes
+RISK_LEVELS: Tuple[str, ...] = ('CLEAR', 'MEDIUM', 'HIGH', 'CRITICAL')
+CLEAR, MEDIUM, HIGH, CRITICAL = range(4)
+# check_animal_zones: HIGH within this distance of a zone's edge, MEDIUM beyond
+HIGH_MARGIN_KM = 2.0
+# Speed reported where no zone is in alert range; matches utils.alternatives
+CRUISE_SPEED_KMPH = 60.0
+# Points per block: keeps the (points x zones) temporaries to a few MB each
+CHUNK_POINTS = 65536
+
+
+class RouteTable(NamedTuple):
+    """
+    Per-point risk profile of a route, one array per column.
+
+    ``zone`` and ``distance_km`` describe the nearest zone centre; ``risk``
+    is the most severe band over all zones and ``speed_kmph`` the lowest
+    recommended speed over the zones in alert range (cruise speed elsewhere).
+    """
+    lat: np.ndarray             # float64
+    lon: np.ndarray             # float64
+    zone: np.ndarray            # int32 ZoneTable row, -1 when there are no zones
+    distance_km: np.ndarray     # float32
+    risk: np.ndarray            # uint8 index into RISK_LEVELS
+    speed_kmph: np.ndarray      # float32
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def risk_labels(self) -> np.ndarray:
+        return np.asarray(RISK_LEVELS, dtype=object)[self.risk]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts per risk band, the lowest speed and the zones that raise an alert."""
+        counts = np.bincount(self.risk, minlength=len(RISK_LEVELS))
+        alerting = np.unique(self.zone[self.risk > CLEAR])
+        return {
+            'points': len(self),
+            'risk_points': {level: int(n) for level, n in zip(RISK_LEVELS, counts)},
+            'min_speed_kmph': float(self.speed_kmph.min()) if len(self) else CRUISE_SPEED_KMPH,
+            'alert_zones': alerting[alerting >= 0].tolist()
+        }
+
+    def to_dataframe(self, zones=None):
+        """Columns as a DataFrame for exports; zone names and risk labels when ``zones`` is given."""
+        import pandas as pd
+        df = pd.DataFrame({
+            'lat': self.lat, 'lon': self.lon, 'zone': self.zone, 'distance_km': self.distance_km,
+            'risk_level': self.risk_labels(), 'recommended_speed': self.speed_kmph
+        })
+        if zones is not None:
+            names = np.asarray(zones.names + ('',), dtype=object)
+            df.insert(2, 'zone_name', names[self.zone])
+        return df
+
+
+def score_points(points, zones, threshold_km: float = 3.0, cruise_kmph: float = CRUISE_SPEED_KMPH,
+                 chunk: int = CHUNK_POINTS) -> RouteTable:
+    """
+    Score every point of a route against the zone catalogue in one vectorized pass.
+
+    Args:
+        points: (N, 2) array or sequence of (latitude, longitude)
+        zones: utils.records.ZoneTable
+        threshold_km: Alert range beyond radius_km ("Alert Range (km)" slider)
+        cruise_kmph: Speed reported where no zone is in range
+        chunk: Points per block
+
+    Returns:
+        RouteTable with N rows
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    out_zone = np.full(n, -1, dtype=np.int32)
+    out_dist = np.full(n, np.inf, dtype=np.float32)
+    out_risk = np.zeros(n, dtype=np.uint8)
+    out_speed = np.full(n, cruise_kmph, dtype=np.float32)
+    if not len(zones) or not n:
+        return RouteTable(coords[:, 0], coords[:, 1], out_zone, out_dist, out_risk, out_speed)
+
+    z_lat = zones.records['lat'].astype(np.float64)
+    z_lon = zones.records['lon'].astype(np.float64)
+    radius = zones.records['radius_km'].astype(np.float64)
+    alert_reach = radius + threshold_km
+    high_reach = radius + min(HIGH_MARGIN_KM, threshold_km)
+    # (zones, bands) speeds, so a point's speed is one fancy-index per zone
+    zone_speeds = speed_lookup_table(SPECIES_NAMES)[zones.records['species']]
+    zone_idx = np.arange(len(zones))
+    bands = np.asarray(SPEED_BANDS_KM)
+
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        dist = haversine_km(coords[start:stop, 0, None], coords[start:stop, 1, None], z_lat, z_lon)
+
+        nearest = dist.argmin(axis=1)
+        out_zone[start:stop] = nearest
+        out_dist[start:stop] = dist[np.arange(stop - start), nearest]
+
+        in_range = dist <= alert_reach
+        risk = np.where(dist <= radius, CRITICAL,
+                        np.where(dist <= high_reach, HIGH, MEDIUM))
+        out_risk[start:stop] = np.where(in_range, risk, CLEAR).max(axis=1)
+
+        speed = zone_speeds[zone_idx, np.searchsorted(bands, dist, side='right')]
+        out_speed[start:stop] = np.minimum(np.where(in_range, speed, cruise_kmph).min(axis=1), cruise_kmph)
+
+    return RouteTable(coords[:, 0], coords[:, 1], out_zone, out_dist, out_risk, out_speed)
+
+
+class ApproachMargins(NamedTuple):
+    """
+    How close a route comes to each zone, sorted so any alert range is a slice.
+
+    ``margin_km`` is the closest approach to the zone centre minus radius_km
+    (<= 0: the route enters the zone). A zone raises an alert somewhere on the
+    route at range T exactly when its margin is <= T, so the alerting zones for
+    T are ``zone[:searchsorted(margin_km, T, 'right')]``.
+    """
+    zone: np.ndarray              # int32 ZoneTable rows, ascending margin
+    min_distance_km: np.ndarray   # float64 closest approach to the zone centre
+    margin_km: np.ndarray         # float64 ascending
+
+    def count_within(self, threshold_km: float) -> int:
+        return int(np.searchsorted(self.margin_km, threshold_km, side='right'))
+
+    def zones_within(self, threshold_km: float) -> np.ndarray:
+        """Zones that alert somewhere on the route at this alert range, closest first."""
+        return self.zone[:self.count_within(threshold_km)]
+
+    def preview(self, thresholds_km) -> np.ndarray:
+        """Number of alerting zones for each of several alert ranges, in one search."""
+        return np.searchsorted(self.margin_km, np.asarray(thresholds_km, dtype=np.float64), side='right')
+
+
+def approach_margins(points, zones, chunk: int = CHUNK_POINTS) -> ApproachMargins:
+    """
+    Closest approach of a route polyline to every zone centre.
+
+    Point-to-segment distances are taken in a local plane around each zone
+    centre, the same geometry utils.journey uses for ring crossings, so a
+    zone's margin is <= T exactly when the journey has an 'approach' event at T.
+
+    Args:
+        points: (N, 2) array or sequence of (latitude, longitude)
+        zones: utils.records.ZoneTable
+        chunk: Segments per block
+
+    Returns:
+        ApproachMargins over all zones
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    z_lat = zones.records['lat'].astype(np.float64)
+    z_lon = zones.records['lon'].astype(np.float64)
+    radius = zones.records['radius_km'].astype(np.float64)
+    if not len(coords):
+        empty = np.empty(0)
+        return ApproachMargins(np.empty(0, dtype=np.int32), empty, empty)
+    if len(coords) == 1:
+        coords = np.vstack((coords, coords))
+
+    km_per_deg = np.radians(EARTH_RADIUS_KM)
+    kx = km_per_deg * np.cos(np.radians(z_lat))
+    best = np.full(len(z_lat), np.inf)
+    for start in range(0, len(coords) - 1, chunk):
+        a = coords[start:start + chunk]
+        b = coords[start + 1:start + chunk + 1]
+        a = a[:len(b)]
+        ax = (a[:, 1, None] - z_lon) * kx
+        ay = (a[:, 0, None] - z_lat) * km_per_deg
+        dx = (b[:, 1, None] - a[:, 1, None]) * kx
+        dy = (b[:, 0, None] - a[:, 0, None]) * km_per_deg
+        length2 = dx * dx + dy * dy
+        t = np.clip(-(ax * dx + ay * dy) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+        dist = np.hypot(ax + t * dx, ay + t * dy)
+        best = np.minimum(best, dist.min(axis=0))
+
+    margin = best - radius
+    order = np.argsort(margin, kind='stable')
+    return ApproachMargins(order.astype(np.int32), best[order], margin[order])
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from utils.records import ZoneTable
+    from utils.species import get_recommended_speed
+
+    table = ZoneTable.from_dataframe(pd.read_csv('data/animal_zones.csv'))
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    # Points clustered around the zones so every band is well represented
+    centres = rng.integers(0, len(table), n)
+    pts = np.column_stack((table.records['lat'][centres] + rng.normal(0, 0.06, n),
+                           table.records['lon'][centres] + rng.normal(0, 0.06, n)))
+
+    t0 = time.perf_counter()
+    result = score_points(pts, table, threshold_km=3.0)
+    print(f"{n:,} points x {len(table)} zones in {time.perf_counter() - t0:.2f} s: {result.summary()['risk_points']}")
+
+    # Cross-check against the per-point check_animal_zones / get_recommended_speed logic
+    mismatches = 0
+    for i in range(5000):
+        lat, lon = pts[i]
+        worst, speed = CLEAR, CRUISE_SPEED_KMPH
+        for z in range(len(table)):
+            d = float(haversine_km(lat, lon, table.records['lat'][z], table.records['lon'][z]))
+            r = float(table.records['radius_km'][z])
+            if d <= r:
+                level = CRITICAL
+            elif d <= r + 3.0:
+                level = HIGH if d <= r + 2 else MEDIUM
+            else:
+                continue
+            worst = max(worst, level)
+            speed = min(speed, get_recommended_speed(table.species(z), d))
+        mismatches += (worst != result.risk[i]) or (speed != result.speed_kmph[i])
+    print(f"per-point reference on 5,000 points: {mismatches} mismatches")
+
+    # Alert range slider: one margin pass per route, then every range is a binary search
+    from utils.geo import densify_polyline
+    waypoints = [(28.56, 80.55), (28.50, 80.70), (28.2833, 81.0167), (28.20, 81.15)]
+    t0 = time.perf_counter()
+    margins = approach_margins(waypoints, table)
+    margins_us = (time.perf_counter() - t0) * 1e6
+    t0 = time.perf_counter()
+    counts = margins.preview(np.arange(1, 11))
+    preview_us = (time.perf_counter() - t0) * 1e6
+    print(f"approach margins in {margins_us:.0f} us, alerting zones at 1..10 km {counts.tolist()} "
+          f"in {preview_us:.0f} us")
+
+    # Reference: closest of 10 m samples along the route, per zone
+    dense = densify_polyline(waypoints, step_km=0.01)
+    closest = haversine_km(dense[:, 0, None], dense[:, 1, None],
+                           table.records['lat'], table.records['lon']).min(axis=0)
+    reference = np.asarray(closest - table.records['radius_km'])[margins.zone]
+    near = margins.margin_km <= 10.0
+    print(f"zones within slider reach: {near.sum()}, largest gap to the {len(dense):,}-sample reference "
+          f"{np.abs(reference - margins.margin_km)[near].max() * 1e3:.1f} m")
@@ -0,0 +1,457 @@
+import csv
+import heapq
+import math
+import sys
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.geo import densify_polyline, haversine_km
+from utils.risk_raster import catalogue_hash
+from utils.species import SPECIES_SPEED_KMPH, DEFAULT_SPEED_KMPH, recommended_speed_array, species_risk_weight
+
+# Zone buffer (km beyond radius_km) inside which a road counts as exposed;
+# matches the HIGH band used by check_animal_zones.
+RISK_BUFFER_KM = 2.0
+# Spacing of the sample points used to measure exposure along each edge
+RISK_SAMPLE_KM = 0.5
+# Farthest an endpoint may be from the network and still be snapped to it
+MAX_SNAP_KM = 25.0
+# Landmarks for the A* lower bound (see prepare_landmarks); more tighten it, each costs two searches
+LANDMARK_COUNT = 8
+# Landmark distances are stored as float32; bounds are lowered by this much (minutes) to stay admissible
+_LANDMARK_SLACK_MIN = 1e-3
+
+
+class RouteResult(NamedTuple):
+    points: np.ndarray        # (M, 2) densified (lat, lon) polyline
+    nodes: List[int]          # graph nodes visited, in order
+    length_km: float
+    travel_minutes: float
+    risk_minutes: float
+
+
+class RoadGraph:
+    """
+    Road network stored as a compressed sparse row (CSR) adjacency array.
+
+    Outgoing edges of node ``u`` are ``indices[indptr[u]:indptr[u + 1]]`` with
+    per-edge ``length_km``, ``speed_kmph`` and ``risk_minutes`` in the same slots.
+
+    Optional landmark tables (:meth:`prepare_landmarks`) hold the travel
+    minutes from and to a few peripheral nodes; by the triangle inequality they
+    give A* a far tighter lower bound than straight-line distance.
+    """
+
+    def __init__(self, node_lat, node_lon, indptr, indices, length_km, speed_kmph, risk_minutes=None,
+                 landmark_from=None, landmark_to=None, source_hash: str = ""):
+        self.node_lat = np.asarray(node_lat, dtype=np.float64)
+        self.node_lon = np.asarray(node_lon, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.length_km = np.asarray(length_km, dtype=np.float32)
+        self.speed_kmph = np.asarray(speed_kmph, dtype=np.float32)
+        if risk_minutes is None:
+            risk_minutes = np.zeros(len(self.indices), dtype=np.float32)
+        self.risk_minutes = np.asarray(risk_minutes, dtype=np.float32)
+        # (landmarks, nodes) travel minutes from each landmark / to each landmark, or None
+        self.landmark_from = None if landmark_from is None else np.asarray(landmark_from, dtype=np.float32)
+        self.landmark_to = None if landmark_to is None else np.asarray(landmark_to, dtype=np.float32)
+        # catalogue_hash of the zones risk_minutes was computed from ("" = none applied)
+        self.source_hash = source_hash
+        self._lists = None
+        self._cost_cache = {}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_lat)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    # ------------------------------------------------------------------
+    # Construction and persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_edges(cls, edges: List[Tuple[float, float, float, float, float, bool]],
+                   precision: int = 5) -> "RoadGraph":
+        """
+        Build a graph from (from_lat, from_lon, to_lat, to_lon, speed_kmph, oneway) tuples.
+        Endpoints that agree to ``precision`` decimal places become the same node.
+        """
+        table = np.asarray([e[:5] for e in edges], dtype=np.float64).reshape(-1, 5)
+        oneway = np.asarray([bool(e[5]) for e in edges], dtype=bool)
+        ends = np.vstack((table[:, 0:2], table[:, 2:4]))
+        _, first, inverse = np.unique(np.round(ends, precision), axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        lats, lons = ends[first, 0], ends[first, 1]
+        u, v = inverse[:len(table)], inverse[len(table):]
+        speeds = table[:, 4]
+
+        valid = u != v
+        u, v, speeds, oneway = u[valid], v[valid], speeds[valid], oneway[valid]
+        both = ~oneway
+        src = np.concatenate((u, v[both])).astype(np.int64)
+        dst = np.concatenate((v, u[both])).astype(np.int32)
+        speeds = np.concatenate((speeds, speeds[both])).astype(np.float32)
+
+        order = np.argsort(src, kind='stable')
+        src, dst, speeds = src[order], dst[order], speeds[order]
+        indptr = np.zeros(len(lats) + 1, dtype=np.int64)
+        np.add.at(indptr, src + 1, 1)
+        indptr = np.cumsum(indptr)
+        length = haversine_km(lats[src], lons[src], lats[dst], lons[dst]).astype(np.float32)
+        return cls(lats, lons, indptr, dst, length, speeds)
+
+    @classmethod
+    def from_edges_csv(cls, path: str) -> "RoadGraph":
+        """
+        Load a road edge list with columns
+        ``from_lat,from_lon,to_lat,to_lon,speed_kmph[,oneway]``.
+
+        OSM extracts can be exported to this format (one row per way segment)
+        and then saved as a compact ``.npz`` with :meth:`save`.
+        """
+        edges = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                edges.append((
+                    float(row['from_lat']), float(row['from_lon']),
+                    float(row['to_lat']), float(row['to_lon']),
+                    float(row.get('speed_kmph') or 50),
+                    str(row.get('oneway', '')).strip().lower() in ('1', 'true', 'yes')
+                ))
+        return cls.from_edges(edges)
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        """Load a graph previously written with :meth:`save`."""
+        with np.load(path) as data:
+            landmarks = (data['landmark_from'], data['landmark_to']) if 'landmark_from' in data else (None, None)
+            source_hash = str(data['source_hash']) if 'source_hash' in data else ""
+            return cls(data['node_lat'], data['node_lon'], data['indptr'], data['indices'],
+                       data['length_km'], data['speed_kmph'], data['risk_minutes'], *landmarks,
+                       source_hash=source_hash)
+
+    def save(self, path: str):
+        """Write the CSR arrays (and landmark tables, if prepared) to a compressed ``.npz`` file."""
+        extra = {}
+        if self.landmark_from is not None:
+            extra = {'landmark_from': self.landmark_from, 'landmark_to': self.landmark_to}
+        np.savez_compressed(path, node_lat=self.node_lat, node_lon=self.node_lon,
+                            indptr=self.indptr, indices=self.indices, length_km=self.length_km,
+                            speed_kmph=self.speed_kmph, risk_minutes=self.risk_minutes,
+                            source_hash=np.array(self.source_hash), **extra)
+
+    # ------------------------------------------------------------------
+    # Wildlife risk
+    # ------------------------------------------------------------------
+    def apply_zone_risk(self, zones_df, buffer_km: float = RISK_BUFFER_KM,
+                        sample_km: float = RISK_SAMPLE_KM, chunk: int = 200_000):
+        """
+        Set each edge's risk penalty from the zone catalogue.
+
+        The penalty is the time spent within ``radius_km + buffer_km`` of a zone,
+        driving at the recommended speed, multiplied by the species risk weight.
+        The catalogue's fingerprint is kept in ``source_hash`` so a saved graph
+        can be checked against the current zones.
+
+        Args:
+            zones_df: DataFrame with lat, lon, radius_km and species columns
+            buffer_km: Extra distance beyond radius_km that still counts as exposed
+            sample_km: Spacing of sample points along each edge
+            chunk: Number of sample points evaluated per vectorized batch
+        """
+        risk = np.zeros(self.num_edges, dtype=np.float64)
+        if zones_df is None or len(zones_df) == 0 or self.num_edges == 0:
+            self.risk_minutes = risk.astype(np.float32)
+            self.source_hash = catalogue_hash(zones_df) if zones_df is not None else ""
+            self._cost_cache.clear()
+            return
+
+        zone_lat = zones_df['lat'].to_numpy(dtype=np.float64)
+        zone_lon = zones_df['lon'].to_numpy(dtype=np.float64)
+        zone_reach = zones_df['radius_km'].to_numpy(dtype=np.float64) + buffer_km
+        zone_base = np.array([SPECIES_SPEED_KMPH.get(s, DEFAULT_SPEED_KMPH) for s in zones_df['species']],
+                             dtype=np.float64)
+        zone_weight = np.array([species_risk_weight(s) for s in zones_df['species']], dtype=np.float64)
+
+        src = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        dst = self.indices.astype(np.int64)
+        samples = np.maximum(np.ceil(self.length_km / sample_km).astype(np.int64), 1)
+        edge_of = np.repeat(np.arange(self.num_edges), samples)
+        starts = np.cumsum(samples) - samples
+        # Midpoint of each sub-segment
+        frac = (np.arange(samples.sum()) - np.repeat(starts, samples) + 0.5) / np.repeat(samples, samples)
+        sub_len = (self.length_km / samples)[edge_of].astype(np.float64)
+
+        for lo in range(0, len(edge_of), chunk):
+            e = edge_of[lo:lo + chunk]
+            f = frac[lo:lo + chunk]
+            lat = self.node_lat[src[e]] + (self.node_lat[dst[e]] - self.node_lat[src[e]]) * f
+            lon = self.node_lon[src[e]] + (self.node_lon[dst[e]] - self.node_lon[src[e]]) * f
+            dist = haversine_km(lat[:, None], lon[:, None], zone_lat[None, :], zone_lon[None, :])
+            exposed = dist <= zone_reach[None, :]
+            if not exposed.any():
+                continue
+            speed = recommended_speed_array(np.broadcast_to(zone_base, dist.shape), dist)
+            minutes = np.where(exposed, sub_len[lo:lo + chunk, None] * 60.0 / speed * zone_weight[None, :], 0.0)
+            np.add.at(risk, e, minutes.max(axis=1))
+
+        self.risk_minutes = risk.astype(np.float32)
+        self.source_hash = catalogue_hash(zones_df)
+        self._cost_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Landmarks
+    # ------------------------------------------------------------------
+    def _travel_minutes(self) -> np.ndarray:
+        return self.length_km.astype(np.float64) * 60.0 / np.maximum(self.speed_kmph, 1.0)
+
+    def _reverse(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR of the reversed graph: (indptr, indices, edge index in the forward arrays)."""
+        src = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.add.at(indptr, self.indices.astype(np.int64) + 1, 1)
+        return np.cumsum(indptr), src[order], order
+
+    def prepare_landmarks(self, count: int = LANDMARK_COUNT):
+        """
+        Pick ``count`` landmarks and store travel minutes from and to each of them.
+
+        Landmarks are chosen farthest-first (each maximises its travel time from
+        the ones before), which puts them on the edge of the network where the
+        bounds are tightest. Travel time alone is a lower bound on every query
+        cost, since risk penalties add to it and edge_penalty multipliers are >= 1.
+        """
+        if self.num_nodes == 0:
+            return
+        travel = self._travel_minutes().tolist()
+        forward = (self.indptr.tolist(), self.indices.tolist(), travel)
+        rev_indptr, rev_indices, rev_edge = self._reverse()
+        backward = (rev_indptr.tolist(), rev_indices.tolist(), [travel[e] for e in rev_edge.tolist()])
+
+        # Start from the node farthest from the network's first node, as the crow flies
+        landmark = int(np.argmax(haversine_km(self.node_lat[0], self.node_lon[0], self.node_lat, self.node_lon)))
+        from_rows, to_rows = [], []
+        nearest = np.full(self.num_nodes, np.inf)
+        for _ in range(min(count, self.num_nodes)):
+            from_rows.append(_dijkstra_all(*forward, landmark))
+            to_rows.append(_dijkstra_all(*backward, landmark))
+            nearest = np.minimum(nearest, np.where(np.isfinite(from_rows[-1]), from_rows[-1], -1.0))
+            landmark = int(np.argmax(nearest))
+        self.landmark_from = np.array(from_rows, dtype=np.float32)
+        self.landmark_to = np.array(to_rows, dtype=np.float32)
+
+    def _landmark_bound(self, target: int) -> np.ndarray:
+        """Lower bound on travel minutes from every node to ``target`` (triangle inequality)."""
+        with np.errstate(invalid='ignore'):
+            # d(v, t) >= d(L, t) - d(L, v)  and  d(v, t) >= d(v, L) - d(t, L)
+            bound = np.maximum((self.landmark_from[:, target, None] - self.landmark_from).max(axis=0),
+                               (self.landmark_to - self.landmark_to[:, target, None]).max(axis=0))
+        # inf - inf: neither node is connected to that landmark, which bounds nothing
+        return np.maximum(np.where(np.isnan(bound), 0.0, bound) - _LANDMARK_SLACK_MIN, 0.0)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def nearest_node(self, lat: float, lon: float, max_km: float = MAX_SNAP_KM) -> Optional[int]:
+        """Index of the graph node closest to a coordinate, or None if none is within ``max_km``."""
+        if self.num_nodes == 0:
+            return None
+        dist = haversine_km(lat, lon, self.node_lat, self.node_lon)
+        node = int(np.argmin(dist))
+        return node if dist[node] <= max_km else None
+
+    def _adjacency(self):
+        # Plain lists are several times faster than NumPy scalars in the search loop
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist())
+        return self._lists
+
+    def _edge_costs(self, risk_weight: float) -> List[float]:
+        costs = self._cost_cache.get(risk_weight)
+        if costs is None:
+            costs = (self._travel_minutes() + risk_weight * self.risk_minutes).tolist()
+            self._cost_cache[risk_weight] = costs
+        return costs
+
+    def shortest_path(self, source: int, target: int, risk_weight: float = 1.0,
+                      edge_penalty: Optional[dict] = None) -> Optional[List[int]]:
+        """
+        A* search minimising travel minutes plus ``risk_weight`` x risk minutes.
+
+        The heuristic is the landmark bound when :meth:`prepare_landmarks` has
+        run, otherwise straight-line distance at the network's top speed. Both
+        bound travel time alone, so they never overestimate: risk penalties are
+        non-negative and ``edge_penalty`` multipliers must be at least 1.
+
+        Args:
+            source: Start node index
+            target: Goal node index
+            risk_weight: How many minutes one minute of wildlife exposure is worth
+            edge_penalty: Optional {edge index: extra cost multiplier} used to steer
+                the search away from previously found routes
+
+        Returns:
+            List of node indices from source to target, or None if unreachable
+        """
+        if source == target:
+            return [source]
+
+        indptr, indices = self._adjacency()
+        cost = self._edge_costs(risk_weight)
+        # One vectorized pass is far cheaper than per-node work in the loop
+        if self.landmark_from is not None:
+            heuristic = self._landmark_bound(target).tolist()
+        else:
+            max_speed = float(self.speed_kmph.max()) if self.num_edges else 1.0
+            heuristic = (haversine_km(self.node_lat[target], self.node_lon[target], self.node_lat, self.node_lon)
+                         * (60.0 / max_speed)).tolist()
+
+        inf = math.inf
+        best = [inf] * self.num_nodes
+        parent = [-1] * self.num_nodes
+        best[source] = 0.0
+        heap = [(heuristic[source], 0.0, source)]
+        push, pop = heapq.heappush, heapq.heappop
+
+        while heap:
+            _, g, u = pop(heap)
+            if u == target:
+                break
+            if g > best[u]:
+                continue
+            for e in range(indptr[u], indptr[u + 1]):
+                v = indices[e]
+                step = cost[e]
+                if edge_penalty is not None and e in edge_penalty:
+                    step *= edge_penalty[e]
+                nd = g + step
+                if nd < best[v]:
+                    best[v] = nd
+                    parent[v] = u
+                    push(heap, (nd + heuristic[v], nd, v))
+        else:
+            return None
+
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def edges_on_path(self, nodes: List[int]) -> np.ndarray:
+        """Edge indices traversed by a node path."""
+        edges = []
+        for u, v in zip(nodes[:-1], nodes[1:]):
+            lo, hi = self.indptr[u], self.indptr[u + 1]
+            candidates = np.nonzero(self.indices[lo:hi] == v)[0]
+            edges.append(lo + int(candidates[0]))
+        return np.asarray(edges, dtype=np.int64)
+
+    def route(self, start: Tuple[float, float], end: Tuple[float, float], risk_weight: float = 1.0,
+              step_km: float = 1.0, edge_penalty: Optional[dict] = None,
+              max_snap_km: float = MAX_SNAP_KM) -> Optional[RouteResult]:
+        """
+        Point-to-point route between two coordinates along the road network.
+
+        Args:
+            start: (latitude, longitude) of the origin
+            end: (latitude, longitude) of the destination
+            risk_weight: Weight of the wildlife-risk penalty (0 = fastest route)
+            step_km: Spacing of the returned route points
+            edge_penalty: Optional {edge index: cost multiplier}, see :meth:`shortest_path`
+            max_snap_km: Farthest an endpoint may be from its snapped node
+
+        Returns:
+            RouteResult, or None when an endpoint is off the network or the endpoints are not connected
+        """
+        source = self.nearest_node(*start, max_km=max_snap_km)
+        target = self.nearest_node(*end, max_km=max_snap_km)
+        if source is None or target is None:
+            return None
+        nodes = self.shortest_path(source, target, risk_weight, edge_penalty)
+        if nodes is None:
+            return None
+
+        edges = self.edges_on_path(nodes)
+        vertices = [tuple(start)] + [(self.node_lat[n], self.node_lon[n]) for n in nodes] + [tuple(end)]
+        points = densify_polyline(vertices, step_km)
+        # Drop zero-length hops where the endpoint coincides with its snapped node
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+        points = points[keep]
+
+        length = float(haversine_km(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1]).sum())
+        travel = float((self.length_km[edges].astype(np.float64) * 60.0 / self.speed_kmph[edges]).sum())
+        risk = float(self.risk_minutes[edges].sum())
+        return RouteResult(points, nodes, length, travel, risk)
+
+
+def _dijkstra_all(indptr: List[int], indices: List[int], cost: List[float], source: int) -> List[float]:
+    """Travel cost from ``source`` to every node (inf where unreachable)."""
+    dist = [math.inf] * (len(indptr) - 1)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    push, pop = heapq.heappush, heapq.heappop
+    while heap:
+        d, u = pop(heap)
+        if d > dist[u]:
+            continue
+        for e in range(indptr[u], indptr[u + 1]):
+            nd = d + cost[e]
+            v = indices[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                push(heap, (nd, v))
+    return dist
+
+
+def _benchmark(size: int = 400):
+    """Time point-to-point queries on a synthetic grid spanning Uttar Pradesh."""
+    import time
+    rng = np.random.default_rng(0)
+    lats = np.linspace(24.0, 30.2, size)
+    lons = np.linspace(77.2, 84.5, size)
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            speed = float(rng.choice([40, 60, 80]))
+            if i + 1 < size:
+                edges.append((lats[i], lons[j], lats[i + 1], lons[j], speed, False))
+            if j + 1 < size:
+                edges.append((lats[i], lons[j], lats[i], lons[j + 1], speed, False))
+    t0 = time.perf_counter()
+    graph = RoadGraph.from_edges(edges)
+    print(f"Built {graph.num_nodes:,} nodes / {graph.num_edges:,} edges in {time.perf_counter() - t0:.2f}s")
+
+    queries = [((26.85, 80.95), (28.50, 80.70)), ((25.32, 82.97), (28.70, 79.90)), ((27.18, 78.01), (26.76, 83.37))]
+    plain = [graph.route(start, end, risk_weight=0.0) for start, end in queries]
+    t0 = time.perf_counter()
+    graph.prepare_landmarks()
+    print(f"{LANDMARK_COUNT} landmarks prepared in {time.perf_counter() - t0:.2f}s (offline, saved with the graph)")
+
+    for (start, end), reference in zip(queries, plain):
+        t0 = time.perf_counter()
+        result = graph.route(start, end, risk_weight=0.0)
+        elapsed = (time.perf_counter() - t0) * 1e3
+        print(f"{start} -> {end}: {result.length_km:.0f} km, {len(result.nodes)} nodes, {elapsed:.1f} ms "
+              f"({result.travel_minutes:.2f} min; straight-line A*: {reference.travel_minutes:.2f} min)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == 'build':
+        from utils.catalogue import load_zones
+        road_graph = RoadGraph.from_edges_csv(sys.argv[2])
+        # The same zones (and sample fallback) the app hashes in load_road_graph
+        road_graph.apply_zone_risk(load_zones())
+        road_graph.prepare_landmarks()
+        road_graph.save(sys.argv[3])
+        print(f"Saved {road_graph.num_nodes} nodes / {road_graph.num_edges} edges to {sys.argv[3]}")
+    elif len(sys.argv) == 2 and sys.argv[1] == 'bench':
+        _benchmark()
+    else:
+        print("Usage: python -m utils.routing build data/road_edges.csv data/road_graph.npz")
+        print("       python -m utils.routing bench")
@@ -0,0 +1,44 @@
+import threading
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar('T')
+
+# Process-wide resources shared by every Streamlit session (each session runs its
+# script in its own thread). Values must be immutable or internally thread-safe.
+_resources: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared(name: str, factory: Callable[[], T]) -> T:
+    """
+    Return the process-wide resource ``name``, building it with ``factory`` on first use.
+
+    Concurrent first calls block on a per-name lock so the factory runs once;
+    later calls are a dict lookup without locking. This is the equivalent of
+    ``st.cache_resource`` for modules that must also work outside Streamlit.
+    """
+    try:
+        return _resources[name]
+    except KeyError:
+        pass
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+    with lock:
+        if name not in _resources:
+            _resources[name] = factory()
+        return _resources[name]
+
+
+def peek_shared(name: str, default=None):
+    """The resource if it has already been built, otherwise ``default`` (never builds or blocks)."""
+    return _resources.get(name, default)
+
+
+def clear_shared(name: str = None):
+    """Drop one resource (or all of them) so the next call rebuilds it."""
+    with _registry_lock:
+        if name is None:
+            _resources.clear()
+        else:
+            _resources.pop(name, None)
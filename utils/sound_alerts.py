@@ -1,175 +1,76 @@
+import os
 import streamlit as st
 import streamlit.components.v1 as components
 
-def play_external_audio(audio_url, volume=0.5):
-    """Play external audio URL with proper error handling"""
-    audio_html = f"""
-    <audio id="alertAudio" autoplay>
-        <source src="{audio_url}" type="audio/mpeg">
-        <source src="{audio_url}" type="audio/wav">
-        <source src="{audio_url}" type="audio/ogg">
-    </audio>
-    <script>
-    (function() {{
-        var audio = document.getElementById('alertAudio');
-        if (audio) {{
-            audio.volume = {volume};
-            audio.play().catch(function(error) {{
-                console.log('External audio failed, using fallback beep');
-            }});
-        }}
-    }})();
-    </script>
-    """
-    components.html(audio_html, height=0)
+from utils.sound_assets import get_sound_manifest
 
-def get_alert_sound_html(alert_type="general", custom_url=None):
-    """Generate HTML with working alert sounds using Web Audio API or custom URL"""
-    
-    # If custom URL provided, use it
-    if custom_url:
-        return f"""
-        <audio autoplay>
-            <source src="{custom_url}" type="audio/mpeg">
-            <source src="{custom_url}" type="audio/wav">
-            <source src="{custom_url}" type="audio/ogg">
-        </audio>
-        <script>
-        (function() {{
-            var audio = document.querySelector('audio');
-            if (audio) {{
-                audio.volume = 0.5;
-                audio.crossOrigin = "anonymous";
-                audio.play().catch(function(error) {{
-                    console.log('Audio play failed:', error);
-                }});
-            }}
-        }})();
-        </script>
-        """
-    
-    if alert_type == "critical":
-        # Critical alert - high frequency, urgent beep pattern
-        sound_html = """
-        <script>
-        (function() {
-            const AudioContext = window.AudioContext || window.webkitAudioContext;
-            if (!AudioContext) {
-                console.log('Web Audio API not supported');
-                return;
-            }
-            
-            const audioContext = new AudioContext();
-            
-            function playBeep(frequency, duration, delay) {
-                setTimeout(() => {
-                    const oscillator = audioContext.createOscillator();
-                    const gainNode = audioContext.createGain();
-                    
-                    oscillator.connect(gainNode);
-                    gainNode.connect(audioContext.destination);
-                    
-                    oscillator.frequency.value = frequency;
-                    oscillator.type = 'sine';
-                    
-                    gainNode.gain.setValueAtTime(0.3, audioContext.currentTime);
-                    gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + duration);
-                    
-                    oscillator.start(audioContext.currentTime);
-                    oscillator.stop(audioContext.currentTime + duration);
-                }, delay);
-            }
-            
-            // Critical alert pattern: three urgent beeps
-            playBeep(1000, 0.15, 0);
-            playBeep(1200, 0.15, 200);
-            playBeep(1400, 0.2, 400);
-        })();
-        </script>
-        """
-    elif alert_type == "animal_detected":
-        # Animal detection - medium frequency, double beep
-        sound_html = """
-        <script>
-        (function() {
-            const AudioContext = window.AudioContext || window.webkitAudioContext;
-            if (!AudioContext) {
-                console.log('Web Audio API not supported');
-                return;
-            }
-            
-            const audioContext = new AudioContext();
-            
-            function playBeep(frequency, duration, delay) {
-                setTimeout(() => {
-                    const oscillator = audioContext.createOscillator();
-                    const gainNode = audioContext.createGain();
-                    
-                    oscillator.connect(gainNode);
-                    gainNode.connect(audioContext.destination);
-                    
-                    oscillator.frequency.value = frequency;
-                    oscillator.type = 'sine';
-                    
-                    gainNode.gain.setValueAtTime(0.25, audioContext.currentTime);
-                    gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + duration);
-                    
-                    oscillator.start(audioContext.currentTime);
-                    oscillator.stop(audioContext.currentTime + duration);
-                }, delay);
-            }
-            
-            // Animal detection pattern: two beeps
-            playBeep(800, 0.2, 0);
-            playBeep(900, 0.2, 250);
-        })();
-        </script>
-        """
-    else:
-        # General alert - lower frequency, single beep
-        sound_html = """
-        <script>
-        (function() {
-            const AudioContext = window.AudioContext || window.webkitAudioContext;
-            if (!AudioContext) {
-                console.log('Web Audio API not supported');
-                return;
-            }
-            
-            const audioContext = new AudioContext();
-            
-            const oscillator = audioContext.createOscillator();
-            const gainNode = audioContext.createGain();
-            
-            oscillator.connect(gainNode);
-            gainNode.connect(audioContext.destination);
-            
-            oscillator.frequency.value = 600;
-            oscillator.type = 'sine';
-            
-            gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
-            gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.3);
-            
-            oscillator.start(audioContext.currentTime);
-            oscillator.stop(audioContext.currentTime + 0.3);
-        })();
-        </script>
-        """
-    
-    return sound_html
+# Single long-lived audio player; see audio_component/index.html
+_audio_player = components.declare_component(
+    "alert_audio_player",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_component")
+)
+
+# Higher wins when several sounds are requested in the same rerun
+ALERT_PRIORITY = {
+    "critical": 3,
+    "animal_detected": 2,
+    "general": 1
+}
 
-def play_alert_sound(alert_type="general", custom_url=None):
-    """Play alert sound using Web Audio API or custom URL"""
+def get_sound_name(alert_type="general", species=None):
+    """Name of the pre-rendered sound for an alert type, using the species variant when one exists"""
+    if species and f"{alert_type}_{species}" in get_sound_manifest():
+        return f"{alert_type}_{species}"
+    return alert_type
+
+def play_alert_sound(alert_type="general", custom_url=None, species=None):
+    """Queue an alert sound for the persistent audio player"""
+    if 'pending_alert_sounds' not in st.session_state:
+        st.session_state.pending_alert_sounds = []
+    st.session_state.pending_alert_sounds.append((alert_type, custom_url, get_sound_name(alert_type, species)))
+
+def render_audio_player(volume=0.7, enabled=True, key="alert_audio_player"):
+    """
+    Render the persistent audio player once per rerun.
+    
+    All sounds queued with play_alert_sound during this rerun are coalesced into
+    a single command (highest priority wins). The player keeps one AudioContext
+    alive across reruns, so each rerun only sends a small command instead of a
+    new iframe and script.
+    
+    The sound manifest points at WAV files pre-rendered by utils.sound_assets and
+    served from the component directory under content-hashed names. Streamlit
+    serves them without a long max-age, so caching happens in the iframe: the
+    player downloads and decodes each one once per session and then plays the
+    decoded buffer.
+    """
     if 'last_alert_type' not in st.session_state:
         st.session_state.last_alert_type = None
+    if 'alert_sound_seq' not in st.session_state:
+        st.session_state.alert_sound_seq = 0
+    if 'alert_sound_command' not in st.session_state:
+        st.session_state.alert_sound_command = None
+    
+    pending = st.session_state.get('pending_alert_sounds', [])
+    st.session_state.pending_alert_sounds = []
     
-    # Play sound if it's different from last alert or enough time has passed
-    if st.session_state.last_alert_type != alert_type:
+    if pending:
+        # Repeat suppression is the alert scheduler's job (utils.alert_scheduler)
+        alert_type, custom_url, sound = max(pending, key=lambda p: ALERT_PRIORITY.get(p[0], 0))
         st.session_state.last_alert_type = alert_type
-        sound_html = get_alert_sound_html(alert_type, custom_url)
-        components.html(sound_html, height=0)
+        st.session_state.alert_sound_seq += 1
+        st.session_state.alert_sound_command = {
+            "seq": st.session_state.alert_sound_seq,
+            "type": alert_type,
+            "priority": ALERT_PRIORITY.get(alert_type, 0),
+            "sound": sound,
+            "url": custom_url
+        }
+    
+    _audio_player(command=st.session_state.alert_sound_command, sounds=get_sound_manifest(),
+                  volume=float(volume), enabled=bool(enabled), key=key, default=None)
 
-def play_audio_alert(alert_type="general", custom_url=None):
+def play_audio_alert(alert_type="general", custom_url=None, species=None):
     """Display audio alert with sound and visual feedback"""
     alert_messages = {
         "general": "🔊 AUDIO ALERT: Animal crossing zone ahead. Reduce speed immediately!",
@@ -184,7 +85,7 @@ def play_audio_alert(alert_type="general", custom_url=None):
     }
     
     # Play the sound
-    play_alert_sound(alert_type, custom_url)
+    play_alert_sound(alert_type, custom_url, species)
     
     # Display visual alert
     st.markdown(f"""
@@ -259,16 +160,17 @@ if __name__ == "__main__":
     
     st.markdown("""
     This sound system uses the **Web Audio API** which is supported in all modern browsers.
-    No external files or URLs needed!
+    One audio player stays loaded for the whole session; alerts just send it a play command.
     """)
     
     create_sound_test_interface()
+    render_audio_player()
     
     st.markdown("---")
     st.markdown("### How to integrate:")
     st.code("""
 # In your main app, replace the sound functions with:
-from utils.sound_alerts import play_audio_alert, get_species_sound_type
+from utils.sound_alerts import play_audio_alert, get_species_sound_type, render_audio_player
 
 # When an alert is triggered:
 if alert['risk_level'] == 'CRITICAL':
@@ -278,7 +180,10 @@ elif alert['risk_level'] == 'HIGH':
 else:
     play_audio_alert("general")
 
-# Or based on species:
+# Or based on species (uses the species' own pre-rendered variant):
 sound_type = get_species_sound_type(alert['species'])
-play_audio_alert(sound_type)
+play_audio_alert(sound_type, species=alert['species'])
+
+# Once per rerun, after all alerts have been queued:
+render_audio_player(volume=0.7)
     """, language="python")
\ No newline at end of file
@@ -0,0 +1,164 @@
+import hashlib
+import io
+import os
+import wave
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.shared import get_shared
+
+SAMPLE_RATE = 22050
+# Bump when the synthesis changes so cached files get new names
+ASSET_VERSION = 1
+
+# Streamlit only serves a component's files from inside its own directory
+# (symlinks out of it are refused), so every component that plays the sounds
+# gets its own copy under the same relative "sounds/" path
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIRS = (
+    os.path.join(_UTILS_DIR, "audio_component", "sounds"),
+    os.path.join(_UTILS_DIR, "playback_component", "sounds")
+)
+
+# (peak gain, [(frequency Hz, duration s, delay s), ...]) - same patterns the
+# player falls back to when a buffer is not available
+TONE_PATTERNS = {
+    "general": (0.2, [(600, 0.3, 0.0)]),
+    "critical": (0.3, [(1000, 0.15, 0.0), (1200, 0.15, 0.2), (1400, 0.2, 0.4)]),
+    "animal_detected": (0.25, [(800, 0.2, 0.0), (900, 0.2, 0.25)])
+}
+
+# Pitch multiplier giving each species a recognisable variant of its alert type
+SPECIES_PITCH = {
+    'tiger': 0.9, 'elephant': 0.8, 'leopard': 1.0, 'deer': 1.1, 'wild_boar': 0.95,
+    'sloth_bear': 0.85, 'sambar': 1.05, 'bison': 0.75, 'nilgai': 1.15, 'birds': 1.3
+}
+
+_memory_cache: Dict[str, bytes] = {}
+
+
+def render_tones(beeps: List[Tuple[float, float, float]], gain: float,
+                 sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Render a beep pattern to 16-bit PCM samples.
+
+    Each beep is a sine with an exponential decay from ``gain`` to 0.01, the
+    same envelope the browser oscillators use.
+
+    Args:
+        beeps: List of (frequency Hz, duration s, delay s)
+        gain: Peak amplitude (0..1)
+        sample_rate: Output sample rate in Hz
+
+    Returns:
+        int16 array of mono samples
+    """
+    total = max(delay + duration for _, duration, delay in beeps)
+    signal = np.zeros(int(np.ceil(total * sample_rate)) + 1, dtype=np.float64)
+    for frequency, duration, delay in beeps:
+        n = int(duration * sample_rate)
+        t = np.arange(n) / sample_rate
+        envelope = gain * (0.01 / gain) ** (t / duration)
+        start = int(delay * sample_rate)
+        signal[start:start + n] += np.sin(2 * np.pi * frequency * t) * envelope
+    return (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Wrap int16 mono samples in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def sound_specs() -> Dict[str, Tuple[float, List[Tuple[float, float, float]]]]:
+    """
+    All sounds to pre-render: the three alert types plus one variant per species,
+    named ``<alert_type>_<species>``.
+    """
+    from utils.sound_alerts import get_species_sound_type
+
+    specs = dict(TONE_PATTERNS)
+    for species, pitch in SPECIES_PITCH.items():
+        sound_type = get_species_sound_type(species)
+        gain, beeps = TONE_PATTERNS[sound_type]
+        specs[f"{sound_type}_{species}"] = (gain, [(f * pitch, d, delay) for f, d, delay in beeps])
+    return specs
+
+
+def get_sound_bytes(name: str) -> bytes:
+    """WAV bytes for a named sound, rendered once per process."""
+    data = _memory_cache.get(name)
+    if data is None:
+        gain, beeps = sound_specs()[name]
+        data = encode_wav(render_tones(beeps, gain))
+        _memory_cache[name] = data
+    return data
+
+
+def _asset_filename(name: str, gain: float, beeps) -> str:
+    digest = hashlib.blake2b(repr((ASSET_VERSION, SAMPLE_RATE, gain, beeps)).encode(), digest_size=4).hexdigest()
+    return f"{name}-{digest}.wav"
+
+
+def build_sound_assets(asset_dirs: Tuple[str, ...] = ASSET_DIRS) -> Dict[str, str]:
+    """
+    Render every alert sound to disk (skipping files that already exist).
+
+    File names carry a content hash, so a URL never changes meaning and a
+    player can key its decoded buffers on it. Streamlit's component route
+    sends these files with a bare ``Cache-Control: public`` (no max-age), so
+    the browser may revalidate them; the saving is that each player iframe
+    fetches and decodes a sound once per session, not once per alert.
+
+    Args:
+        asset_dirs: Output directories, one per component serving the sounds
+
+    Returns:
+        Mapping of sound name to path relative to each component's directory
+    """
+    manifest = {}
+    for name, (gain, beeps) in sound_specs().items():
+        filename = _asset_filename(name, gain, beeps)
+        for asset_dir in asset_dirs:
+            os.makedirs(asset_dir, exist_ok=True)
+            path = os.path.join(asset_dir, filename)
+            if not os.path.exists(path):
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(get_sound_bytes(name))
+                os.replace(tmp_path, path)
+        manifest[name] = f"sounds/{filename}"
+    return manifest
+
+
+def get_sound_manifest() -> Dict[str, str]:
+    """
+    Sound name -> component-relative URL, building the assets on first use.
+    The same manifest is valid in every component listed in ASSET_DIRS.
+
+    Returns an empty mapping when the asset directory is not writable; the
+    player then falls back to synthesizing the tones in the browser.
+    """
+    def build():
+        try:
+            return build_sound_assets()
+        except OSError:
+            return {}
+
+    return get_shared('sound_manifest', build)
+
+
+if __name__ == "__main__":
+    built = build_sound_assets()
+    total = sum(os.path.getsize(os.path.join(ASSET_DIRS[0], os.path.basename(p))) for p in built.values())
+    print(f"Built {len(built)} sounds ({total / 1024:.0f} KiB) in each of:")
+    for asset_dir in ASSET_DIRS:
+        print(f"  {asset_dir}")
+    for name, path in sorted(built.items()):
+        print(f"  {name:<28} {path}")
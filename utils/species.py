@@ -0,0 +1,72 @@
+import numpy as np
+
+# Base recommended speed (km/h) when driving through each species' habitat
+SPECIES_SPEED_KMPH = {
+    'tiger': 25, 'elephant': 20, 'leopard': 30, 'deer': 40,
+    'wild_boar': 35, 'sloth_bear': 30, 'sambar': 40, 'bison': 25, 'nilgai': 35, 'birds': 50
+}
+DEFAULT_SPEED_KMPH = 30
+
+# Distance bands (km) and the speed reduction / floor applied inside each band
+SPEED_BANDS_KM = (1.0, 3.0, 5.0)
+SPEED_REDUCTIONS = (15, 10, 5)
+SPEED_FLOORS = (15, 20, 25)
+
+
+def get_recommended_speed(species, distance):
+    """Get recommended speed based on animal type and distance"""
+    base_speed = SPECIES_SPEED_KMPH.get(species, DEFAULT_SPEED_KMPH)
+
+    if distance < 1:
+        return max(base_speed - 15, 15)
+    elif distance < 3:
+        return max(base_speed - 10, 20)
+    elif distance < 5:
+        return max(base_speed - 5, 25)
+    return base_speed
+
+
+def species_risk_weight(species):
+    """
+    Relative risk weight of a species, derived from the speed table: the slower
+    drivers are asked to go, the more dangerous the species (tiger 1.2, birds 0.6).
+    """
+    return DEFAULT_SPEED_KMPH / SPECIES_SPEED_KMPH.get(species, DEFAULT_SPEED_KMPH)
+
+
+def recommended_speed_array(base_speeds, distances):
+    """
+    Vectorized ``get_recommended_speed`` for arrays of base speeds and distances.
+
+    Args:
+        base_speeds: Array of species base speeds (km/h)
+        distances: Array of distances to the zone centre (km), same shape
+
+    Returns:
+        Array of recommended speeds (km/h)
+    """
+    base_speeds = np.asarray(base_speeds, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    speeds = base_speeds.copy()
+    # Walk the bands from widest to narrowest so the tightest band wins
+    for band, reduction, floor in reversed(list(zip(SPEED_BANDS_KM, SPEED_REDUCTIONS, SPEED_FLOORS))):
+        inside = distances < band
+        speeds = np.where(inside, np.maximum(base_speeds - reduction, floor), speeds)
+    return speeds
+
+
+def speed_lookup_table(species_names):
+    """
+    ``get_recommended_speed`` as a lookup table: row = species (in the order
+    given), column = distance band ``np.searchsorted(SPEED_BANDS_KM, d, side='right')``.
+
+    Args:
+        species_names: Sequence of species names, e.g. utils.records.SPECIES_NAMES
+
+    Returns:
+        (len(species_names), len(SPEED_BANDS_KM) + 1) float64 array of km/h
+    """
+    # Any distance inside each band (and one beyond the last) picks that band's speed
+    probes = [band / 2 for band in SPEED_BANDS_KM[:1]] + [
+        (lo + hi) / 2 for lo, hi in zip(SPEED_BANDS_KM, SPEED_BANDS_KM[1:])] + [SPEED_BANDS_KM[-1] + 1]
+    return np.array([[get_recommended_speed(s, d) for d in probes] for s in species_names], dtype=np.float64)
@@ -0,0 +1,126 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Import cost the app may add on top of Streamlit itself before its first paint,
+# compared against the median of DEFAULT_RUNS cold starts. With numpy and the
+# utils modules imported lazily, 90 single runs measured p50 1.1 ms, p90 1.6 ms
+# and max 3.8 ms on a single-CPU runner. The budget is ~4x the worst run, so
+# noise cannot trip it, while any eager heavy import still does (numpy alone is
+# ~85 ms). Raise it deliberately (and say why in the commit) rather than to make
+# CI pass.
+STARTUP_BUDGET_MS = 15.0
+DEFAULT_RUNS = 9
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_MODULES = ('streamlit',)
+
+
+def app_imports(path: str = os.path.join(REPO_ROOT, 'app.py')) -> List[str]:
+    """
+    Modules imported at the top level of ``path`` (including inside module-level
+    try/if blocks). Imports inside functions are lazy by design and not counted.
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+
+    modules = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.append(node.module)
+            elif isinstance(node, ast.Try):
+                visit(node.body)
+            elif isinstance(node, ast.If):
+                visit(node.body)
+
+    visit(tree.body)
+    return list(dict.fromkeys(modules))
+
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+for name in {baseline!r}:
+    __import__(name)
+t1 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+t2 = time.perf_counter()
+sys.stdout.write(json.dumps({{"baseline_ms": (t1 - t0) * 1e3, "app_ms": (t2 - t1) * 1e3}}))
+"""
+
+
+def profile_once(modules: List[str], baseline=BASELINE_MODULES) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Import ``baseline`` then ``modules`` in a fresh interpreter under ``-X importtime``.
+
+    Returns:
+        (timings, per_module) where timings has baseline_ms and app_ms (wall
+        clock) and per_module maps each top-level module first imported after
+        the baseline to its cumulative import time in ms
+    """
+    code = _PROBE.format(baseline=tuple(baseline), modules=tuple(modules))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_ROOT,
+                          capture_output=True, text=True, check=True)
+
+    per_module: Dict[str, float] = {}
+    baseline_done = False
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if name[1:2] == ' ':
+            continue   # nested import, already counted in its parent
+        name = name.strip()
+        if baseline_done:
+            per_module[name] = int(cumulative) / 1e3
+        elif name in baseline:
+            baseline_done = True
+    return json.loads(proc.stdout), per_module
+
+
+def profile(runs: int = DEFAULT_RUNS, path: str = os.path.join(REPO_ROOT, 'app.py')) -> Tuple[Dict[str, float], Dict[str, float], List[float]]:
+    """
+    Median of ``runs`` cold imports of the app's top-level dependencies.
+
+    Returns:
+        (timings, per_module) of the median run by app_ms, and every run's app_ms, sorted
+    """
+    modules = [m for m in app_imports(path) if m.split('.')[0] not in BASELINE_MODULES]
+    results = sorted((profile_once(modules) for _ in range(runs)), key=lambda r: r[0]['app_ms'])
+    timings, per_module = results[len(results) // 2]
+    return timings, per_module, [r[0]['app_ms'] for r in results]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import profile of app.py against a time budget")
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f"app import budget on top of Streamlit (default {STARTUP_BUDGET_MS:g})")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help=f"fresh interpreters to run; the median counts (default {DEFAULT_RUNS})")
+    parser.add_argument('--top', type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args(argv)
+
+    timings, per_module, app_ms = profile(args.runs)
+    print(f"streamlit baseline: {timings['baseline_ms']:7.1f} ms")
+    print(f"app imports:        {timings['app_ms']:7.1f} ms median of {len(app_ms)} "
+          f"({app_ms[0]:.1f}-{app_ms[-1]:.1f}), budget {args.budget_ms:g} ms")
+    for name, ms in sorted(per_module.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:7.1f} ms  {name}")
+
+    if timings['app_ms'] > args.budget_ms:
+        print(f"OVER BUDGET by {timings['app_ms'] - args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())